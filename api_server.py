@@ -7,23 +7,1564 @@ ROKEY NEWS API Server
 - 기본 API 키 제공 + 사용자 키 지원
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from datetime import datetime, timedelta
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Union
 import httpx
 import asyncio
+import base64
+import hashlib
+import hmac
+import importlib.util
 import json
+import logging
 import os
+import random
 import re
+import sqlite3
+import threading
+import time
 from dotenv import load_dotenv
+from articles import Article, dumps, load_articles
+from cachestore import MemoryStore, RedisStore, SQLiteStore
+from compression import EncodedBody, PrecompressedFiles
+from dedup import group_near_duplicates, simhash
+from keywords import KeywordExtractor
+from metrics import MetricsMiddleware, Registry
+from profiling import ServerTimingMiddleware, phase, record_phase
+from ratelimit import MemoryBuckets, SQLiteBuckets
+from resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyBudgetMiddleware, UpstreamPolicy, remaining_budget, unbounded
+)
+from sentiment import analyze_local, extractive_summary, score_texts
 
 # 환경 변수 로드
 load_dotenv()
 
-app = FastAPI(title="ROKEY NEWS API", version="2.0.0")
+# 로그 (LOG_LEVEL, 기본 INFO) — 업스트림/저장소 오류와 수집 상태를 stderr로 출력
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# 업스트림 HTTP 클라이언트 (커넥션 풀 공유)
+# ============================================
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# 업스트림별 설정 (base_url, 기본 타임아웃)
+UPSTREAMS = {
+    "newsapi": {
+        "base_url": os.getenv("NEWS_API_BASE_URL", "https://newsapi.org"),
+        "timeout": float(os.getenv("NEWS_API_TIMEOUT", "10")),
+    },
+    "openai": {
+        "base_url": os.getenv("OPENAI_BASE_URL", "https://api.openai.com"),
+        "timeout": float(os.getenv("OPENAI_TIMEOUT", "60")),
+    },
+}
+
+
+class UpstreamClients:
+    """업스트림별 httpx.AsyncClient 레지스트리
+
+    - 업스트림마다 하나의 풀링된 클라이언트를 공유 (TCP/TLS 재사용)
+    - 앱 lifespan에서 시작/종료
+    """
+
+    def __init__(self, upstreams: dict):
+        self.upstreams = upstreams
+        self._clients = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        config = self.upstreams[name]
+        # h2 패키지가 없으면 HTTP/1.1로 동작
+        http2 = HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+        return httpx.AsyncClient(
+            base_url=config["base_url"],
+            timeout=config["timeout"],
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    async def start(self):
+        for name in self.upstreams:
+            if name not in self._clients:
+                self._clients[name] = self._create(name)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """업스트림 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._create(name)
+        return client
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        await asyncio.gather(
+            *(client.aclose() for client in clients.values()),
+            return_exceptions=True
+        )
+
+
+http_clients = UpstreamClients(UPSTREAMS)
+
+
+# ============================================
+# 메트릭 (Prometheus 텍스트 형식, /metrics)
+# ============================================
+metrics_registry = Registry()
+HTTP_REQUESTS = metrics_registry.counter(
+    "rokey_http_requests_total", "엔드포인트별 요청 수", ("method", "endpoint", "status")
+)
+HTTP_LATENCY = metrics_registry.histogram(
+    "rokey_http_request_duration_seconds", "엔드포인트별 처리 시간 (응답 전송 완료까지)", ("method", "endpoint")
+)
+HTTP_IN_FLIGHT = metrics_registry.gauge("rokey_http_requests_in_flight", "처리 중인 요청 수")
+UPSTREAM_REQUESTS = metrics_registry.counter(
+    "rokey_upstream_requests_total", "업스트림 호출 수 (상태 코드, timeout, error)", ("upstream", "operation", "status")
+)
+UPSTREAM_LATENCY = metrics_registry.histogram(
+    "rokey_upstream_request_duration_seconds", "업스트림 응답 시간", ("upstream", "operation")
+)
+UPSTREAM_IN_FLIGHT = metrics_registry.gauge("rokey_upstream_requests_in_flight", "진행 중인 업스트림 호출 수", ("upstream",))
+OPENAI_TOKENS = metrics_registry.counter(
+    "rokey_openai_tokens_total", "OpenAI usage 기준 토큰 사용량", ("operation", "kind")
+)
+TRANSLATION_PARSE_ERRORS = metrics_registry.counter(
+    "rokey_translation_parse_errors_total", "번역 응답 JSON 파싱 실패 수"
+)
+
+
+async def observe_upstream(upstream: str, operation: str, request, quota_key: str = None):
+    """업스트림 호출(코루틴)을 기다리며 응답 시간/상태 코드를 기록 (quota_key: NewsAPI 할당량 집계 키)"""
+    in_flight = UPSTREAM_IN_FLIGHT.labels(upstream)
+    in_flight.inc()
+    status = "error"
+    start = time.perf_counter()
+    try:
+        response = await request
+        status = str(response.status_code)
+        return response
+    except httpx.TimeoutException:
+        status = "timeout"
+        raise
+    except asyncio.CancelledError:
+        # 헤징에서 진 요청, 지연 예산 초과 등
+        status = "cancelled"
+        raise
+    finally:
+        in_flight.dec()
+        elapsed = time.perf_counter() - start
+        UPSTREAM_LATENCY.labels(upstream, operation).observe(elapsed)
+        UPSTREAM_REQUESTS.labels(upstream, operation, status).inc()
+        # Server-Timing: 업스트림별 누적 시간 (동시 호출은 합산)
+        record_phase(upstream, elapsed)
+        if quota_key is not None:
+            await newsapi_quota.record(quota_key, status)
+
+
+async def record_token_usage(operation: str, usage, openai_key: str):
+    """OpenAI 응답의 usage 블록을 토큰 카운터와 사용량 장부에 반영"""
+    if not isinstance(usage, dict):
+        return
+    counts = {}
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        counts[kind] = int(tokens) if isinstance(tokens, (int, float)) else 0
+        OPENAI_TOKENS.labels(operation, kind).inc(counts[kind])
+    await token_ledger.record(operation, openai_key, counts["prompt"], counts["completion"])
+
+
+# ============================================
+# 업스트림 장애 대응 (서킷 브레이커 / 재시도 / 지연 예산 / 헤징)
+# ============================================
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # 연속 실패 횟수
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "30"))  # 차단 후 시험 호출까지 (초)
+RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", "0.2"))
+RETRY_BACKOFF_CAP = float(os.getenv("RETRY_BACKOFF_CAP", "2"))
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# 업스트림별 재시도 횟수 / 헤징 여부
+# - NewsAPI 조회(GET)는 멱등이라 5xx/타임아웃도 재시도, 재시도와 헤징은 할당량을 소모
+# - OpenAI 호출은 비용이 들어 연결 실패(요청 미전송)만 재시도, 헤징 기본 꺼짐
+UPSTREAM_RETRIES = {
+    "newsapi": int(os.getenv("NEWS_API_RETRIES", "1")),
+    "openai": int(os.getenv("OPENAI_RETRIES", "1")),
+}
+UPSTREAM_HEDGE = {
+    "newsapi": os.getenv("NEWS_API_HEDGE", "false").lower() == "true",
+    "openai": os.getenv("OPENAI_HEDGE", "false").lower() == "true",
+}
+
+# 엔드포인트별 지연 예산 (초, 0 = 없음): 업스트림 타임아웃을 남은 예산으로 줄이고,
+# /api/news 번역은 예산 안에서만 기다림 (넘으면 원문 응답, 번역은 백그라운드에서 계속)
+LATENCY_BUDGETS = {
+    "/api/news": float(os.getenv("LATENCY_BUDGET_NEWS", "8")),
+    "/api/headlines": float(os.getenv("LATENCY_BUDGET_HEADLINES", "6")),
+    "/api/analyze": float(os.getenv("LATENCY_BUDGET_ANALYZE", "25")),
+    "/api/status": float(os.getenv("LATENCY_BUDGET_STATUS", "5")),
+    "/api/dashboard": float(os.getenv("LATENCY_BUDGET_DASHBOARD", "10")),
+}
+
+UPSTREAM_EVENTS = metrics_registry.counter(
+    "rokey_upstream_resilience_events_total",
+    "재시도 / 헤징 / 서킷 차단 / 지연 예산 초과 횟수", ("upstream", "event")
+)
+CIRCUIT_STATE = metrics_registry.gauge(
+    "rokey_upstream_circuit_state", "서킷 브레이커 상태 (0 closed, 1 half_open, 2 open)", ("upstream",)
+)
+CIRCUIT_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+def create_policy(name: str) -> UpstreamPolicy:
+    state = CIRCUIT_STATE.labels(name)
+
+    def on_change(new_state):
+        state.set(CIRCUIT_STATE_VALUES[new_state])
+        logger.log(logging.WARNING if new_state == CircuitBreaker.OPEN else logging.INFO,
+                   "Circuit %s: %s", name, new_state)
+
+    state.set(0)
+    return UpstreamPolicy(
+        name,
+        CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN, on_change),
+        retries=UPSTREAM_RETRIES[name],
+        backoff_base=RETRY_BACKOFF_BASE,
+        backoff_cap=RETRY_BACKOFF_CAP,
+        hedge_quantile=HEDGE_QUANTILE,
+        hedge_min_samples=HEDGE_MIN_SAMPLES,
+        events=UPSTREAM_EVENTS,
+    )
+
+
+upstream_policies = {name: create_policy(name) for name in UPSTREAMS}
+
+
+async def call_upstream(upstream: str, operation: str, send, quota_key: str = None,
+                        idempotent: bool = True, timeout: float = None):
+    """send(timeout) → httpx 요청 코루틴을 업스트림 정책에 따라 호출 (시도마다 메트릭/할당량 기록)"""
+    # NewsAPI 헤징은 할당량이 넉넉할 때만
+    if quota_key is not None:
+        await newsapi_quota.sync(quota_key)
+    hedge = UPSTREAM_HEDGE[upstream] and (quota_key is None or newsapi_quota.state(quota_key) == QUOTA_PLENTY)
+    return await upstream_policies[upstream].call(
+        operation,
+        lambda attempt_timeout: observe_upstream(upstream, operation, send(attempt_timeout), quota_key),
+        timeout=timeout if timeout is not None else UPSTREAMS[upstream]["timeout"],
+        idempotent=idempotent,
+        hedge=hedge,
+    )
+
+
+def upstream_unavailable(error: CircuitOpenError) -> HTTPException:
+    retry_after = max(1, int(error.retry_in + 0.999))
+    name = "뉴스 서버" if error.upstream == "newsapi" else "AI 서버"
+    return HTTPException(
+        status_code=503,
+        detail=f"{name}에 일시적으로 연결할 수 없습니다. {retry_after}초 후 다시 시도해주세요.",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+# ============================================
+# 응답 캐시 (TTL + LRU)
+# ============================================
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "300"))
+HEADLINES_CACHE_TTL = float(os.getenv("HEADLINES_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "86400"))  # 만료 후 대체용으로 보관하는 시간
+
+# 캐시 저장소 (여러 워커/인스턴스가 같은 캐시를 쓰려면 sqlite 또는 redis)
+# - 응답 캐시: memory | sqlite (같은 호스트의 워커 간 공유) | redis (여러 인스턴스 간 공유)
+# - 번역 메모리 / 분석 결과 캐시의 2차 저장소: sqlite (재시작 후에도 유지, 워커 간 공유) | redis
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_DB_PATH = os.getenv("RESPONSE_CACHE_DB_PATH", "data/responses.sqlite3")
+PERSISTENT_CACHE_BACKEND = os.getenv("PERSISTENT_CACHE_BACKEND", "sqlite")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "rokey:")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.5"))
+
+
+async def store_call(store, fn, *args):
+    """저장소 호출 (SQLite/Redis처럼 파일·네트워크 I/O가 있는 공유 저장소는 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+    if not store.shared:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+def create_cache_store(backend: str, name: str, path: str, max_entries: int = None, max_bytes: int = None):
+    """설정에 맞는 캐시 저장소 (name: SQLite 테이블 이름 / Redis 키 접두사)"""
+    if backend == "redis":
+        return RedisStore(REDIS_URL, prefix=f"{REDIS_KEY_PREFIX}{name}:", timeout=REDIS_TIMEOUT)
+    if backend == "sqlite":
+        return SQLiteStore(path, name, max_entries, max_bytes)
+    return MemoryStore(max_entries, max_bytes)
+
+
+class TTLCache:
+    """항목별 TTL을 갖는 응답 캐시 (저장소는 MemoryStore / SQLiteStore / RedisStore)
+
+    - 항목 수와 대략적인 메모리 사용량(JSON 직렬화 크기) 상한은 저장소가 관리
+    - 만료된 항목도 stale_ttl 동안은 lookup()으로 조회 가능 (stale-while-revalidate, 장애 대체용)
+    - 키의 첫 번째 요소(네임스페이스)별 hit/stale/miss 카운터 (프로세스별)
+    - 공유 저장소는 JSON으로 저장, 네임스페이스별 decoders로 복원 (기사 목록 → Article)
+      같은 저장 시각의 값은 한 번만 복원해 같은 객체를 돌려줌 (직렬화/압축 결과 재사용)
+    - 조회/저장은 코루틴 (공유 저장소 I/O는 store_call로 스레드에서 실행)
+    """
+
+    DECODED_ENTRIES = 256
+
+    def __init__(self, store, stale_ttl: float = 0.0, decoders: dict = None):
+        self.store = store
+        self.stale_ttl = stale_ttl
+        self.decoders = decoders or {}
+        self._decoded = OrderedDict()  # 저장소 키 -> (저장 시각, 복원한 값)
+        self.hits = {}
+        self.stale_hits = {}
+        self.misses = {}
+
+    def _store_key(self, key: tuple):
+        if not self.store.shared:
+            return key
+        return f"{key[0]}:{hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:32]}"
+
+    def _decode(self, store_key: str, namespace: str, body: bytes, stored_at: float):
+        entry = self._decoded.get(store_key)
+        if entry is not None and entry[0] == stored_at:
+            self._decoded.move_to_end(store_key)
+            return entry[1]
+        value = json.loads(body)
+        if namespace in self.decoders:
+            value = self.decoders[namespace](value)
+        self._remember(store_key, stored_at, value)
+        return value
+
+    def _remember(self, store_key: str, stored_at: float, value):
+        self._decoded[store_key] = (stored_at, value)
+        self._decoded.move_to_end(store_key)
+        while len(self._decoded) > self.DECODED_ENTRIES:
+            self._decoded.popitem(last=False)
+
+    async def lookup(self, key: tuple, record: bool = True):
+        """(값, 저장 후 경과 초, 만료 전 여부) 또는 None (record=False면 카운터에 반영하지 않음)"""
+        namespace = key[0]
+        store_key = self._store_key(key)
+        entry = (await store_call(self.store, self.store.get_many, [store_key])).get(store_key)
+        if entry is None:
+            if record:
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+            return None
+        value, stored_at, expires_at = entry
+        if self.store.shared:
+            value = self._decode(store_key, namespace, value, stored_at)
+        now = time.time()
+        fresh = expires_at is None or expires_at > now
+        if record:
+            counter = self.hits if fresh else self.stale_hits
+            counter[namespace] = counter.get(namespace, 0) + 1
+        return value, now - stored_at, fresh
+
+    async def get(self, key: tuple):
+        """만료 전 항목만 반환"""
+        found = await self.lookup(key)
+        if found is None or not found[2]:
+            return None
+        return found[0]
+
+    async def set(self, key: tuple, value, ttl: float):
+        if ttl <= 0:
+            return
+        body = dumps(value)
+        store_key = self._store_key(key)
+        if not self.store.shared:
+            self.store.put(store_key, value, ttl, self.stale_ttl, size=len(body))
+            return
+        stored_at = await store_call(self.store, self.store.put, store_key, body, ttl, self.stale_ttl)
+        self._remember(store_key, stored_at, value)
+
+    async def clear(self):
+        await store_call(self.store, self.store.clear)
+        self._decoded.clear()
+
+    def close(self):
+        self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            **self.store.stats(),
+            "hits": dict(self.hits),
+            "staleHits": dict(self.stale_hits),
+            "misses": dict(self.misses),
+        }
+
+
+response_cache = TTLCache(
+    create_cache_store(
+        RESPONSE_CACHE_BACKEND, "responses", RESPONSE_CACHE_DB_PATH,
+        RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES
+    ),
+    RESPONSE_CACHE_STALE_TTL,
+    decoders={"news": load_articles, "headlines": load_articles}
+)
+
+
+def restamp_category(articles: list, category: str, sentiment: bool = False) -> list:
+    """공유된(캐시/single-flight) 기사 리스트를 복사하면서 요청 카테고리를 지정
+
+    sentiment=True면 로컬 감성 점수(positive/negative/sentiment)를 함께 붙임
+    """
+    articles = [article.copy(category=category) for article in articles]
+    if sentiment:
+        scores = score_texts([
+            f"{(a.title if a.title_original is None else a.title_original) or ''}. "
+            f"{(a.summary if a.summary_original is None else a.summary_original) or ''}"
+            for a in articles
+        ])
+        for article, score in zip(articles, scores):
+            article.positive = score["positive"]
+            article.negative = score["negative"]
+            article.sentiment = score["sentiment"]
+    return articles
+
+
+ENCODED_CACHE_MAX_ENTRIES = int(os.getenv("ENCODED_CACHE_MAX_ENTRIES", "256"))
+
+
+class EncodedResponseCache:
+    """캐시된 기사 목록별 직렬화 + 압축 결과 (LRU)
+
+    - 키: 응답 캐시 키 + 응답 형식(카테고리, 감성 점수, 메시지, stale)
+    - 응답 캐시의 같은 리스트 객체일 때만 재사용 (캐시가 갱신되면 새로 직렬화)
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (articles, EncodedBody)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, articles: list):
+        entry = self._data.get(key)
+        if entry is None or entry[0] is not articles:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, articles: list, encoded: EncodedBody):
+        self._data[key] = (articles, encoded)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(sum(encoded.stats().values()) for _, encoded in self._data.values()),
+        }
+
+
+encoded_responses = EncodedResponseCache(ENCODED_CACHE_MAX_ENTRIES)
+
+
+# ============================================
+# Single-flight (동일 키 동시 요청 합치기)
+# ============================================
+class SingleFlight:
+    """동일 키에 대한 동시 작업을 하나로 합침
+
+    - 첫 요청이 작업을 시작하고, 이후 요청은 같은 결과를 기다림
+    - 예외는 모든 대기자에게 전파되며 결과로 남지 않음 (완료 즉시 키 제거)
+    - 요청 하나가 취소되어도 공유 작업은 계속 진행
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, fn):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 대기자가 모두 취소된 경우에도 예외를 회수
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def __contains__(self, key):
+        return key in self._inflight
+
+
+single_flight = SingleFlight()
+
+
+# ============================================
+# 영구 캐시 (인메모리 LRU + 공유 저장소)
+# ============================================
+class PersistentCache:
+    """재시작 후에도 유지되는 키-값 캐시
+
+    - 1차: 인메모리 LRU / 2차: 캐시 저장소 (SQLite 파일 또는 Redis, 값은 JSON으로 저장)
+    - ttl이 없으면 만료 없음
+    - 2차 저장소 조회/저장은 코루틴 (store_call로 스레드에서 실행)
+    """
+
+    def __init__(self, store, max_memory_entries: int, ttl: float = None):
+        self.store = store
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        raw = "\x00".join(parts)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, keys: list) -> dict:
+        now = time.time()
+        found = {}
+        missing = []
+        for key in keys:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                self._memory.move_to_end(key)
+                found[key] = entry[1]
+            else:
+                missing.append(key)
+
+        if missing:
+            for key, (value, _, expires_at) in (await store_call(self.store, self.store.get_many, missing)).items():
+                found[key] = json.loads(value)
+                self._remember(key, expires_at, found[key])
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def get(self, key: str):
+        return (await self.get_many([key])).get(key)
+
+    async def put_many(self, items: dict):
+        if not items:
+            return
+        expires_at = time.time() + self.ttl if self.ttl else None
+        for key, value in items.items():
+            self._remember(key, expires_at, value)
+        await store_call(
+            self.store, self.store.put_many, {key: dumps(value) for key, value in items.items()}, self.ttl
+        )
+
+    async def set(self, key: str, value):
+        await self.put_many({key: value})
+
+    async def clear(self):
+        self._memory.clear()
+        await store_call(self.store, self.store.clear)
+
+    def close(self):
+        self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            "memoryEntries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "store": self.store.stats(),
+        }
+
+
+# 번역 메모리: sha256(원문, 대상 언어, 모델) → 번역문
+TRANSLATION_MODEL = "gpt-4o-mini"
+TRANSLATION_TARGET_LANG = "ko"
+TRANSLATION_DB_PATH = os.getenv("TRANSLATION_DB_PATH", "data/translations.sqlite3")
+TRANSLATION_MEMORY_SIZE = int(os.getenv("TRANSLATION_MEMORY_SIZE", "5000"))
+
+translation_memory = PersistentCache(
+    create_cache_store(PERSISTENT_CACHE_BACKEND, "translations", TRANSLATION_DB_PATH),
+    TRANSLATION_MEMORY_SIZE
+)
+
+# 번역 청크 설정 (청크당 추정 입력 토큰 / 동시 OpenAI 호출 수 / 청크 재시도 횟수)
+TRANSLATION_CHUNK_TOKENS = int(os.getenv("TRANSLATION_CHUNK_TOKENS", "600"))
+TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_CONCURRENCY", "4"))
+TRANSLATION_RETRIES = int(os.getenv("TRANSLATION_RETRIES", "1"))
+UNTRANSLATED_CACHE_TTL = float(os.getenv("UNTRANSLATED_CACHE_TTL", "30"))  # 번역 실패/지연 결과 캐시 시간
+translation_semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+
+# 분석 결과 캐시: sha256(정규화된 본문, 프롬프트 버전, 모델) → 분석 결과
+# 프롬프트를 바꾸면 ANALYSIS_PROMPT_VERSION을 올려 기존 결과를 무효화
+ANALYSIS_MODEL = "gpt-4o-mini"
+ANALYSIS_PROMPT_VERSION = os.getenv("ANALYSIS_PROMPT_VERSION", "1")
+ANALYSIS_DB_PATH = os.getenv("ANALYSIS_DB_PATH", "data/analyses.sqlite3")
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "1000"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600)))  # 0 = 만료 없음
+
+analysis_cache = PersistentCache(
+    create_cache_store(PERSISTENT_CACHE_BACKEND, "analyses", ANALYSIS_DB_PATH),
+    ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL or None
+)
+
+# 일괄 분석 (프롬프트당 기사 수 / 동시 OpenAI 호출 수)
+ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "5"))
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "3"))
+analysis_semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+
+# ============================================
+# OpenAI 토큰 사용량 기록 + 기본 키 예산
+# ============================================
+USAGE_DB_PATH = os.getenv("USAGE_DB_PATH", "data/usage.sqlite3")
+OPENAI_DAILY_TOKEN_BUDGET = int(os.getenv("OPENAI_DAILY_TOKEN_BUDGET", "0"))  # 기본 키 하루 토큰, 0 = 무제한
+OPENAI_BUDGET_SOFT_RATIO = float(os.getenv("OPENAI_BUDGET_SOFT_RATIO", "0.8"))  # 이 비율부터 절약 모드
+ANALYSIS_LOW_BUDGET_CHARS = int(os.getenv("ANALYSIS_LOW_BUDGET_CHARS", "800"))  # 절약 모드 분석 입력 길이
+USAGE_SYNC_INTERVAL = float(os.getenv("USAGE_SYNC_INTERVAL", "2"))  # 다른 워커의 사용량을 다시 읽는 간격 (초)
+
+# 예산 단계: ok(정상) → low(번역은 제목만, 분석 입력 축소) → exhausted(OpenAI 호출 없음)
+BUDGET_OK = "ok"
+BUDGET_LOW = "low"
+BUDGET_EXHAUSTED = "exhausted"
+
+
+class TokenLedger:
+    """OpenAI 토큰 사용량 장부 (UTC 일자 × 작업 × 호출 키)
+
+    - 호출 키는 원문 대신 'default' 또는 해시 일부로 기록
+    - 기본 키의 오늘 사용량은 기록할 때마다 같은 트랜잭션에서 저장소 기준으로 다시 읽음
+      → 같은 파일을 쓰는 워커끼리 하루 예산을 나눠 씀 (다른 워커의 사용량은 sync()가 sync_interval마다 반영)
+    - 예산 판정은 메모리에 둔 사용량으로 O(1), SQLite 읽기/쓰기는 스레드에서 실행
+    - 예산은 응답을 받은 뒤 반영되므로 동시에 진행 중인 호출만큼 초과할 수 있음
+    """
+
+    def __init__(self, path: str, daily_budget: int, soft_ratio: float, sync_interval: float = 2.0):
+        self.path = path
+        self.daily_budget = daily_budget
+        self.soft_ratio = soft_ratio
+        self.sync_interval = sync_interval
+        self._conn = None
+        self._lock = threading.Lock()
+        self._day = None
+        self._default_used = 0
+        self._read_at = 0.0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " day TEXT NOT NULL,"
+                " operation TEXT NOT NULL,"
+                " caller TEXT NOT NULL,"
+                " requests INTEGER NOT NULL DEFAULT 0,"
+                " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+                " completion_tokens INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (day, operation, caller))"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def caller(openai_key: str) -> str:
+        if openai_key == DEFAULT_OPENAI_API_KEY:
+            return "default"
+        return "user:" + hashlib.sha256(openai_key.encode("utf-8")).hexdigest()[:12]
+
+    def _load(self, day: str, usage: tuple = None):
+        """(스레드) usage가 있으면 기록하고, 같은 트랜잭션에서 기본 키의 그날 사용량을 읽음 → (사용량, 읽은 시각) | None"""
+        with self._lock:
+            try:
+                conn = self._db()
+                conn.execute("BEGIN IMMEDIATE" if usage is not None else "BEGIN")
+                try:
+                    if usage is not None:
+                        conn.execute(
+                            "INSERT INTO usage (day, operation, caller, requests, prompt_tokens, completion_tokens) "
+                            "VALUES (?, ?, ?, 1, ?, ?) "
+                            "ON CONFLICT (day, operation, caller) DO UPDATE SET "
+                            " requests = requests + 1,"
+                            " prompt_tokens = prompt_tokens + excluded.prompt_tokens,"
+                            " completion_tokens = completion_tokens + excluded.completion_tokens",
+                            (day, *usage)
+                        )
+                    row = conn.execute(
+                        "SELECT COALESCE(SUM(prompt_tokens + completion_tokens), 0) FROM usage "
+                        "WHERE day = ? AND caller = 'default'", (day,)
+                    ).fetchone()
+                    conn.execute("COMMIT")
+                    return row[0], time.time()
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning("Usage store error: %s", e)
+                return None
+
+    def _apply(self, day: str, loaded):
+        if loaded is None:
+            return
+        used, read_at = loaded
+        if day != self._day or read_at >= self._read_at:
+            self._day, self._default_used, self._read_at = day, used, read_at
+
+    def _used_today(self) -> int:
+        return self._default_used if self._day == self.today() else 0
+
+    async def sync(self):
+        """다른 워커의 사용량을 반영 (날짜가 바뀌었거나 마지막으로 읽은 뒤 sync_interval이 지났을 때만)"""
+        day = self.today()
+        if day == self._day and time.time() - self._read_at < self.sync_interval:
+            return
+        self._apply(day, await asyncio.to_thread(self._load, day))
+
+    async def record(self, operation: str, openai_key: str, prompt_tokens: int, completion_tokens: int):
+        day = self.today()
+        caller = self.caller(openai_key)
+        if caller == "default" and day == self._day:
+            # 저장소 반영 전에 먼저 더해 둠 (동시에 진행 중인 판정이 바로 보도록)
+            self._default_used += prompt_tokens + completion_tokens
+        self._apply(day, await asyncio.to_thread(
+            self._load, day, (operation, caller, prompt_tokens, completion_tokens)
+        ))
+
+    def level(self, openai_key: str) -> str:
+        """호출 키의 예산 단계 (사용자 키와 예산 미설정은 항상 ok, 판정 전에 sync())"""
+        if not self.daily_budget or openai_key != DEFAULT_OPENAI_API_KEY:
+            return BUDGET_OK
+        used = self._used_today()
+        if used >= self.daily_budget:
+            return BUDGET_EXHAUSTED
+        if used >= self.daily_budget * self.soft_ratio:
+            return BUDGET_LOW
+        return BUDGET_OK
+
+    def _rows(self, since: str) -> list:
+        with self._lock:
+            try:
+                return self._db().execute(
+                    "SELECT day, operation, caller, requests, prompt_tokens, completion_tokens FROM usage "
+                    "WHERE day >= ? ORDER BY day DESC, operation, caller", (since,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning("Usage read error: %s", e)
+                return []
+
+    async def summary(self, days: int = 7) -> dict:
+        await self.sync()
+        since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        rows = await asyncio.to_thread(self._rows, since)
+        return {
+            "budget": {
+                "daily_tokens": self.daily_budget,
+                "used_today": self._used_today(),
+                "level": self.level(DEFAULT_OPENAI_API_KEY),
+            },
+            "usage": [
+                {"day": day, "operation": operation, "caller": caller, "requests": requests,
+                 "prompt_tokens": prompt, "completion_tokens": completion}
+                for day, operation, caller, requests, prompt, completion in rows
+            ],
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+token_ledger = TokenLedger(USAGE_DB_PATH, OPENAI_DAILY_TOKEN_BUDGET, OPENAI_BUDGET_SOFT_RATIO, USAGE_SYNC_INTERVAL)
+
+
+# ============================================
+# 요청 수 제한 (클라이언트 IP / 사용자 키별 토큰 버킷)
+# ============================================
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite (같은 호스트의 워커 간 공유)
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "data/ratelimit.sqlite3")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"  # X-Forwarded-For 사용
+# 앞단의 신뢰할 수 있는 프록시 수 (X-Forwarded-For의 오른쪽에서 이 번째 항목이 클라이언트 IP)
+RATE_LIMIT_TRUSTED_HOPS = max(1, int(os.getenv("RATE_LIMIT_TRUSTED_HOPS", "1")))
+
+
+def rate_limit_setting(tier: str, per_minute: str, burst: str) -> tuple:
+    """등급별 (분당 요청 수, 버스트) 환경 변수 → 0 이하면 시작 시 오류 (끄려면 RATE_LIMIT_ENABLED=false)"""
+    name = f"RATE_LIMIT_{tier.upper()}"
+    values = (
+        float(os.getenv(f"{name}_PER_MINUTE", per_minute)),
+        float(os.getenv(f"{name}_BURST", burst)),
+    )
+    if min(values) <= 0:
+        raise ValueError(f"{name}_PER_MINUTE / {name}_BURST는 0보다 커야 합니다: {values}")
+    return values
+
+
+# 등급별 (분당 요청 수, 버스트)
+# - cheap: 모든 API 요청 (캐시 응답 포함)
+# - expensive: NewsAPI/OpenAI를 실제로 호출하는 경우만
+RATE_LIMITS = {
+    "cheap": rate_limit_setting("cheap", "120", "40"),
+    "expensive": rate_limit_setting("expensive", "20", "10"),
+}
+
+if RATE_LIMIT_BACKEND == "sqlite":
+    rate_buckets = SQLiteBuckets(RATE_LIMIT_DB_PATH)
+else:
+    rate_buckets = MemoryBuckets(RATE_LIMIT_MAX_KEYS)
+
+ADMISSION_DECISIONS = metrics_registry.counter(
+    "rokey_admission_limited_total", "요청 수 제한에 걸린 요청 (거절 / 캐시·로컬 결과로 대체)", ("tier", "outcome")
+)
+
+
+def client_ip(request: Request) -> str:
+    """제한 키로 쓸 클라이언트 IP
+
+    - X-Forwarded-For의 왼쪽 항목은 클라이언트가 임의로 보낼 수 있으므로
+      신뢰하는 프록시가 덧붙인 오른쪽에서 RATE_LIMIT_TRUSTED_HOPS 번째 항목을 사용
+    """
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(forwarded) >= RATE_LIMIT_TRUSTED_HOPS:
+            return forwarded[-RATE_LIMIT_TRUSTED_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+async def admission_wait(request: Request, tier: str, *api_keys: str, cost: float = 1.0) -> float:
+    """등급별 버킷(IP + 사용자 키)에서 cost만큼 차감 → 0이면 통과, 아니면 대기 시간(초)"""
+    if not RATE_LIMIT_ENABLED:
+        return 0.0
+    per_minute, burst = RATE_LIMITS[tier]
+    keys = [f"{tier}:ip:{client_ip(request)}"]
+    keys += [
+        f"{tier}:key:{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}"
+        for key in api_keys if key
+    ]
+    return await store_call(rate_buckets, rate_buckets.acquire, keys, per_minute / 60, burst, cost)
+
+
+def too_many_requests(tier: str, wait: float) -> HTTPException:
+    ADMISSION_DECISIONS.labels(tier, "rejected").inc()
+    retry_after = max(1, int(wait + 0.999))
+    return HTTPException(
+        status_code=429,
+        detail=f"요청이 너무 많습니다. {retry_after}초 후 다시 시도해주세요.",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+async def admit(request: Request, tier: str, *api_keys: str, cost: float = 1.0):
+    """제한을 넘으면 429 (Retry-After 포함)"""
+    wait = await admission_wait(request, tier, *api_keys, cost=cost)
+    if wait > 0:
+        raise too_many_requests(tier, wait)
+
+
+# ============================================
+# NewsAPI 할당량 추적 (키별 호출 수 + 429 응답)
+# ============================================
+# "초:호출 수" 목록 (기본: 개발자 플랜 하루 100회), 비우면 호출 수 제한 없음 (429만 반영)
+NEWSAPI_QUOTAS = [
+    (float(window), int(limit))
+    for window, _, limit in (x.partition(":") for x in os.getenv("NEWSAPI_QUOTAS", "86400:100").split(",") if x)
+]
+NEWSAPI_QUOTA_LOW_RATIO = float(os.getenv("NEWSAPI_QUOTA_LOW_RATIO", "0.2"))  # 남은 비율이 이하이면 절약 모드
+NEWSAPI_RATE_LIMIT_COOLDOWN = float(os.getenv("NEWSAPI_RATE_LIMIT_COOLDOWN", "3600"))  # 429 후 호출 중단 시간
+NEWSAPI_QUOTA_MAX_KEYS = int(os.getenv("NEWSAPI_QUOTA_MAX_KEYS", "1000"))
+QUOTA_DB_PATH = os.getenv("QUOTA_DB_PATH", USAGE_DB_PATH)  # 워커 간 할당량 공유 (같은 파일)
+QUOTA_SYNC_INTERVAL = float(os.getenv("QUOTA_SYNC_INTERVAL", "2"))  # 다른 워커의 호출을 다시 읽는 간격 (초)
+
+# 캐시 갱신 정책
+CACHE_REVALIDATE_AFTER = float(os.getenv("CACHE_REVALIDATE_AFTER", "0.5"))  # TTL 대비 비율, 넘으면 미리 갱신
+CACHE_STALE_WHILE_REVALIDATE = float(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "600"))  # 만료 후 갱신 중 제공 시간
+QUOTA_LOW_REFRESH_TOP = int(os.getenv("QUOTA_LOW_REFRESH_TOP", "5"))  # 절약 모드에서 갱신할 인기 요청 수
+POPULARITY_HALF_LIFE = float(os.getenv("POPULARITY_HALF_LIFE", "3600"))
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", "600"))  # 키 확인 결과 재사용 시간
+
+# 할당량 단계: plenty(만료 전 미리 갱신) → low(stale 제공, 인기 요청만 갱신) → exhausted(캐시/로컬 결과만)
+QUOTA_PLENTY = "plenty"
+QUOTA_LOW = "low"
+QUOTA_EXHAUSTED = "exhausted"
+
+
+class QuotaTracker:
+    """NewsAPI 키별 호출 기록 (롤링 윈도우) → 할당량 단계
+
+    - 호출 키는 원문 대신 'default' 또는 해시 일부로 기록
+    - 호출 시각은 SQLite(WAL)에 남기고, 윈도우별 사용량은 기록과 같은 트랜잭션에서 저장소 기준으로 다시 셈
+      → 같은 파일을 쓰는 워커끼리, 재시작 후에도 같은 할당량을 나눠 씀
+    - 판정은 키별 사용량 스냅샷으로 (이 워커의 호출은 즉시 반영, 다른 워커의 호출은 sync()가 sync_interval마다 반영)
+    - 429(rateLimited) 응답을 받으면 윈도우 계산과 관계없이 cooldown 동안 소진으로 처리
+    - SQLite 읽기/쓰기는 스레드에서 실행 (이벤트 루프를 막지 않음)
+    """
+
+    PRUNE_EVERY = 200
+
+    def __init__(self, path: str, quotas: list, low_ratio: float, cooldown: float, max_keys: int,
+                 sync_interval: float = 2.0):
+        self.path = path
+        self.quotas = quotas
+        self.window = max((window for window, _ in quotas), default=0.0)
+        self.low_ratio = low_ratio
+        self.cooldown = cooldown
+        self.max_keys = max_keys
+        self.sync_interval = sync_interval
+        self._conn = None
+        self._lock = threading.Lock()
+        # caller -> {"usage": [윈도우별 (사용 수, 가장 오래된 호출 시각)], "blocked": 재개 시각, "read_at": 저장소 기준 시각}
+        self._snapshots = OrderedDict()
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS newsapi_calls (caller TEXT NOT NULL, called_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS newsapi_calls_caller ON newsapi_calls (caller, called_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS newsapi_blocks (caller TEXT PRIMARY KEY, until REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def caller(news_api_key: str) -> str:
+        if news_api_key == DEFAULT_NEWS_API_KEY:
+            return "default"
+        return "user:" + hashlib.sha256(news_api_key.encode("utf-8")).hexdigest()[:12]
+
+    def _read(self, conn: sqlite3.Connection, caller: str, now: float) -> dict:
+        usage = [
+            conn.execute(
+                "SELECT COUNT(*), MIN(called_at) FROM newsapi_calls WHERE caller = ? AND called_at > ?",
+                (caller, now - window)
+            ).fetchone()
+            for window, _ in self.quotas
+        ]
+        row = conn.execute("SELECT until FROM newsapi_blocks WHERE caller = ?", (caller,)).fetchone()
+        return {"usage": [(used, oldest or now) for used, oldest in usage],
+                "blocked": row[0] if row else 0.0, "read_at": now}
+
+    def _load(self, caller: str, called_at: float = None, blocked_until: float = None):
+        """(스레드) called_at이 있으면 호출을 기록하고, 같은 트랜잭션에서 사용량을 다시 읽음 → 스냅샷 | None"""
+        with self._lock:
+            try:
+                conn = self._db()
+                conn.execute("BEGIN IMMEDIATE" if called_at is not None else "BEGIN")
+                try:
+                    now = time.time()
+                    if called_at is not None:
+                        conn.execute("INSERT INTO newsapi_calls (caller, called_at) VALUES (?, ?)", (caller, called_at))
+                        if blocked_until is not None:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO newsapi_blocks (caller, until) VALUES (?, ?)",
+                                (caller, blocked_until)
+                            )
+                        self._writes += 1
+                        if self._writes % self.PRUNE_EVERY == 0:
+                            conn.execute("DELETE FROM newsapi_calls WHERE called_at <= ?", (now - self.window,))
+                            conn.execute("DELETE FROM newsapi_blocks WHERE until <= ?", (now,))
+                    snapshot = self._read(conn, caller, now)
+                    conn.execute("COMMIT")
+                    return snapshot
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning("Quota store error: %s", e)
+                return None
+
+    def _store(self, caller: str, snapshot: dict):
+        current = self._snapshots.get(caller)
+        if snapshot is not None and (current is None or snapshot["read_at"] >= current["read_at"]):
+            self._snapshots[caller] = snapshot
+            self._snapshots.move_to_end(caller)
+            while len(self._snapshots) > self.max_keys:
+                self._snapshots.popitem(last=False)
+
+    def _snapshot(self, caller: str) -> dict:
+        snapshot = self._snapshots.get(caller)
+        if snapshot is None:
+            # 아직 sync()하지 않은 키는 저장소에서 바로 읽음 (키마다 처음 한 번)
+            snapshot = self._load(caller) or {
+                "usage": [(0, time.time()) for _ in self.quotas], "blocked": 0.0, "read_at": 0.0
+            }
+            self._store(caller, snapshot)
+        return snapshot
+
+    async def sync(self, news_api_key: str):
+        """다른 워커의 호출을 반영 (마지막으로 읽은 뒤 sync_interval이 지났을 때만 저장소 조회)"""
+        caller = self.caller(news_api_key)
+        snapshot = self._snapshots.get(caller)
+        if snapshot is not None and time.time() - snapshot["read_at"] < self.sync_interval:
+            return
+        self._store(caller, await asyncio.to_thread(self._load, caller))
+
+    async def record(self, news_api_key: str, status: str):
+        """업스트림 호출 1회 기록 (status: 상태 코드 문자열 / timeout / error)"""
+        caller = self.caller(news_api_key)
+        now = time.time()
+        blocked_until = now + self.cooldown if status == "429" else None
+        # 저장소 반영 전에 이 워커의 스냅샷부터 갱신 (동시에 진행 중인 판정이 바로 보도록)
+        snapshot = self._snapshot(caller)
+        snapshot["usage"] = [(used + 1, oldest if used else now) for used, oldest in snapshot["usage"]]
+        if blocked_until is not None:
+            snapshot["blocked"] = blocked_until
+        self._store(caller, await asyncio.to_thread(self._load, caller, now, blocked_until))
+
+    def blocked_for(self, news_api_key: str) -> float:
+        """429 이후 남은 중단 시간 (초)"""
+        return max(0.0, self._snapshot(self.caller(news_api_key))["blocked"] - time.time())
+
+    def remaining(self, news_api_key: str) -> list:
+        """윈도우별 (윈도우, 한도, 남은 호출 수, 가장 오래된 호출이 빠지기까지 초)"""
+        snapshot = self._snapshot(self.caller(news_api_key))
+        now = time.time()
+        return [
+            (window, limit, limit - used, max(0.0, oldest + window - now) if used else 0.0)
+            for (window, limit), (used, oldest) in zip(self.quotas, snapshot["usage"])
+        ]
+
+    def state(self, news_api_key: str) -> str:
+        if self.blocked_for(news_api_key) > 0:
+            return QUOTA_EXHAUSTED
+        ratio = min((left / limit if limit > 0 else 0.0 for _, limit, left, _ in self.remaining(news_api_key)),
+                    default=1.0)
+        if ratio <= 0:
+            return QUOTA_EXHAUSTED
+        if ratio <= self.low_ratio:
+            return QUOTA_LOW
+        return QUOTA_PLENTY
+
+    def reset_in(self, news_api_key: str) -> float:
+        """다시 호출할 수 있을 때까지 남은 시간 (초, 대략)"""
+        wait = self.blocked_for(news_api_key)
+        for _, _, left, reset in self.remaining(news_api_key):
+            if left <= 0:
+                wait = max(wait, reset)
+        return wait
+
+    def describe(self, news_api_key: str) -> dict:
+        return {
+            "state": self.state(news_api_key),
+            "remaining": min((max(0, left) for _, _, left, _ in self.remaining(news_api_key)), default=None),
+            "resetIn": round(self.reset_in(news_api_key)),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "quotas": [{"window": window, "limit": limit} for window, limit in self.quotas],
+            "default": self.describe(DEFAULT_NEWS_API_KEY) if DEFAULT_NEWS_API_KEY else None,
+            "trackedKeys": len(self._snapshots),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+newsapi_quota = QuotaTracker(
+    QUOTA_DB_PATH, NEWSAPI_QUOTAS, NEWSAPI_QUOTA_LOW_RATIO, NEWSAPI_RATE_LIMIT_COOLDOWN, NEWSAPI_QUOTA_MAX_KEYS,
+    QUOTA_SYNC_INTERVAL
+)
+
+
+class RequestPopularity:
+    """캐시 키별 요청 빈도 (반감기 지수 감쇠, 키 수 상한)"""
+
+    def __init__(self, half_life: float, max_keys: int = 1000):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores = OrderedDict()  # key -> (score, updated)
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def touch(self, key: tuple):
+        now = time.monotonic()
+        score, updated = self._scores.pop(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, updated, now) + 1.0, now)
+        while len(self._scores) > self.max_keys:
+            self._scores.popitem(last=False)
+
+    def is_top(self, key: tuple, n: int) -> bool:
+        """현재 점수 기준 상위 n개 안에 드는지"""
+        entry = self._scores.get(key)
+        if entry is None or n <= 0:
+            return False
+        now = time.monotonic()
+        mine = self._decayed(*entry, now)
+        higher = sum(1 for score, updated in self._scores.values() if self._decayed(score, updated, now) > mine)
+        return higher < n
+
+
+request_popularity = RequestPopularity(POPULARITY_HALF_LIFE)
+
+QUOTA_DECISIONS = metrics_registry.counter(
+    "rokey_newsapi_quota_decisions_total", "할당량 단계에 따른 캐시 처리 (미리 갱신 / stale 제공 / 로컬 대체 등)",
+    ("endpoint", "outcome")
+)
+
+# 진행 중인 백그라운드 작업 (태스크 참조 유지 + 종료 시 취소)
+background_tasks = set()
+
+
+def run_in_background(coro) -> asyncio.Task:
+    """요청과 분리된 백그라운드 작업 (요청의 지연 예산 적용 안 함)"""
+    task = asyncio.ensure_future(unbounded(coro))
+    background_tasks.add(task)
+    task.add_done_callback(lambda t: _background_done(t, coro))
+    return task
+
+
+def _background_done(task: asyncio.Task, coro):
+    background_tasks.discard(task)
+    if task.cancelled():
+        coro.close()  # 시작 전에 취소된 작업 (종료 시)
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("Background task error: %s", getattr(error, "detail", error), exc_info=error)
+
+
+def revalidate(flight_key: tuple, loader):
+    """백그라운드 갱신 (같은 호출이 이미 진행 중이면 생략)"""
+    if flight_key not in single_flight:
+        run_in_background(single_flight.do(flight_key, loader))
+
+
+async def lookup_with_quota(endpoint: str, cache_key: tuple, ttl: float, news_api_key: str, loader):
+    """응답 캐시 조회 + 할당량 단계에 따른 갱신 → (기사 | None, 'fresh' | 'stale' | 'fallback' | None)
+
+    - fresh: 그대로 제공 (할당량이 넉넉하고 TTL의 일정 비율이 지났으면 백그라운드 갱신)
+    - stale: 만료된 결과를 stale 표시와 함께 제공 (plenty는 갱신, low는 인기 요청만 갱신)
+    - fallback: 만료된 지 오래됨 → 호출자가 동기 조회하고 실패 시에만 이 결과 사용
+    """
+    request_popularity.touch(cache_key)
+    await newsapi_quota.sync(news_api_key)
+    with phase("cache"):
+        entry = await response_cache.lookup(cache_key)
+    if entry is None:
+        return None, None
+    articles, age, fresh = entry
+    quota = newsapi_quota.state(news_api_key)
+    flight_key = cache_key + (news_api_key,)
+
+    if fresh:
+        if quota == QUOTA_PLENTY and age > ttl * CACHE_REVALIDATE_AFTER and flight_key not in single_flight:
+            QUOTA_DECISIONS.labels(endpoint, "revalidate").inc()
+            revalidate(flight_key, loader)
+        return articles, "fresh"
+
+    if quota == QUOTA_PLENTY and age > ttl + CACHE_STALE_WHILE_REVALIDATE:
+        return articles, "fallback"
+    if quota == QUOTA_PLENTY or (quota == QUOTA_LOW and request_popularity.is_top(cache_key, QUOTA_LOW_REFRESH_TOP)):
+        QUOTA_DECISIONS.labels(endpoint, "stale_refresh").inc()
+        revalidate(flight_key, loader)
+    else:
+        QUOTA_DECISIONS.labels(endpoint, "stale").inc()
+    return articles, "stale"
+
+
+def quota_exhausted_error(news_api_key: str) -> HTTPException:
+    retry_after = max(1, int(newsapi_quota.reset_in(news_api_key) + 0.999))
+    return HTTPException(
+        status_code=503,
+        detail="뉴스 조회 한도에 도달했습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+# ============================================
+# 로컬 기사 저장소 (SQLite + FTS5 전문 검색)
+# ============================================
+ARTICLE_DB_PATH = os.getenv("ARTICLE_DB_PATH", "data/articles.sqlite3")
+LOCAL_SEARCH_MAX_AGE = float(os.getenv("LOCAL_SEARCH_MAX_AGE", "1800"))  # 이보다 오래되면 업스트림 재조회
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", "14"))
+
+# NewsAPI 검색 문법 토큰: 따옴표 구문, 괄호, 단어
+NEWSAPI_QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+TRANSLATED_FIELDS = ("title", "summary")
+
+
+def to_fts_query(search_query: str) -> str:
+    """NewsAPI 검색어 → FTS5 MATCH 식 (AND/OR/NOT/괄호 유지, 단어는 접두어 검색)"""
+    parts = []
+    for token in NEWSAPI_QUERY_TOKEN.findall(search_query):
+        if token in ("(", ")") or token in ("AND", "OR", "NOT"):
+            parts.append(token)
+            continue
+        token = token.lstrip("+-")
+        if token.startswith('"'):
+            phrase = token.strip('"').replace('"', "")
+            if phrase:
+                parts.append(f'"{phrase}"')
+            continue
+        word = "".join(c for c in token if c.isalnum())
+        if word:
+            parts.append(f'"{word}"*')
+    return " ".join(parts)
+
+
+class ArticleStore:
+    """가공된 기사 영구 저장소
+
+    - URL 기준 중복 제거, 번역/분석 결과 함께 보관
+    - 원문/한국어 제목·요약을 FTS5로 색인 (접두어 검색으로 조사 붙은 한국어도 매칭)
+    - 메서드는 동기, 요청 경로에서는 asyncio.to_thread로 호출 (스레드마다 연결, WAL로 읽기/쓰기 동시 진행)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " id INTEGER PRIMARY KEY,"
+                " url TEXT UNIQUE NOT NULL,"
+                " language TEXT,"
+                " published_at TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " data TEXT NOT NULL,"
+                " analysis TEXT);"
+                "CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                " title, summary, title_original, summary_original, tokenize='unicode61');"
+                "CREATE TABLE IF NOT EXISTS signatures ("
+                " url TEXT PRIMARY KEY,"
+                " simhash INTEGER NOT NULL,"
+                " first_seen REAL NOT NULL);"
+            )
+            with self._lock:
+                self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def upsert_many(self, articles: list, language: str = None):
+        """기사 저장 (같은 URL이면 갱신, 기존 번역은 원문이 같을 때 유지)"""
+        now = time.time()
+        try:
+            with self._db() as conn:
+                for article in articles:
+                    url = article.url
+                    if not url:
+                        continue
+                    data = article.to_dict()
+                    del data["id"]
+                    data.pop("category", None)
+                    row = conn.execute(
+                        "SELECT id, data, language FROM articles WHERE url = ?", (url,)
+                    ).fetchone()
+                    if row is not None:
+                        existing = json.loads(row[1])
+                        if "title_original" not in data and existing.get("title_original") == data.get("title"):
+                            for field in TRANSLATED_FIELDS:
+                                data[field] = existing.get(field, data.get(field))
+                                data[f"{field}_original"] = existing.get(f"{field}_original")
+                        conn.execute(
+                            "UPDATE articles SET language = ?, published_at = ?, fetched_at = ?, data = ? "
+                            "WHERE id = ?",
+                            (language or row[2], data.get("publishedAt", ""), now,
+                             json.dumps(data, ensure_ascii=False), row[0])
+                        )
+                        rowid = row[0]
+                        conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (rowid,))
+                    else:
+                        rowid = conn.execute(
+                            "INSERT INTO articles (url, language, published_at, fetched_at, data) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (url, language, data.get("publishedAt", ""), now,
+                             json.dumps(data, ensure_ascii=False))
+                        ).lastrowid
+                    conn.execute(
+                        "INSERT INTO articles_fts (rowid, title, summary, title_original, summary_original) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (rowid, data.get("title") or "", data.get("summary") or "",
+                         data.get("title_original") or "", data.get("summary_original") or "")
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Article store write error: %s", e)
+
+    def search(self, search_query: str, language: str, limit: int,
+               max_age: float = None, min_results: int = None, from_date: str = None) -> list:
+        """로컬 검색 (최신순)
+
+        - from_date: 이 날짜(YYYY-MM-DD) 이후 발행된 기사만 (업스트림 조회와 같은 기간)
+        - max_age: 가장 최근 수집 시각이 이보다 오래되면 None (업스트림 재조회 필요)
+        - min_results: 결과가 이보다 적으면 None (기본값: limit)
+        - 검색어에 검색할 단어가 없으면(기호만 있는 경우 등) None (최신 기사를 검색 결과로 내지 않음)
+        """
+        match = to_fts_query(search_query) if search_query else ""
+        if search_query and not match:
+            return None
+        sql = (
+            "SELECT a.data, a.analysis, a.fetched_at FROM articles a "
+            + ("JOIN articles_fts f ON f.rowid = a.id WHERE articles_fts MATCH ? AND " if match else "WHERE ")
+            + "a.language = ? "
+            + ("AND a.published_at >= ? " if from_date else "")
+            + "ORDER BY a.published_at DESC LIMIT ?"
+        )
+        params = ([match] if match else []) + [language] + ([from_date] if from_date else []) + [limit]
+        try:
+            rows = self._db().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Article store search error: %s", e)
+            return None
+
+        if len(rows) < (limit if min_results is None else min_results):
+            return None
+        if max_age is not None and rows and time.time() - max(r[2] for r in rows) > max_age:
+            return None
+
+        articles = []
+        for idx, (data, analysis, _) in enumerate(rows):
+            article = Article.from_dict(json.loads(data))
+            article.id = idx + 1
+            if analysis:
+                article.analysis = json.loads(analysis)
+            articles.append(article)
+        return articles
+
+    def set_analysis(self, url: str, analysis: dict):
+        try:
+            with self._db() as conn:
+                conn.execute(
+                    "UPDATE articles SET analysis = ? WHERE url = ?",
+                    (json.dumps(analysis, ensure_ascii=False), url)
+                )
+        except sqlite3.Error as e:
+            logger.warning("Article store write error: %s", e)
+
+    def prune(self, retention_days: int):
+        """보관 기간이 지난 기사 삭제"""
+        cutoff = time.time() - retention_days * 86400
+        try:
+            with self._db() as conn:
+                conn.execute(
+                    "DELETE FROM articles_fts WHERE rowid IN (SELECT id FROM articles WHERE fetched_at < ?)",
+                    (cutoff,)
+                )
+                conn.execute("DELETE FROM articles WHERE fetched_at < ?", (cutoff,))
+                conn.execute("DELETE FROM signatures WHERE first_seen < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.warning("Article store prune error: %s", e)
+
+    def get_signatures(self, urls: list) -> dict:
+        """URL → (SimHash, 최초 수집 시각)"""
+        if not urls:
+            return {}
+        try:
+            placeholders = ",".join("?" * len(urls))
+            rows = self._db().execute(
+                f"SELECT url, simhash, first_seen FROM signatures WHERE url IN ({placeholders})",
+                urls
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Article store read error: %s", e)
+            return {}
+        # SQLite INTEGER는 부호 있는 64비트라 저장 시 변환한 값을 되돌림
+        return {url: (sig & (2 ** 64 - 1), first_seen) for url, sig, first_seen in rows}
+
+    def put_signatures(self, signatures: dict):
+        """URL → SimHash 저장 (이미 있으면 최초 수집 시각 유지)"""
+        if not signatures:
+            return
+        now = time.time()
+        try:
+            with self._db() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO signatures (url, simhash, first_seen) VALUES (?, ?, ?)",
+                    [(url, sig - 2 ** 64 if sig >= 2 ** 63 else sig, now)
+                     for url, sig in signatures.items()]
+                )
+        except sqlite3.Error as e:
+            logger.warning("Article store write error: %s", e)
+
+    def recent(self, limit: int) -> list:
+        """최근 수집 기사 (최신 수집순)"""
+        try:
+            rows = self._db().execute(
+                "SELECT data FROM articles ORDER BY fetched_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Article store read error: %s", e)
+            return []
+        return [Article.from_dict(json.loads(row[0])) for row in rows]
+
+    def count(self) -> int:
+        try:
+            return self._db().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+
+article_store = ArticleStore(ARTICLE_DB_PATH)
+
+# 유사 기사 묶기 (SimHash 해밍 거리 기준, 64비트 중)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+
+# 키워드 추출기 (롤링 DF는 저장소의 최근 기사로 시작 시 채움)
+KEYWORD_DF_WINDOW = int(os.getenv("KEYWORD_DF_WINDOW", "5000"))
+keyword_extractor = KeywordExtractor(window=KEYWORD_DF_WINDOW)
+
+
+def localize_articles(articles: list, translate: bool) -> list:
+    """로컬 저장소 결과를 요청 형식으로 (번역 미요청 시 원문 복원)"""
+    if translate:
+        return articles
+    restored = []
+    for article in articles:
+        article = article.copy()
+        for field in TRANSLATED_FIELDS:
+            original = getattr(article, f"{field}_original")
+            if original is not None:
+                setattr(article, field, original)
+                setattr(article, f"{field}_original", None)
+        restored.append(article)
+    return restored
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공유 리소스 관리"""
+    await http_clients.start()
+    keyword_extractor.observe([
+        (a.url, f"{(a.title if a.title_original is None else a.title_original) or ''} "
+                f"{(a.summary if a.summary_original is None else a.summary_original) or ''}")
+        for a in await asyncio.to_thread(article_store.recent, KEYWORD_DF_WINDOW)
+    ])
+    try:
+        if INGEST_ENABLED and DEFAULT_NEWS_API_KEY:
+            ingest_scheduler.start()
+        yield
+    finally:
+        await ingest_scheduler.stop()
+        for task in list(background_tasks):
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await http_clients.close()
+        response_cache.close()
+        translation_memory.close()
+        analysis_cache.close()
+        article_store.close()
+        token_ledger.close()
+        newsapi_quota.close()
+        rate_buckets.close()
+
+
+app = FastAPI(title="ROKEY NEWS API", version="2.0.0", lifespan=lifespan)
+
+# 관리용 기능(캐시 초기화, 프로파일링 등) 토큰: X-Admin-Token 헤더로 전달, 비우면 관리용 기능 비활성화
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def is_admin(headers) -> bool:
+    token = headers.get("x-admin-token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def require_admin(request: Request):
+    """관리용 엔드포인트 확인 (ADMIN_TOKEN 미설정 시 404, 토큰 불일치 시 403)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(request.headers):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+# 요청 단계별 Server-Timing 헤더 (+ ?profile=1 호출 프로파일, 켜도 관리자 토큰이 있는 요청만)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))
+app.add_middleware(
+    ServerTimingMiddleware,
+    prefix="/api/",
+    profiling=PROFILING_ENABLED,
+    interval=PROFILING_INTERVAL,
+    authorize=is_admin,
+)
+
+# 엔드포인트별 지연 예산 (업스트림 타임아웃/번역 대기 상한)
+app.add_middleware(LatencyBudgetMiddleware, budgets=LATENCY_BUDGETS)
+
+# 요청 메트릭 (가장 바깥에서 전체 처리 시간 측정)
+app.add_middleware(
+    MetricsMiddleware,
+    requests=HTTP_REQUESTS,
+    latency=HTTP_LATENCY,
+    in_flight=HTTP_IN_FLIGHT,
+)
 
 # CORS 설정
 app.add_middleware(
@@ -38,6 +1579,9 @@ app.add_middleware(
 DEFAULT_NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
 DEFAULT_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+# 감성 분석 엔진
+ANALYSIS_ENGINES = ("auto", "llm", "local")
+
 # 카테고리 매핑 (한글 -> 영어 키워드)
 CATEGORY_KEYWORDS = {
     "all": "",
@@ -48,17 +1592,55 @@ CATEGORY_KEYWORDS = {
     "sports": "sports OR football OR baseball OR soccer"
 }
 
+# 카테고리 매핑 (한글 -> NewsAPI top-headlines 카테고리)
+HEADLINE_CATEGORIES = {
+    "tech": "technology",
+    "economy": "business",
+    "politics": "politics",
+    "world": "general",
+    "sports": "sports",
+    "all": "general"
+}
+
+# 헤드라인 국가 → 기사 언어 (로컬 저장소의 언어별 검색용, 목록에 없는 국가는 언어 없이 저장되어 검색에서 제외)
+COUNTRY_LANGUAGES = {
+    "us": "en", "gb": "en", "au": "en", "ca": "en", "ie": "en", "nz": "en", "in": "en",
+    "sg": "en", "za": "en", "ng": "en", "ph": "en",
+    "kr": "ko", "jp": "ja", "cn": "zh", "tw": "zh", "hk": "zh",
+    "fr": "fr", "be": "fr", "de": "de", "at": "de", "ch": "de",
+    "it": "it", "nl": "nl", "no": "no", "se": "sv", "ru": "ru", "ua": "uk", "il": "he",
+    "ar": "es", "mx": "es", "co": "es", "cu": "es", "ve": "es", "br": "pt", "pt": "pt",
+    "ae": "ar", "eg": "ar", "sa": "ar", "ma": "ar",
+}
 
-class NewsResponse(BaseModel):
-    success: bool
-    data: list
-    message: str = ""
+# /api/news 페이지네이션 (cursor) / 다음 페이지 미리 가져오기
+NEWS_MAX_RESULTS = int(os.getenv("NEWS_MAX_RESULTS", "100"))  # NewsAPI 개발자 플랜은 검색당 100건까지
+NEWS_PREFETCH_ENABLED = os.getenv("NEWS_PREFETCH_ENABLED", "true").lower() == "true"
+
+# /api/dashboard 헤드라인 / 카테고리별 미리보기 기사 수
+DASHBOARD_HEADLINES_SIZE = int(os.getenv("DASHBOARD_HEADLINES_SIZE", "5"))
+DASHBOARD_PREVIEW_SIZE = int(os.getenv("DASHBOARD_PREVIEW_SIZE", "3"))
 
 
 class AnalysisRequest(BaseModel):
     title: str
     content: str
     openai_key: str = ""
+    url: str = ""
+    engine: str = "auto"  # auto(LLM, 실패 시 로컬) | llm | local
+
+
+class BatchAnalysisItem(BaseModel):
+    id: Union[int, str]
+    title: str
+    content: str
+    url: str = ""
+
+
+class BatchAnalysisRequest(BaseModel):
+    articles: List[BatchAnalysisItem] = Field(..., max_length=50)
+    openai_key: str = ""
+    engine: str = "llm"  # llm | local | auto(목록 분석이므로 로컬)
 
 
 class AnalysisResponse(BaseModel):
@@ -69,28 +1651,42 @@ class AnalysisResponse(BaseModel):
     negative: int = 50
     sentiment: str = "중립"
     message: str = ""
+    cached: bool = False
+    engine: str = "llm"
+
+
+# 정적 파일: 시작 시 읽어 gzip/brotli 변형을 미리 만들어 둠
+site_files = PrecompressedFiles(".", names=["index.html"])
 
 
 @app.get("/")
-async def root():
-    """정적 HTML 페이지 서빙"""
-    return FileResponse("index.html")
+async def root(request: Request):
+    """정적 HTML 페이지 서빙 (미리 압축된 변형 + ETag)"""
+    return site_files.response("index.html", request.headers)
 
 
 @app.get("/api/news")
 async def get_news(
+    request: Request,
     q: str = Query(default="", description="검색 키워드"),
     category: str = Query(default="all", description="카테고리"),
     language: str = Query(default="en", description="언어 코드"),
     page_size: int = Query(default=10, ge=1, le=20, description="결과 수"),
     api_key: str = Query(default="", description="사용자 API 키 (선택)"),
-    translate: bool = Query(default=True, description="한국어 번역 여부")
+    translate: bool = Query(default=True, description="한국어 번역 여부"),
+    stream: bool = Query(default=False, description="NDJSON 스트리밍 (원문 먼저, 번역은 이후 패치)"),
+    sentiment: bool = Query(default=False, description="로컬 감성 점수 포함 (목록용)"),
+    cursor: str = Query(default="", description="다음 페이지 커서 (이전 응답의 nextCursor)")
 ):
     """
     뉴스 검색 API
     - 사용자 키가 없으면 기본 키 사용
     - NewsAPI의 everything 엔드포인트 사용
     - 자동 한국어 번역 지원
+    - stream=true: 가공된 원문 기사를 즉시 보내고 번역 결과를 기사별로 이어서 전송
+      (수집/캐시/로컬 결과처럼 번역할 것이 없으면 일반 JSON 응답 → ETag/304, 압축 재사용)
+    - cursor: 이전 응답의 nextCursor로 다음 페이지 조회 (검색어/언어/결과 수는 커서의 값 사용)
+    - 다음 페이지가 있으면 백그라운드에서 미리 가져와 번역까지 캐시에 저장
     """
     # API 키 결정
     news_api_key = api_key if api_key else DEFAULT_NEWS_API_KEY
@@ -101,7 +1697,155 @@ async def get_news(
             detail="API 키가 설정되지 않았습니다. 설정에서 NewsAPI 키를 입력해주세요."
         )
 
-    # 검색어 구성
+    await admit(request, "cheap", api_key)
+
+    # 이어지는 페이지는 첫 페이지와 같은 조건 (기준일 포함)
+    if cursor:
+        search_query, language, page_size, from_date, page = decode_cursor(cursor)
+    else:
+        search_query = build_search_query(q, category)
+        from_date = news_from_date()
+        page = 1
+
+    def paginate(articles: list, prefetch: bool = True):
+        """다음 페이지 커서 (prefetch면 다음 페이지를 미리 가져옴, 호출자의 expensive 등급에서 차감)"""
+        next_cursor = next_page_cursor(articles, search_query, language, page_size, from_date, page)
+        if next_cursor is not None and prefetch:
+            prefetch_news_page(
+                search_query, language, page_size, from_date, page + 1, translate, news_api_key,
+                charge=lambda: admission_wait(request, "expensive", api_key)
+            )
+        return next_cursor
+
+    # 백그라운드 수집으로 미리 채워진 결과 (표준 카테고리 첫 페이지, 번역 포함)
+    with phase("cache"):
+        warm = warm_store.get("news", search_query, language, page_size=page_size) if translate and page == 1 else None
+    if warm is not None:
+        return news_response(request, warm, category, sentiment, next_cursor=paginate(warm))
+
+    # 캐시 조회 (가공 + 번역 완료된 결과, 만료 후에도 할당량 단계에 따라 stale로 제공)
+    cache_key = ("news", search_query, language, page_size, from_date, translate, page)
+    raw_flight_key = ("news-raw", search_query, language, page_size, from_date, page, news_api_key)
+    flight_key = raw_flight_key if stream else cache_key + (news_api_key,)
+
+    def respond(articles: list, stale: bool = False, cached: bool = False, prefetch: bool = True):
+        # 제한에 걸렸거나 업스트림이 실패해 대체 결과로 응답할 때는 다음 페이지를 미리 가져오지 않음
+        # (번역할 것이 없는 결과는 stream 요청이어도 일반 JSON으로 응답)
+        return news_response(request, articles, category, sentiment, stale=stale,
+                             cache_key=cache_key if cached else None, next_cursor=paginate(articles, prefetch))
+
+    async def local_results():
+        """로컬 저장소의 결과 (오래된 것 포함, 첫 페이지만), 없으면 None"""
+        if page > 1:
+            return None
+        local = await asyncio.to_thread(
+            article_store.search,
+            "" if search_query == "news" and not q else search_query,
+            language, page_size, min_results=1, from_date=from_date
+        )
+        return localize_articles(local, translate) if local is not None else None
+
+    cached, freshness = await lookup_with_quota(
+        "news", cache_key, NEWS_CACHE_TTL, news_api_key,
+        lambda: load_news_articles(
+            cache_key, search_query, language, page_size, from_date, translate, news_api_key, page
+        )
+    )
+    if freshness in ("fresh", "stale"):
+        return respond(cached, stale=freshness == "stale", cached=True)
+
+    # 검색어가 있으면 로컬 색인을 먼저 조회 (첫 페이지, 충분하고 최신일 때만 사용)
+    if q and page == 1:
+        with phase("cache"):
+            local = await asyncio.to_thread(
+                article_store.search, search_query, language, page_size,
+                max_age=LOCAL_SEARCH_MAX_AGE, from_date=from_date
+            )
+        if local is not None:
+            return respond(localize_articles(local, translate))
+
+    # 할당량 소진: 로컬 저장소 결과만 제공, 없으면 503
+    if newsapi_quota.state(news_api_key) == QUOTA_EXHAUSTED:
+        local = await local_results()
+        if local is None:
+            QUOTA_DECISIONS.labels("news", "rejected").inc()
+            raise quota_exhausted_error(news_api_key)
+        QUOTA_DECISIONS.labels("news", "served_local").inc()
+        return respond(local, prefetch=False)
+
+    # 업스트림 호출 전 제한 확인: 넘으면 만료된 캐시나 로컬 저장소 결과로 대체, 없으면 429
+    # (이미 진행 중인 동일 호출에 합류하는 요청은 차감하지 않음)
+    wait = 0.0 if flight_key in single_flight else await admission_wait(request, "expensive", api_key)
+    if wait > 0:
+        if cached is not None:
+            ADMISSION_DECISIONS.labels("expensive", "served_stale").inc()
+            return respond(cached, stale=True, cached=True, prefetch=False)
+        local = await local_results()
+        if local is None:
+            raise too_many_requests("expensive", wait)
+        ADMISSION_DECISIONS.labels("expensive", "served_local").inc()
+        return respond(local, prefetch=False)
+
+    try:
+        if stream:
+            raw_articles = await single_flight.do(
+                raw_flight_key,
+                lambda: fetch_news_articles(search_query, language, page_size, from_date, news_api_key, page)
+            )
+            return stream_news(cache_key, raw_articles, category, translate, language, sentiment=sentiment,
+                               next_cursor=paginate(raw_articles))
+
+        # 동시에 들어온 동일 요청은 하나의 업스트림 호출로 합침
+        # (미리 가져오기 등 진행 중인 작업에 합류해도 남은 지연 예산만 기다리고, 넘으면 번역 전 원문으로 응답)
+        processed_articles, complete = await join_news_flight(
+            flight_key, cache_key,
+            lambda: load_news_articles(
+                cache_key, search_query, language, page_size, from_date,
+                translate, news_api_key, page
+            )
+        )
+    except HTTPException:
+        # 업스트림 실패(할당량 소진 등) 시 만료된 캐시, 로컬 저장소 결과 순으로 대체
+        if cached is not None:
+            return respond(cached, stale=True, cached=True, prefetch=False)
+        local = await local_results()
+        if local is None:
+            raise
+        return respond(local, prefetch=False)
+
+    return respond(processed_articles, cached=complete)
+
+
+def news_response(request: Request, articles: list, category: str, sentiment: bool,
+                  message: str = None, stale: bool = False, cache_key: tuple = None,
+                  next_cursor: str = None) -> Response:
+    """기사 목록 → {success, data, message, stale, nextCursor} JSON (ETag, Accept-Encoding 압축, If-None-Match 일치 시 304)
+
+    - Pydantic 검증/jsonable_encoder 없이 Article을 바로 직렬화
+    - stale: 만료된 캐시 결과 (할당량 절약 / 업스트림 장애)
+    - cache_key: 응답 캐시에 저장된 리스트면 직렬화/압축 결과를 재사용
+    """
+    encoded_key = (
+        cache_key + (category, sentiment, message, stale, next_cursor) if cache_key is not None else None
+    )
+    encoded = encoded_responses.get(encoded_key, articles) if encoded_key is not None else None
+    if encoded is None:
+        data = restamp_category(articles, category, sentiment)
+        if message is None:
+            message = f"{len(articles)}개의 뉴스를 찾았습니다."
+        with phase("serialize"):
+            body = dumps({
+                "success": True, "data": data, "message": message, "stale": stale, "nextCursor": next_cursor
+            })
+            encoded = EncodedBody(body)
+        if encoded_key is not None:
+            encoded_responses.put(encoded_key, articles, encoded)
+    with phase("compress"):
+        return encoded.response(request.headers, "application/json")
+
+
+def build_search_query(q: str, category: str) -> str:
+    """검색어 + 카테고리 키워드로 NewsAPI 검색어 구성"""
     search_query = q
     if category != "all" and category in CATEGORY_KEYWORDS:
         category_keywords = CATEGORY_KEYWORDS[category]
@@ -113,68 +1857,238 @@ async def get_news(
     if not search_query:
         search_query = "news"  # 기본 검색어
 
-    # 날짜 범위 (최근 7일)
-    from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    return search_query
+
+
+def news_from_date() -> str:
+    """날짜 범위 시작일 (최근 7일)"""
+    return (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
 
-    # NewsAPI 호출
-    url = "https://newsapi.org/v2/everything"
+
+def encode_cursor(search_query: str, language: str, page_size: int, from_date: str, page: int) -> str:
+    raw = json.dumps([search_query, language, page_size, from_date, page], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """커서 → (검색어, 언어, 결과 수, 기준일, 페이지), 잘못된 커서는 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        search_query, language, page_size, from_date, page = json.loads(raw)
+        datetime.strptime(from_date, "%Y-%m-%d")
+        valid = (
+            isinstance(search_query, str) and search_query and isinstance(language, str)
+            and isinstance(page_size, int) and 1 <= page_size <= 20
+            and isinstance(page, int) and 1 <= page and page * page_size <= NEWS_MAX_RESULTS
+        )
+    except (ValueError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+    return search_query, language, page_size, from_date, page
+
+
+def next_page_cursor(articles: list, search_query: str, language: str, page_size: int,
+                     from_date: str, page: int):
+    """다음 페이지 커서 (결과가 page_size만큼 차 있고 NewsAPI 결과 한도 안일 때만), 없으면 None"""
+    # 묶인 중복 기사도 업스트림 결과 수에 포함
+    fetched = sum(1 + len(a.duplicates or ()) for a in articles)
+    if fetched < page_size or (page + 1) * page_size > NEWS_MAX_RESULTS:
+        return None
+    return encode_cursor(search_query, language, page_size, from_date, page + 1)
+
+
+def prefetch_news_page(search_query: str, language: str, page_size: int, from_date: str,
+                       page: int, translate: bool, news_api_key: str, charge=None):
+    """다음 페이지를 백그라운드에서 가져와 번역까지 응답 캐시에 저장 (할당량이 넉넉할 때만)
+
+    - charge: 실제로 가져오기 직전에 호출해 대기 시간(초)을 받음, 0보다 크면 생략 (요청한 클라이언트의 제한에서 차감)
+    - 캐시 확인부터 백그라운드에서 수행 (응답을 기다리게 하지 않음)
+    """
+    if not NEWS_PREFETCH_ENABLED:
+        return
+    cache_key = ("news", search_query, language, page_size, from_date, translate, page)
+    flight_key = cache_key + (news_api_key,)
+    if flight_key in single_flight:
+        return
+    if newsapi_quota.state(news_api_key) != QUOTA_PLENTY:
+        QUOTA_DECISIONS.labels("news", "prefetch_skipped").inc()
+        return
+
+    async def prefetch():
+        cached = await response_cache.lookup(cache_key, record=False)
+        if cached is not None and cached[2]:
+            return
+        if charge is not None and await charge() > 0:
+            ADMISSION_DECISIONS.labels("expensive", "prefetch_skipped").inc()
+            return
+        QUOTA_DECISIONS.labels("news", "prefetch").inc()
+        await single_flight.do(flight_key, lambda: load_news_articles(
+            cache_key, search_query, language, page_size, from_date, translate, news_api_key, page
+        ))
+
+    run_in_background(prefetch())
+
+
+# 번역 중인 페이지의 원문 (news 캐시 키 → 가공된 원문 기사, load_news_articles가 번역하는 동안만 보관)
+translating_pages = {}
+
+
+async def join_news_flight(flight_key: tuple, cache_key: tuple, loader) -> tuple:
+    """single_flight로 뉴스 조회 → (기사, 번역까지 끝난 결과 여부)
+
+    - 이미 진행 중인 작업(미리 가져오기 등, 지연 예산 없음)에 합류하면 남은 지연 예산만 기다림
+    - 예산을 넘기면 번역 중인 원문으로 응답 (번역 결과는 진행 중인 작업이 캐시에 저장)
+    """
+    remaining = remaining_budget()
+    if flight_key not in single_flight or remaining is None:
+        return await single_flight.do(flight_key, loader), True
+    try:
+        return await asyncio.wait_for(single_flight.do(flight_key, loader), remaining), True
+    except asyncio.TimeoutError:
+        raw_articles = translating_pages.get(cache_key)
+        if raw_articles is None:
+            # 아직 NewsAPI 응답 전이면 끝까지 기다림
+            return await single_flight.do(flight_key, loader), True
+        UPSTREAM_EVENTS.labels("openai", "translation_deferred").inc()
+        return [a.copy() for a in raw_articles], False
+
+
+def stream_news(cache_key: tuple, articles: list, category: str,
+                translate: bool, language: str = None,
+                sentiment: bool = False, stale: bool = False,
+                next_cursor: str = None) -> StreamingResponse:
+    """NDJSON 스트림: articles → translation(기사별 패치)... → done"""
+
+    def line(event: dict) -> bytes:
+        return dumps(event) + b"\n"
+
+    async def events():
+        yield line({
+            "type": "articles",
+            "data": restamp_category(articles, category, sentiment),
+            "message": f"{len(articles)}개의 뉴스를 찾았습니다.",
+            "stale": stale,
+            "nextCursor": next_cursor
+        })
+
+        if translate and DEFAULT_OPENAI_API_KEY and articles:
+            queue = asyncio.Queue()
+
+            def on_translated(article):
+                queue.put_nowait({
+                    "type": "translation",
+                    "id": article.id,
+                    "title": article.title,
+                    "summary": article.summary,
+                    "title_original": article.title_original,
+                    "summary_original": article.summary_original
+                })
+
+            # 클라이언트가 끊겨도 번역은 끝까지 진행 (번역 메모리에 저장됨, 종료 시 정리)
+            task = run_in_background(translate_articles(
+                [a.copy() for a in articles], DEFAULT_OPENAI_API_KEY, on_translated
+            ))
+            task.add_done_callback(lambda _: queue.put_nowait(None))
+
+            while (patch := await queue.get()) is not None:
+                yield line(patch)
+
+            translated_articles = await task
+            if cache_key and (any(a.translated for a in translated_articles) or budget_exhausted()):
+                await response_cache.set(cache_key, translated_articles, NEWS_CACHE_TTL)
+                await asyncio.to_thread(article_store.upsert_many, translated_articles, language)
+
+        yield line({"type": "done"})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+async def load_news_articles(cache_key: tuple, search_query: str, language: str,
+                             page_size: int, from_date: str, translate: bool,
+                             news_api_key: str, page: int = 1) -> list:
+    """가공된 기사 → 번역 → 캐시 저장"""
+    raw_articles = await single_flight.do(
+        ("news-raw", search_query, language, page_size, from_date, page, news_api_key),
+        lambda: fetch_news_articles(search_query, language, page_size, from_date, news_api_key, page)
+    )
+    # 원문 리스트는 다른 요청과 공유되므로 복사 후 번역
+    processed_articles = [a.copy() for a in raw_articles]
+
+    def store_late_translation(translated_articles: list):
+        # 지연 예산을 넘겨 늦게 끝난 번역 → 캐시와 로컬 저장소 갱신
+        if any(a.translated for a in translated_articles):
+            run_in_background(response_cache.set(cache_key, translated_articles, NEWS_CACHE_TTL))
+            run_in_background(asyncio.to_thread(article_store.upsert_many, translated_articles, language))
+
+    # 한국어 번역 적용 (번역하는 동안 원문은 합류한 요청이 예산 초과 시 쓸 수 있도록 보관)
+    translated = False
+    if translate and DEFAULT_OPENAI_API_KEY:
+        translating_pages[cache_key] = raw_articles
+        try:
+            with phase("translate"):
+                processed_articles = await translate_within_budget(
+                    processed_articles,
+                    DEFAULT_OPENAI_API_KEY,
+                    store_late_translation
+                )
+        finally:
+            if translating_pages.get(cache_key) is raw_articles:
+                del translating_pages[cache_key]
+        translated = any(a.translated for a in processed_articles)
+
+    # 번역 요청이 실패한 결과(영문 그대로)는 짧게만 캐시 (토큰 예산 소진으로 번역하지 않은 경우는 그대로 캐시)
+    if translated or not (translate and DEFAULT_OPENAI_API_KEY) or budget_exhausted():
+        await response_cache.set(cache_key, processed_articles, NEWS_CACHE_TTL)
+    else:
+        await response_cache.set(cache_key, processed_articles, UNTRANSLATED_CACHE_TTL)
+
+    with phase("store"):
+        await asyncio.to_thread(article_store.upsert_many, processed_articles, language)
+    return processed_articles
+
+
+async def fetch_news_articles(search_query: str, language: str, page_size: int,
+                              from_date: str, news_api_key: str, page: int = 1) -> list:
+    """NewsAPI everything 조회 → 가공 (번역 전, id는 페이지를 이어서 부여)"""
+    url = "/v2/everything"
     params = {
         "q": search_query,
         "language": language,
         "sortBy": "publishedAt",
         "pageSize": page_size,
+        "page": page,
         "from": from_date,
         "apiKey": news_api_key
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
+        client = http_clients.get("newsapi")
+        response = await call_upstream(
+            "newsapi", "everything",
+            lambda timeout: client.get(url, params=params, timeout=timeout),
+            news_api_key
+        )
+        with phase("decode"):
             data = response.json()
-
-            if data.get("status") == "ok":
-                articles = data.get("articles", [])
-
-                # 응답 데이터 가공
-                processed_articles = []
-                for idx, article in enumerate(articles):
-                    processed_articles.append({
-                        "id": idx + 1,
-                        "title": article.get("title", ""),
-                        "summary": article.get("description", "") or article.get("content", "")[:200] if article.get("content") else "",
-                        "content": article.get("content", ""),
-                        "source": article.get("source", {}).get("name", "Unknown"),
-                        "url": article.get("url", ""),
-                        "image": article.get("urlToImage", ""),
-                        "publishedAt": article.get("publishedAt", ""),
-                        "category": category,
-                        "keywords": extract_keywords(article.get("title", ""))
-                    })
-
-                # 한국어 번역 적용
-                if translate and DEFAULT_OPENAI_API_KEY:
-                    processed_articles = await translate_articles(
-                        processed_articles,
-                        DEFAULT_OPENAI_API_KEY
-                    )
-
-                return NewsResponse(
-                    success=True,
-                    data=processed_articles,
-                    message=f"{len(processed_articles)}개의 뉴스를 찾았습니다."
-                )
-            else:
-                error_msg = data.get("message", "뉴스를 가져오는데 실패했습니다.")
-                raise HTTPException(status_code=400, detail=error_msg)
-
+    except CircuitOpenError as e:
+        raise upstream_unavailable(e)
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="뉴스 서버 응답 시간 초과")
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"네트워크 오류: {str(e)}")
 
+    if data.get("status") != "ok":
+        error_msg = data.get("message", "뉴스를 가져오는데 실패했습니다.")
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    # 응답 데이터 가공 (설명이 없으면 본문 앞부분을 요약으로)
+    return await process_articles(data.get("articles", []), summary_from_content=200,
+                            first_id=(page - 1) * page_size + 1)
+
 
 @app.post("/api/analyze")
-async def analyze_news(request: AnalysisRequest):
+async def analyze_news(request: AnalysisRequest, http_request: Request):
     """
     뉴스 AI 분석 API
     - OpenAI GPT-4o-mini를 사용
@@ -182,14 +2096,13 @@ async def analyze_news(request: AnalysisRequest):
     """
     openai_key = request.openai_key if request.openai_key else DEFAULT_OPENAI_API_KEY
 
-    if not openai_key:
-        raise HTTPException(
-            status_code=400,
-            detail="OpenAI API 키가 설정되지 않았습니다. 설정에서 입력해주세요."
-        )
+    if request.engine not in ANALYSIS_ENGINES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 분석 엔진입니다: {request.engine}")
+
+    await admit(http_request, "cheap", request.openai_key)
 
     # 분석할 텍스트 준비
-    text = f"{request.title}. {request.content}"[:2000]
+    text = analysis_text(request.title, request.content)
 
     if len(text.strip()) < 50:
         return AnalysisResponse(
@@ -197,10 +2110,54 @@ async def analyze_news(request: AnalysisRequest):
             message="분석할 내용이 충분하지 않습니다."
         )
 
+    # 로컬 엔진: 요청 시, 또는 auto에서 OpenAI 키가 없을 때
+    if request.engine == "local" or (request.engine == "auto" and not openai_key):
+        return AnalysisResponse(success=True, engine="local", **analysis_fields(analyze_local(text)))
+
+    # 캐시 조회 (공백 정규화된 본문 기준)
+    cache_key = analysis_cache_key(text)
+    with phase("cache"):
+        cached = await analysis_cache.get(cache_key)
+    if cached is not None:
+        return AnalysisResponse(success=True, cached=True, **cached)
+
+    if not openai_key:
+        raise HTTPException(
+            status_code=400,
+            detail="OpenAI API 키가 설정되지 않았습니다. 설정에서 입력해주세요."
+        )
+
+    # 토큰 예산: 소진 시 로컬 엔진, 절약 모드는 입력을 줄여 호출
+    await token_ledger.sync()
+    budget = token_ledger.level(openai_key)
+    if budget == BUDGET_EXHAUSTED:
+        return AnalysisResponse(
+            success=True, engine="local", message=BUDGET_EXHAUSTED_MESSAGE,
+            **analysis_fields(analyze_local(text))
+        )
+    max_chars = ANALYSIS_LOW_BUDGET_CHARS if budget == BUDGET_LOW else None
+    prompt_text = text[:max_chars]
+    degraded = len(prompt_text) < len(text)
+    if degraded:
+        # 잘린 입력의 분석 결과는 별도 키로 캐시 (전체 본문 결과로 오래 남지 않도록)
+        cache_key = analysis_cache_key(text, max_chars)
+        with phase("cache"):
+            cached = await analysis_cache.get(cache_key)
+        if cached is not None:
+            return AnalysisResponse(success=True, cached=True, **cached)
+
+    # OpenAI 호출 전 제한 확인: auto는 로컬 엔진으로 대체, llm은 429
+    wait = await admission_wait(http_request, "expensive", request.openai_key)
+    if wait > 0:
+        if request.engine != "auto":
+            raise too_many_requests("expensive", wait)
+        ADMISSION_DECISIONS.labels("expensive", "served_local").inc()
+        return AnalysisResponse(success=True, engine="local", **analysis_fields(analyze_local(text)))
+
     prompt = f"""다음 뉴스 기사를 분석해주세요.
 
 [뉴스 내용]
-{text}
+{prompt_text}
 
 [요청사항]
 1. 핵심 내용을 한국어로 3줄 요약해주세요.
@@ -218,55 +2175,279 @@ async def analyze_news(request: AnalysisRequest):
 """
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {openai_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "당신은 뉴스 분석 전문가입니다. 한국어로 명확하고 간결하게 응답해주세요."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 500
-                },
-                timeout=30.0
-            )
+        result_text = await request_analysis(prompt, openai_key, max_tokens=500)
+    except HTTPException:
+        if request.engine != "auto":
+            raise
+        # auto: OpenAI 실패 시 로컬 엔진으로 대체
+        return AnalysisResponse(success=True, engine="local", **analysis_fields(analyze_local(text)))
 
-            if response.status_code != 200:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", "OpenAI API 오류")
-                raise HTTPException(status_code=response.status_code, detail=error_msg)
+    # 결과 파싱
+    result = analysis_fields(parse_analysis_result(result_text))
+    await analysis_cache.set(cache_key, result)
+    if request.url and not degraded:
+        await asyncio.to_thread(article_store.set_analysis, request.url, result)
 
-            data = response.json()
-            result_text = data["choices"][0]["message"]["content"]
+    return AnalysisResponse(success=True, **result)
 
-            # 결과 파싱
-            analysis = parse_analysis_result(result_text)
 
-            return AnalysisResponse(
-                success=True,
-                summary_ko=analysis["summary"],
-                positive=analysis["positive"],
-                negative=analysis["negative"],
-                sentiment=analysis["sentiment"]
-            )
+BUDGET_EXHAUSTED_MESSAGE = "오늘의 AI 사용 한도에 도달해 로컬 분석 결과를 제공합니다."
+
+
+def analysis_text(title: str, content: str) -> str:
+    """분석 입력 텍스트 (최대 2000자)"""
+    return f"{title}. {content}"[:2000]
+
 
+def analysis_cache_key(text: str, max_chars: int = None) -> str:
+    """분석 캐시 키 (절약 모드로 본문을 잘라 분석한 결과는 전체 본문 결과와 다른 키)"""
+    if max_chars is not None and len(text) > max_chars:
+        return PersistentCache.make_key(
+            " ".join(text[:max_chars].split()), ANALYSIS_PROMPT_VERSION, ANALYSIS_MODEL, f"low:{max_chars}"
+        )
+    return PersistentCache.make_key(
+        " ".join(text.split()), ANALYSIS_PROMPT_VERSION, ANALYSIS_MODEL
+    )
+
+
+def analysis_fields(analysis: dict) -> dict:
+    """parse_analysis_result 결과 → AnalysisResponse 필드"""
+    return {
+        "summary_ko": analysis["summary"],
+        "positive": analysis["positive"],
+        "negative": analysis["negative"],
+        "sentiment": analysis["sentiment"]
+    }
+
+
+async def request_analysis(prompt: str, openai_key: str, max_tokens: int,
+                           operation: str = "analysis") -> str:
+    """OpenAI 분석 호출 → 응답 텍스트 (실패 시 HTTPException)"""
+    try:
+        client = http_clients.get("openai")
+        response = await call_upstream("openai", operation, lambda timeout: client.post(
+            "/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {openai_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": ANALYSIS_MODEL,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "당신은 뉴스 분석 전문가입니다. 한국어로 명확하고 간결하게 응답해주세요."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.3,
+                "max_tokens": max_tokens
+            },
+            timeout=timeout
+        ), idempotent=False, timeout=30.0)
+    except CircuitOpenError as e:
+        raise upstream_unavailable(e)
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="AI 분석 시간 초과")
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"네트워크 오류: {str(e)}")
 
+    if response.status_code != 200:
+        error_data = response.json()
+        error_msg = error_data.get("error", {}).get("message", "OpenAI API 오류")
+        raise HTTPException(status_code=response.status_code, detail=error_msg)
+
+    data = response.json()
+    await record_token_usage(operation, data.get("usage"), openai_key)
+    return data["choices"][0]["message"]["content"]
+
+
+@app.post("/api/analyze/batch")
+async def analyze_news_batch(request: BatchAnalysisRequest, http_request: Request):
+    """
+    여러 기사 일괄 AI 분석 API
+    - 본문이 짧은 기사는 엔진과 관계없이 실패 줄, 캐시된 결과는 즉시(한 번에 조회), 나머지는 ANALYSIS_BATCH_SIZE개씩 한 프롬프트로 묶어 분석
+    - 묶음은 ANALYSIS_CONCURRENCY개까지 동시에 호출
+    - 결과는 기사별 NDJSON 한 줄씩 완료 순서대로 전송
+    """
+    openai_key = request.openai_key if request.openai_key else DEFAULT_OPENAI_API_KEY
+
+    if request.engine not in ANALYSIS_ENGINES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 분석 엔진입니다: {request.engine}")
+
+    await admit(http_request, "cheap", request.openai_key)
+
+    def line(item_id, response: AnalysisResponse) -> bytes:
+        event = {"id": item_id, **jsonable_encoder(response)}
+        return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+    # 본문이 짧은 기사는 엔진과 관계없이 /api/analyze와 같이 거절
+    ready = []
+    valid = []  # (item, text)
+    for item in request.articles:
+        text = analysis_text(item.title, item.content)
+        if len(text.strip()) < 50:
+            ready.append(line(item.id, AnalysisResponse(
+                success=False, message="분석할 내용이 충분하지 않습니다."
+            )))
+        else:
+            valid.append((item, text))
+
+    # 로컬 엔진: 전체 기사를 한 번에 점수화
+    if request.engine in ("local", "auto"):
+        scores = score_texts([text for _, text in valid])
+        ready.extend(
+            line(item.id, AnalysisResponse(
+                success=True, engine="local",
+                summary_ko=extractive_summary(text), **score
+            ))
+            for (item, text), score in zip(valid, scores)
+        )
+        return StreamingResponse(iter(ready), media_type="application/x-ndjson")
+
+    # 캐시 조회 (한 번에)
+    pending = [(item, text, analysis_cache_key(text)) for item, text in valid]  # (item, text, cache_key)
+    with phase("cache"):
+        found = await analysis_cache.get_many([cache_key for _, _, cache_key in pending])
+    for item, _, cache_key in pending:
+        if cache_key in found:
+            ready.append(line(item.id, AnalysisResponse(success=True, cached=True, **found[cache_key])))
+    pending = [entry for entry in pending if entry[2] not in found]
+
+    if pending and not openai_key:
+        raise HTTPException(
+            status_code=400,
+            detail="OpenAI API 키가 설정되지 않았습니다. 설정에서 입력해주세요."
+        )
+
+    # 토큰 예산: 소진 시 남은 기사는 로컬 엔진, 절약 모드는 입력을 줄여 호출
+    await token_ledger.sync()
+    budget = token_ledger.level(openai_key)
+    if pending and budget == BUDGET_EXHAUSTED:
+        texts = [text for _, text, _ in pending]
+        for (item, text, _), score in zip(pending, score_texts(texts)):
+            ready.append(line(item.id, AnalysisResponse(
+                success=True, engine="local", message=BUDGET_EXHAUSTED_MESSAGE,
+                summary_ko=extractive_summary(text), **score
+            )))
+        pending = []
+    max_chars = ANALYSIS_LOW_BUDGET_CHARS if budget == BUDGET_LOW else None
+
+    # 절약 모드: 잘라서 분석할 기사는 별도 키로 다시 조회하고 그 키로 캐시
+    if pending and max_chars is not None:
+        pending = [(item, text, analysis_cache_key(text, max_chars)) for item, text, _ in pending]
+        found = await analysis_cache.get_many(
+            [cache_key for _, text, cache_key in pending if len(text) > max_chars]
+        )
+        for item, _, cache_key in pending:
+            if cache_key in found:
+                ready.append(line(item.id, AnalysisResponse(success=True, cached=True, **found[cache_key])))
+        pending = [entry for entry in pending if entry[2] not in found]
+
+    # OpenAI 호출 전 제한 확인 (프롬프트 묶음 하나당 1회로 계산)
+    if pending:
+        await admit(http_request, "expensive", request.openai_key,
+              cost=-(-len(pending) // ANALYSIS_BATCH_SIZE))
+
+    async def analyze_group(group: list) -> list:
+        """묶음 하나 분석 → NDJSON 줄 목록 (어떤 오류든 해당 기사들의 실패 줄로 바꿔 스트림이 끊기지 않도록)"""
+        try:
+            async with analysis_semaphore:
+                result_text = await request_analysis(
+                    build_batch_analysis_prompt([(idx, text[:max_chars]) for idx, (_, text, _) in enumerate(group, 1)]),
+                    openai_key,
+                    max_tokens=350 * len(group),
+                    operation="analysis_batch"
+                )
+            sections = split_batch_analysis(result_text)
+        except HTTPException as e:
+            return [
+                line(item.id, AnalysisResponse(success=False, message=str(e.detail)))
+                for item, _, _ in group
+            ]
+        except Exception as e:
+            logger.exception("Batch analysis error: %r", e)
+            return [
+                line(item.id, AnalysisResponse(success=False, message="분석 중 오류가 발생했습니다."))
+                for item, _, _ in group
+            ]
+
+        lines = []
+        for idx, (item, text, cache_key) in enumerate(group, 1):
+            if idx not in sections:
+                lines.append(line(item.id, AnalysisResponse(
+                    success=False, message="분석 결과를 받지 못했습니다."
+                )))
+                continue
+            try:
+                result = analysis_fields(parse_analysis_result(sections[idx]))
+            except Exception as e:
+                logger.warning("Batch analysis parse error (%s): %r", item.id, e)
+                lines.append(line(item.id, AnalysisResponse(
+                    success=False, message="분석 결과를 해석하지 못했습니다."
+                )))
+                continue
+            await analysis_cache.set(cache_key, result)
+            if item.url and (max_chars is None or len(text) <= max_chars):
+                await asyncio.to_thread(article_store.set_analysis, item.url, result)
+            lines.append(line(item.id, AnalysisResponse(success=True, **result)))
+        return lines
+
+    async def events():
+        for chunk in ready:
+            yield chunk
+        groups = [
+            pending[i:i + ANALYSIS_BATCH_SIZE]
+            for i in range(0, len(pending), ANALYSIS_BATCH_SIZE)
+        ]
+        for finished in asyncio.as_completed([analyze_group(g) for g in groups]):
+            for chunk in await finished:
+                yield chunk
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def build_batch_analysis_prompt(texts: list) -> str:
+    """(번호, 본문) 목록 → 기사별 구획으로 답하도록 요청하는 프롬프트"""
+    articles = "\n\n".join(f"### 기사 {idx}\n{text}" for idx, text in texts)
+    return f"""다음 뉴스 기사 {len(texts)}개를 각각 분석해주세요.
+
+[뉴스 내용]
+{articles}
+
+[요청사항]
+각 기사마다
+1. 핵심 내용을 한국어로 3줄 요약해주세요.
+2. 감성 분석을 수행하여 긍정/부정 비율(%)을 알려주세요. (합계 100%)
+
+[응답 형식] (기사마다 정확히 이 형식으로, 기사 번호 순서대로 응답해주세요)
+### 기사 (번호)
+요약:
+- (첫 번째 요약)
+- (두 번째 요약)
+- (세 번째 요약)
+
+감성분석:
+긍정: (숫자)%
+부정: (숫자)%
+"""
+
+
+BATCH_ANALYSIS_HEADER = re.compile(r'^#+\s*기사\s*(\d+)\b.*$', re.MULTILINE)
+
+
+def split_batch_analysis(text: str) -> dict:
+    """일괄 분석 응답 → {기사 번호: 해당 구획 텍스트}"""
+    sections = {}
+    matches = list(BATCH_ANALYSIS_HEADER.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections[int(match.group(1))] = text[match.end():end]
+    return sections
+
 
 def parse_analysis_result(text: str) -> dict:
     """AI 응답을 파싱하여 구조화된 데이터로 변환"""
@@ -324,10 +2505,12 @@ def parse_analysis_result(text: str) -> dict:
 
 @app.get("/api/headlines")
 async def get_headlines(
+    request: Request,
     country: str = Query(default="us", description="국가 코드"),
     category: str = Query(default="general", description="카테고리"),
     page_size: int = Query(default=5, ge=1, le=10, description="결과 수"),
-    api_key: str = Query(default="", description="사용자 API 키 (선택)")
+    api_key: str = Query(default="", description="사용자 API 키 (선택)"),
+    sentiment: bool = Query(default=False, description="로컬 감성 점수 포함 (목록용)")
 ):
     """헤드라인 뉴스 API"""
     news_api_key = api_key if api_key else DEFAULT_NEWS_API_KEY
@@ -335,16 +2518,76 @@ async def get_headlines(
     if not news_api_key:
         raise HTTPException(status_code=400, detail="API 키가 설정되지 않았습니다.")
 
-    api_category = {
-        "tech": "technology",
-        "economy": "business",
-        "politics": "politics",
-        "world": "general",
-        "sports": "sports",
-        "all": "general"
-    }.get(category, "general")
+    await admit(request, "cheap", api_key)
+
+    api_category = HEADLINE_CATEGORIES.get(category, "general")
+
+    # 백그라운드 수집으로 미리 채워진 결과
+    with phase("cache"):
+        warm = warm_store.get("headlines", country, api_category, page_size=page_size)
+    if warm is not None:
+        return news_response(request, warm, category, sentiment, message="")
+
+    cache_key = ("headlines", country, api_category, page_size)
+    flight_key = cache_key + (news_api_key,)
+
+    def load():
+        return load_headline_articles(cache_key, country, api_category, page_size, news_api_key)
+
+    async def local_results():
+        """로컬 저장소의 최근 기사 (국가의 언어, 카테고리 키워드 기준), 없으면 None"""
+        language = COUNTRY_LANGUAGES.get(country.lower())
+        if language is None:
+            return None
+        local = await asyncio.to_thread(
+            article_store.search, CATEGORY_KEYWORDS.get(category, ""), language, page_size,
+            min_results=1, from_date=news_from_date()
+        )
+        return localize_articles(local, False) if local is not None else None
+
+    cached, freshness = await lookup_with_quota("headlines", cache_key, HEADLINES_CACHE_TTL, news_api_key, load)
+    if freshness in ("fresh", "stale"):
+        return news_response(request, cached, category, sentiment, message="",
+                             stale=freshness == "stale", cache_key=cache_key)
+
+    # 할당량 소진: 로컬 저장소 결과만 제공, 없으면 503
+    if newsapi_quota.state(news_api_key) == QUOTA_EXHAUSTED:
+        local = await local_results()
+        if local is None:
+            QUOTA_DECISIONS.labels("headlines", "rejected").inc()
+            raise quota_exhausted_error(news_api_key)
+        QUOTA_DECISIONS.labels("headlines", "served_local").inc()
+        return news_response(request, local, category, sentiment, message="")
+
+    # 이미 진행 중인 동일 호출에 합류하는 요청은 차감하지 않음
+    wait = 0.0 if flight_key in single_flight else await admission_wait(request, "expensive", api_key)
+    if wait > 0:
+        if cached is not None:
+            ADMISSION_DECISIONS.labels("expensive", "served_stale").inc()
+            return news_response(request, cached, category, sentiment, message="", stale=True, cache_key=cache_key)
+        local = await local_results()
+        if local is None:
+            raise too_many_requests("expensive", wait)
+        ADMISSION_DECISIONS.labels("expensive", "served_local").inc()
+        return news_response(request, local, category, sentiment, message="")
 
-    url = "https://newsapi.org/v2/top-headlines"
+    try:
+        processed_articles = await single_flight.do(flight_key, load)
+    except HTTPException:
+        # 업스트림 실패 시 만료된 캐시, 로컬 저장소 결과 순으로 대체
+        if cached is not None:
+            return news_response(request, cached, category, sentiment, message="", stale=True, cache_key=cache_key)
+        local = await local_results()
+        if local is None:
+            raise
+        return news_response(request, local, category, sentiment, message="")
+    return news_response(request, processed_articles, category, sentiment, message="", cache_key=cache_key)
+
+
+async def load_headline_articles(cache_key: tuple, country: str, api_category: str,
+                                 page_size: int, news_api_key: str) -> list:
+    """NewsAPI top-headlines 조회 → 가공 → 캐시 저장"""
+    url = "/v2/top-headlines"
     params = {
         "country": country,
         "category": api_category,
@@ -353,42 +2596,257 @@ async def get_headlines(
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
+        client = http_clients.get("newsapi")
+        response = await call_upstream(
+            "newsapi", "top_headlines",
+            lambda timeout: client.get(url, params=params, timeout=timeout),
+            news_api_key
+        )
+        with phase("decode"):
             data = response.json()
-
-            if data.get("status") == "ok":
-                articles = data.get("articles", [])
-                processed_articles = []
-                for idx, article in enumerate(articles):
-                    processed_articles.append({
-                        "id": idx + 1,
-                        "title": article.get("title", ""),
-                        "summary": article.get("description", "") or "",
-                        "content": article.get("content", ""),
-                        "source": article.get("source", {}).get("name", "Unknown"),
-                        "url": article.get("url", ""),
-                        "image": article.get("urlToImage", ""),
-                        "publishedAt": article.get("publishedAt", ""),
-                        "category": category,
-                        "keywords": extract_keywords(article.get("title", ""))
-                    })
-                return NewsResponse(success=True, data=processed_articles)
-            else:
-                raise HTTPException(status_code=400, detail=data.get("message", "실패"))
-
+    except CircuitOpenError as e:
+        raise upstream_unavailable(e)
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="시간 초과")
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"네트워크 오류: {str(e)}")
 
+    if data.get("status") != "ok":
+        raise HTTPException(status_code=400, detail=data.get("message", "실패"))
+
+    processed_articles = await process_articles(data.get("articles", []))
+    await response_cache.set(cache_key, processed_articles, HEADLINES_CACHE_TTL)
+    with phase("store"):
+        await asyncio.to_thread(
+            article_store.upsert_many, processed_articles, COUNTRY_LANGUAGES.get(country.lower())
+        )
+    return processed_articles
+
+
+@app.get("/api/dashboard")
+async def get_dashboard(
+    request: Request,
+    category: str = Query(default="all", description="메인 목록 카테고리"),
+    language: str = Query(default="en", description="언어 코드"),
+    page_size: int = Query(default=12, ge=1, le=20, description="메인 목록 결과 수"),
+    country: str = Query(default="us", description="헤드라인 국가 코드"),
+    api_key: str = Query(default="", description="사용자 API 키 (선택)"),
+    translate: bool = Query(default=True, description="한국어 번역 여부"),
+    sentiment: bool = Query(default=False, description="로컬 감성 점수 포함 (목록용)")
+):
+    """
+    첫 화면 데이터를 한 번에 (메인 뉴스 + 헤드라인 + 카테고리별 미리보기 + 키 상태)
+    - 각 부분을 동시에 조회 (수집/캐시 결과 우선, 헤드라인과 미리보기는 할당량이 넉넉할 때만 업스트림 호출)
+    - 번역이 필요한 기사는 모든 부분을 합쳐 중복 없이 한 번에 번역
+    - 일부가 실패해도 나머지 결과로 응답 (partial, errors), 모두 실패하면 메인 뉴스의 오류
+    """
+    news_api_key = api_key if api_key else DEFAULT_NEWS_API_KEY
+
+    if not news_api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="API 키가 설정되지 않았습니다. 설정에서 NewsAPI 키를 입력해주세요."
+        )
+
+    await admit(request, "cheap", api_key)
+
+    from_date = news_from_date()
+    combined_translation = translate and bool(DEFAULT_OPENAI_API_KEY)
+
+    admission = []  # 요청 전체의 expensive 차감 (업스트림을 호출하는 첫 부분에서 한 번만)
+
+    async def admit_upstream(flight_key: tuple):
+        """업스트림을 호출하는 부분이 있으면 요청당 한 번 차감, 넘으면 그 부분들은 429 (합류하는 호출은 차감 없음)"""
+        if flight_key in single_flight:
+            return
+        if not admission:
+            admission.append(asyncio.ensure_future(admission_wait(request, "expensive", api_key)))
+        wait = await asyncio.shield(admission[0])
+        if wait > 0:
+            raise too_many_requests("expensive", wait)
+
+    def skip_unless_plenty():
+        if newsapi_quota.state(news_api_key) != QUOTA_PLENTY:
+            raise HTTPException(status_code=503, detail="NewsAPI 할당량을 아끼기 위해 생략했습니다.")
+
+    async def news_section(search_query: str, size: int, required: bool):
+        """(기사, stale, 번역 후 저장할 캐시 키) — 번역이 필요하면 원문을 가져와 합쳐서 번역"""
+        if translate:
+            warm = warm_store.get("news", search_query, language, page_size=size)
+            if warm is not None:
+                return warm, False, None
+        cache_key = ("news", search_query, language, size, from_date, translate, 1)
+        flight_key = cache_key + (news_api_key,)
+        raw_flight_key = ("news-raw", search_query, language, size, from_date, 1, news_api_key)
+
+        def load():
+            return load_news_articles(cache_key, search_query, language, size, from_date, translate, news_api_key)
+
+        cached, freshness = await lookup_with_quota("news", cache_key, NEWS_CACHE_TTL, news_api_key, load)
+        if freshness in ("fresh", "stale"):
+            return cached, freshness == "stale", None
+        try:
+            if newsapi_quota.state(news_api_key) == QUOTA_EXHAUSTED:
+                raise quota_exhausted_error(news_api_key)
+            if not required:
+                skip_unless_plenty()
+            if combined_translation:
+                await admit_upstream(raw_flight_key)
+                raw_articles = await single_flight.do(
+                    raw_flight_key,
+                    lambda: fetch_news_articles(search_query, language, size, from_date, news_api_key)
+                )
+                return raw_articles, False, cache_key
+            await admit_upstream(flight_key)
+            return await single_flight.do(flight_key, load), False, None
+        except HTTPException:
+            # 만료된 캐시, 로컬 저장소 결과 순으로 대체
+            if cached is not None:
+                return cached, True, None
+            local = await asyncio.to_thread(
+                article_store.search,
+                "" if search_query == "news" else search_query, language, size,
+                min_results=1, from_date=from_date
+            )
+            if local is None:
+                raise
+            return localize_articles(local, translate), False, None
+
+    async def headlines_section():
+        api_category = HEADLINE_CATEGORIES.get(category, "general")
+        warm = warm_store.get("headlines", country, api_category, page_size=DASHBOARD_HEADLINES_SIZE)
+        if warm is not None:
+            return warm, False, None
+        cache_key = ("headlines", country, api_category, DASHBOARD_HEADLINES_SIZE)
+        flight_key = cache_key + (news_api_key,)
+
+        def load():
+            return load_headline_articles(cache_key, country, api_category, DASHBOARD_HEADLINES_SIZE, news_api_key)
+
+        cached, freshness = await lookup_with_quota("headlines", cache_key, HEADLINES_CACHE_TTL, news_api_key, load)
+        if freshness in ("fresh", "stale"):
+            return cached, freshness == "stale", None
+        try:
+            skip_unless_plenty()
+            await admit_upstream(flight_key)
+            return await single_flight.do(flight_key, load), False, None
+        except HTTPException:
+            if cached is None:
+                raise
+            return cached, True, None
+
+    async def preview_section(name: str):
+        """카테고리 목록(/api/news와 같은 키)이 캐시에 있으면 잘라 쓰고, 없을 때만 작은 미리보기를 가져옴"""
+        search_query = build_search_query("", name)
+        page_key = ("news", search_query, language, page_size, from_date, translate, 1)
+        found = await response_cache.lookup(page_key, record=False)
+        if found is not None and found[2]:
+            return found[0][:DASHBOARD_PREVIEW_SIZE], False, None
+        return await news_section(search_query, DASHBOARD_PREVIEW_SIZE, required=False)
+
+    # 메인 목록과 같은 카테고리의 미리보기는 메인 목록에서 잘라 씀
+    previews = [name for name in CATEGORY_KEYWORDS if name not in ("all", category)]
+    names = ["news", "headlines", *previews]
+    results = await asyncio.gather(
+        news_section(build_search_query("", category), page_size, required=True),
+        headlines_section(),
+        *(preview_section(name) for name in previews),
+        return_exceptions=True
+    )
+
+    sections = {}
+    errors = {}
+    for name, result in zip(names, results):
+        if isinstance(result, HTTPException):
+            errors[name] = {"status": result.status_code, "detail": result.detail}
+        elif isinstance(result, BaseException):
+            logger.error("Dashboard error (%s): %r", name, result, exc_info=result)
+            errors[name] = {"status": 500, "detail": "내부 오류"}
+        else:
+            sections[name] = result
+    if not sections:
+        raise results[0] if isinstance(results[0], HTTPException) else HTTPException(
+            status_code=500, detail="대시보드를 불러오지 못했습니다."
+        )
+
+    # 모든 부분의 번역 대상을 한 번에 (원문 그대로 가져온 메인/미리보기는 번역 후 캐시와 로컬 저장소에 저장)
+    if combined_translation:
+        section_keys = [cache_key for _, _, cache_key in sections.values()]
+
+        async def store_sections(translated_lists: list, late: bool = False):
+            for cache_key, articles in zip(section_keys, translated_lists):
+                translated = any(a.translated for a in articles)
+                if cache_key is None or (late and not translated):
+                    continue
+                await response_cache.set(
+                    cache_key, articles,
+                    NEWS_CACHE_TTL if translated or budget_exhausted() else UNTRANSLATED_CACHE_TTL
+                )
+                await asyncio.to_thread(article_store.upsert_many, articles, language)
+
+        with phase("translate"):
+            translated_lists = await translate_article_lists(
+                [articles for articles, _, _ in sections.values()],
+                DEFAULT_OPENAI_API_KEY,
+                lambda late_lists: run_in_background(store_sections(late_lists, late=True))
+            )
+        with phase("store"):
+            await store_sections(translated_lists)
+        sections = {
+            name: (articles, stale, cache_key)
+            for (name, (_, stale, cache_key)), articles in zip(sections.items(), translated_lists)
+        }
+
+    if category in CATEGORY_KEYWORDS and category != "all" and "news" in sections:
+        articles, stale, _ = sections["news"]
+        sections[category] = (articles[:DASHBOARD_PREVIEW_SIZE], stale, None)
+
+    def section(name: str, section_category: str):
+        if name not in sections:
+            return None
+        articles, stale, _ = sections[name]
+        return {"data": restamp_category(articles, section_category, sentiment), "stale": stale}
+
+    main = section("news", category)
+    if main is not None:
+        main_query = build_search_query("", category)
+        main["nextCursor"] = next_page_cursor(sections["news"][0], main_query, language, page_size, from_date, 1)
+        if main["nextCursor"] is not None:
+            prefetch_news_page(
+                main_query, language, page_size, from_date, 2, translate, news_api_key,
+                charge=lambda: admission_wait(request, "expensive", api_key)
+            )
+
+    with phase("serialize"):
+        body = dumps({
+            "success": True,
+            "partial": bool(errors),
+            "status": {
+                "valid": "news" in sections,
+                "hasDefaultKey": bool(DEFAULT_NEWS_API_KEY),
+                "hasUserKey": bool(api_key),
+                "newsQuota": newsapi_quota.describe(news_api_key),
+            },
+            "news": main,
+            "headlines": section("headlines", category),
+            "categories": {
+                name: section(name, name) for name in CATEGORY_KEYWORDS if name != "all"
+            },
+            "errors": errors,
+        })
+    with phase("compress"):
+        return EncodedBody(body).response(request.headers, "application/json")
+
 
 @app.get("/api/status")
 async def check_status(
+    request: Request,
     news_api_key: str = Query(default="", description="NewsAPI 키"),
     openai_key: str = Query(default="", description="OpenAI 키")
 ):
     """API 키 상태 확인"""
+    await admit(request, "cheap", news_api_key)
+
     news_key = news_api_key if news_api_key else DEFAULT_NEWS_API_KEY
     ai_key = openai_key if openai_key else DEFAULT_OPENAI_API_KEY
 
@@ -402,19 +2860,35 @@ async def check_status(
         "message": ""
     }
 
-    # NewsAPI 키 테스트
+    # NewsAPI 키 테스트 (결과는 STATUS_CACHE_TTL 동안 재사용, 할당량이 부족하면 만료된 결과도 사용)
     if news_key:
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://newsapi.org/v2/top-headlines",
-                    params={"country": "us", "pageSize": 1, "apiKey": news_key},
-                    timeout=5.0
+        await newsapi_quota.sync(news_key)
+        quota = newsapi_quota.state(news_key)
+        status_key = ("status", hashlib.sha256(news_key.encode("utf-8")).hexdigest()[:16])
+        known = await response_cache.lookup(status_key)
+        if known is not None and (known[2] or quota != QUOTA_PLENTY):
+            result["newsKeyValid"] = known[0]
+        elif quota == QUOTA_EXHAUSTED:
+            # 확인 없이 판단: 429를 받은 키는 NewsAPI가 인식한 키
+            result["newsKeyValid"] = newsapi_quota.blocked_for(news_key) > 0
+        else:
+            try:
+                client = http_clients.get("newsapi")
+                response = await call_upstream(
+                    "newsapi", "status",
+                    lambda timeout: client.get(
+                        "/v2/top-headlines",
+                        params={"country": "us", "pageSize": 1, "apiKey": news_key},
+                        timeout=timeout
+                    ),
+                    news_key, timeout=5.0
                 )
                 data = response.json()
-                result["newsKeyValid"] = data.get("status") == "ok"
-        except:
-            pass
+                result["newsKeyValid"] = data.get("status") == "ok" or data.get("code") == "rateLimited"
+                await response_cache.set(status_key, result["newsKeyValid"], STATUS_CACHE_TTL)
+            except:
+                pass
+        result["newsQuota"] = newsapi_quota.describe(news_key)
 
     # OpenAI 키 테스트 (간단한 확인)
     if ai_key:
@@ -437,47 +2911,317 @@ async def check_status(
     return result
 
 
-def extract_keywords(title: str) -> list:
-    """제목에서 키워드 추출"""
-    if not title:
-        return []
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 메트릭 (텍스트 형식)"""
+    return Response(content=metrics_registry.render(), media_type=Registry.CONTENT_TYPE)
+
+
+@app.get("/api/usage")
+async def usage_stats(days: int = Query(default=7, ge=1, le=90, description="조회 일수")):
+    """OpenAI 토큰 사용량 (일자 × 작업 × 호출 키) 및 기본 키 예산 상태"""
+    return await token_ledger.summary(days)
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """응답 캐시 통계"""
+    return {
+        "articles": await asyncio.to_thread(article_store.count),
+        "keywords": keyword_extractor.stats(),
+        "warm": warm_store.stats(),
+        "ingest": ingest_scheduler.stats(),
+        "response": response_cache.stats(),
+        "encoded": encoded_responses.stats(),
+        "newsapiQuota": newsapi_quota.stats(),
+        "upstreams": {name: policy.stats() for name, policy in upstream_policies.items()},
+        "translation": translation_memory.stats(),
+        "analysis": analysis_cache.stats(),
+    }
+
 
-    stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'in', 'on', 'at',
-                 'to', 'for', 'of', 'and', 'or', 'but', 'with', 'as', 'by', 'from',
-                 '이', '가', '은', '는', '을', '를', '의', '에', '에서', '로', '으로'}
+@app.delete("/api/cache/analysis")
+async def clear_analysis_cache(request: Request):
+    """분석 결과 캐시 무효화 (관리자 토큰 필요)"""
+    require_admin(request)
+    await analysis_cache.clear()
+    return {"success": True}
 
-    words = title.replace('-', ' ').replace(':', ' ').split()
-    keywords = []
 
-    for word in words:
-        clean_word = ''.join(c for c in word if c.isalnum())
-        if len(clean_word) >= 3 and clean_word.lower() not in stopwords:
-            keywords.append(clean_word)
-            if len(keywords) >= 3:
-                break
+async def process_articles(raw_articles: list, summary_from_content: int = 0, first_id: int = 1) -> list:
+    """NewsAPI 기사 목록 → Article 목록 (중복 묶기 + 키워드 추출, id는 first_id부터)"""
+    with phase("process"):
+        articles = [
+            Article.from_newsapi(raw, first_id + idx, summary_from_content)
+            for idx, raw in enumerate(raw_articles)
+        ]
+        articles = await collapse_duplicates(articles, first_id)
+    with phase("keywords"):
+        extract_keywords(articles)
+    return articles
+
 
-    return keywords
+async def collapse_duplicates(articles: list, first_id: int = 1) -> list:
+    """같은 기사(통신사 기사 재배포 등)를 대표 기사 하나로 묶음 (번역 전에 수행)
 
+    - 서명은 URL별로 저장소에 보관해 재계산하지 않음
+    - 대표 기사는 가장 먼저 수집된 URL (요청이 바뀌어도 같은 대표 유지)
+    - 대표 기사의 duplicates에 나머지 출처/URL 목록, id는 first_id부터 순서대로 다시 부여
+    """
+    if not DEDUP_ENABLED or len(articles) < 2:
+        return articles
 
-async def translate_articles(articles: list, openai_key: str) -> list:
-    """뉴스 기사들을 한국어로 번역"""
+    urls = [a.url or "" for a in articles]
+    known = await asyncio.to_thread(article_store.get_signatures, [url for url in urls if url])
+    now = time.time()
+    signatures = []
+    first_seen = []
+    new_signatures = {}
+    for article, url in zip(articles, urls):
+        if url in known:
+            sig, seen = known[url]
+        else:
+            sig, seen = simhash(f"{article.title or ''} {article.summary or ''}"), now
+            if url:
+                new_signatures[url] = sig
+        signatures.append(sig)
+        first_seen.append(seen)
+    await asyncio.to_thread(article_store.put_signatures, new_signatures)
+
+    collapsed = []
+    for group in group_near_duplicates(signatures, DEDUP_MAX_DISTANCE):
+        canonical_idx = min(group, key=lambda i: (first_seen[i], i))
+        canonical = articles[canonical_idx]
+        if len(group) > 1:
+            canonical.duplicates = [
+                {"source": articles[i].source, "url": articles[i].url}
+                for i in group if i != canonical_idx
+            ]
+        collapsed.append(canonical)
+
+    for idx, article in enumerate(collapsed):
+        article.id = first_id + idx
+    return collapsed
+
+
+def extract_keywords(articles: list, top_k: int = 3):
+    """기사 배치의 키워드를 한 번에 추출 (제목 + 요약 TF-IDF, 롤링 DF 갱신)"""
+    if not articles:
+        return
+    titles = [a.title or "" for a in articles]
+    bodies = [a.summary or "" for a in articles]
+    for article, keywords in zip(articles, keyword_extractor.extract(titles, bodies, top_k)):
+        article.keywords = keywords
+    keyword_extractor.observe([
+        (a.url or title, f"{title} {body}")
+        for a, title, body in zip(articles, titles, bodies)
+    ])
+
+
+async def translate_articles(articles: list, openai_key: str, on_translated=None) -> list:
+    """뉴스 기사들을 한국어로 번역 (번역 메모리에 없는 문자열만 요청)
+
+    on_translated: 기사에 번역이 적용될 때마다 호출되는 콜백 (스트리밍용)
+    """
     if not openai_key or not articles:
         return articles
 
-    # 번역할 텍스트 준비
-    texts_to_translate = []
+    def apply(article, translations):
+        article.title_original = article.title
+        article.summary_original = article.summary
+        article.title = translations.get("title", article.title)
+        article.summary = translations.get("summary", article.summary)
+        if on_translated is not None:
+            on_translated(article)
+
+    def memory_key(text):
+        return PersistentCache.make_key(text, TRANSLATION_TARGET_LANG, TRANSLATION_MODEL)
+
+    # 기사별 원문 → 번역 메모리 키
+    article_keys = []
     for article in articles:
-        texts_to_translate.append({
-            "id": article.get("id"),
-            "title": article.get("title", ""),
-            "summary": article.get("summary", "")
+        article_keys.append({
+            field: memory_key(getattr(article, field))
+            for field in TRANSLATED_FIELDS
+            if getattr(article, field)
         })
 
+    known = await translation_memory.get_many(
+        list({key for keys in article_keys for key in keys.values()})
+    )
+
+    # 토큰 예산: 절약 모드는 제목만 요청, 소진 시 번역 메모리만 사용
+    await token_ledger.sync()
+    budget = token_ledger.level(openai_key)
+    # OpenAI 서킷이 열려 있을 때도 번역 메모리만 사용 (기다리지 않고 원문 반환)
+    memory_only = budget == BUDGET_EXHAUSTED or upstream_policies["openai"].breaker.is_open()
+
+    # 번역 메모리에 모두 있는 기사는 바로 적용, 나머지는 번역 요청 (메모리 미스만)
+    texts_to_translate = []
+    pending = {}
+    for article, keys in zip(articles, article_keys):
+        item = {
+            field: getattr(article, field)
+            for field, key in keys.items()
+            if key not in known
+        }
+        if budget == BUDGET_LOW:
+            item.pop("summary", None)
+        if item and not memory_only:
+            texts_to_translate.append({"id": article.id, **item})
+            pending[article.id] = (article, keys)
+        elif any(key in known for key in keys.values()):
+            apply(article, {field: known[key] for field, key in keys.items() if key in known})
+
+    async def translate_chunk(chunk: list):
+        payload = json.dumps(chunk, ensure_ascii=False, indent=2)
+        max_tokens = min(4096, int(sum(estimate_tokens(item) for item in chunk) * 2.5) + 200)
+
+        # 실패한 청크만 재시도
+        for attempt in range(TRANSLATION_RETRIES + 1):
+            try:
+                # 동일한 번역 청크는 하나의 OpenAI 호출로 합침
+                translation_map = await single_flight.do(
+                    ("translate", openai_key, payload),
+                    lambda: request_translations(payload, openai_key, max_tokens)
+                )
+                break
+            except CircuitOpenError:
+                return
+            except json.JSONDecodeError as e:
+                TRANSLATION_PARSE_ERRORS.inc()
+                logger.warning("Translation JSON parse error (attempt %d): %s", attempt + 1, e)
+            except Exception as e:
+                logger.warning("Translation error (attempt %d): %s", attempt + 1, e)
+        else:
+            return
+
+        # 새 번역 결과를 메모리에 저장하고 기사에 적용 (id 기준)
+        learned = {}
+        for item in chunk:
+            trans = translation_map.get(item["id"])
+            if not trans:
+                continue
+            for field in ("title", "summary"):
+                translated = trans.get(f"{field}_ko")
+                if field in item and isinstance(translated, str) and translated:
+                    learned[memory_key(item[field])] = translated
+        await translation_memory.put_many(learned)
+        known.update(learned)
+
+        for item in chunk:
+            article, keys = pending[item["id"]]
+            translations = {field: known[key] for field, key in keys.items() if key in known}
+            if translations:
+                apply(article, translations)
+
+    # 토큰 수 기준 청크로 나눠 병렬 번역 (동시 실행 수는 세마포어로 제한)
+    await asyncio.gather(*(
+        translate_chunk(chunk)
+        for chunk in chunk_by_tokens(texts_to_translate, TRANSLATION_CHUNK_TOKENS)
+    ))
+
+    return articles
+
+
+async def translate_within_budget(articles: list, openai_key: str, on_late=None) -> list:
+    """남은 지연 예산 안에서만 번역을 기다림
+
+    - 예산이 없으면(백그라운드 수집 등) 끝까지 기다림
+    - 예산을 넘기면 원문을 바로 반환하고, 번역은 백그라운드에서 마저 진행 (번역 메모리에 저장)
+    - on_late: 늦게 끝난 번역 결과를 받는 콜백
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return await translate_articles(articles, openai_key)
+
+    task = run_in_background(translate_articles([a.copy() for a in articles], openai_key))
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), remaining)
+    except asyncio.TimeoutError:
+        UPSTREAM_EVENTS.labels("openai", "translation_deferred").inc()
+        if on_late is not None:
+            task.add_done_callback(
+                lambda t: on_late(t.result()) if not t.cancelled() and t.exception() is None else None
+            )
+        return articles
+
+
+async def translate_article_lists(lists: list, openai_key: str, on_late=None) -> list:
+    """여러 기사 목록을 (제목, 요약) 기준으로 중복 없이 한 번에 번역 → 번역이 적용된 새 목록들
+
+    - 원래 목록과 기사는 바꾸지 않음 (캐시/single-flight로 공유될 수 있음)
+    - 지연 예산을 넘기면 원문 목록을 반환하고, 늦게 끝난 번역은 on_late(새 목록들)로 전달
+    """
+    unique = {}
+    for articles in lists:
+        for article in articles:
+            if not article.translated:
+                unique.setdefault((article.title, article.summary), article)
+    if not unique:
+        return lists
+    texts = list(unique)
+    batch = [article.copy(id=idx + 1) for idx, article in enumerate(unique.values())]
+
+    def apply(translated_batch: list) -> list:
+        done = {text: a for text, a in zip(texts, translated_batch) if a.translated}
+        applied = []
+        for articles in lists:
+            applied.append([
+                article.copy(
+                    title=t.title, summary=t.summary,
+                    title_original=t.title_original, summary_original=t.summary_original
+                ) if (t := done.get((article.title, article.summary))) is not None and not article.translated
+                else article
+                for article in articles
+            ])
+        return applied
+
+    on_late_batch = (lambda translated_batch: on_late(apply(translated_batch))) if on_late is not None else None
+    return apply(await translate_within_budget(batch, openai_key, on_late_batch))
+
+
+def budget_exhausted() -> bool:
+    """기본 OpenAI 키의 오늘 토큰 예산 소진 여부"""
+    return token_ledger.level(DEFAULT_OPENAI_API_KEY) == BUDGET_EXHAUSTED
+
+
+def estimate_tokens(item: dict) -> int:
+    """대략적인 토큰 수 추정 (영문 약 4자당 1토큰, 비ASCII 문자는 1자당 1토큰)"""
+    tokens = 4  # 항목별 JSON 구조 오버헤드
+    for value in item.values():
+        if isinstance(value, str):
+            non_ascii = sum(1 for c in value if ord(c) > 127)
+            tokens += (len(value) - non_ascii) // 4 + non_ascii + 1
+    return tokens
+
+
+def chunk_by_tokens(items: list, max_tokens: int) -> list:
+    """추정 토큰 수가 max_tokens를 넘지 않도록 항목을 묶음 (항목 하나는 쪼개지 않음)"""
+    chunks = []
+    current = []
+    current_tokens = 0
+    for item in items:
+        tokens = estimate_tokens(item)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def request_translations(payload: str, openai_key: str, max_tokens: int = 2000) -> dict:
+    """OpenAI 번역 호출 → {id: 번역 결과} (실패 시 예외)"""
     prompt = f"""다음 뉴스 기사 제목과 요약을 한국어로 번역해주세요.
 자연스러운 한국어로 번역하되, 뉴스 헤드라인 스타일을 유지해주세요.
+title 또는 summary가 없는 항목은 해당 번역 필드를 생략해주세요.
 
 [번역할 내용]
-{json.dumps(texts_to_translate, ensure_ascii=False, indent=2)}
+{payload}
 
 [응답 형식]
 정확히 다음 JSON 형식으로만 응답해주세요 (다른 텍스트 없이):
@@ -487,72 +3231,233 @@ async def translate_articles(articles: list, openai_key: str) -> list:
 ]
 """
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {openai_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "당신은 전문 뉴스 번역가입니다. 영어 뉴스를 자연스러운 한국어로 번역합니다. JSON 형식으로만 응답하세요."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 2000
-                },
-                timeout=60.0
-            )
+    client = http_clients.get("openai")
+    async with translation_semaphore:
+        response = await call_upstream("openai", "translation", lambda timeout: client.post(
+            "/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {openai_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": TRANSLATION_MODEL,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "당신은 전문 뉴스 번역가입니다. 영어 뉴스를 자연스러운 한국어로 번역합니다. JSON 형식으로만 응답하세요."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.3,
+                "max_tokens": max_tokens
+            },
+            timeout=timeout
+        ), idempotent=False)
+
+    if response.status_code != 200:
+        raise RuntimeError(f"Translation API error: {response.status_code}")
+
+    data = response.json()
+    await record_token_usage("translation", data.get("usage"), openai_key)
+    result_text = data["choices"][0]["message"]["content"]
+
+    # JSON 파싱 (마크다운 코드블록 제거)
+    result_text = result_text.strip()
+    if result_text.startswith("```"):
+        result_text = re.sub(r'^```json?\n?', '', result_text)
+        result_text = re.sub(r'\n?```$', '', result_text)
+
+    translations = json.loads(result_text)
+    return {t["id"]: t for t in translations}
+
+
+# ============================================
+# 백그라운드 수집 (표준 카테고리 미리 채우기)
+# ============================================
+INGEST_ENABLED = os.getenv("INGEST_ENABLED", "false").lower() == "true"  # NewsAPI/OpenAI 비용이 들어 기본 꺼짐
+INGEST_INTERVAL = float(os.getenv("INGEST_INTERVAL", "1800"))
+INGEST_JITTER = float(os.getenv("INGEST_JITTER", "0.1"))  # 주기 대비 비율
+INGEST_DAILY_BUDGET = int(os.getenv("INGEST_DAILY_BUDGET", "50"))  # NewsAPI 무료: 100요청/일
+INGEST_LANGUAGES = [x for x in os.getenv("INGEST_LANGUAGES", "en").split(",") if x]
+INGEST_COUNTRIES = [x for x in os.getenv("INGEST_COUNTRIES", "us").split(",") if x]
+INGEST_NEWS_PAGE_SIZE = 20  # /api/news 최대 page_size
+INGEST_HEADLINES_PAGE_SIZE = 10  # /api/headlines 최대 page_size
+
+
+class WarmStore:
+    """백그라운드 수집 결과 저장소
+
+    - 키별로 최대 page_size만큼 수집해 두고 요청 page_size만큼 잘라서 제공
+    - max_age 또는 해당 응답 캐시 TTL이 지난 결과는 제공하지 않음 (일반 경로로 폴백해 stale 여부를 표시)
+    """
 
-            if response.status_code != 200:
-                print(f"Translation API error: {response.status_code}")
-                return articles
+    def __init__(self):
+        self._data = {}  # key -> (fetched_at, articles)
+        self.max_age = INGEST_INTERVAL * 2
+        self.ttls = {"news": NEWS_CACHE_TTL, "headlines": HEADLINES_CACHE_TTL}
+        self.hits = 0
 
-            data = response.json()
-            result_text = data["choices"][0]["message"]["content"]
+    def put(self, *key, articles: list, fetched_at: float = None):
+        self._data[key] = (time.time() if fetched_at is None else fetched_at, articles)
 
-            # JSON 파싱 (마크다운 코드블록 제거)
-            result_text = result_text.strip()
-            if result_text.startswith("```"):
-                result_text = re.sub(r'^```json?\n?', '', result_text)
-                result_text = re.sub(r'\n?```$', '', result_text)
+    def get(self, *key, page_size: int):
+        entry = self._data.get(key)
+        max_age = min(self.max_age, self.ttls.get(key[0], self.max_age))
+        if entry is None or time.time() - entry[0] > max_age:
+            return None
+        self.hits += 1
+        return entry[1][:page_size]
 
-            translations = json.loads(result_text)
+    def stats(self) -> dict:
+        return {"entries": len(self._data), "hits": self.hits}
 
-            # 번역 결과를 기사에 적용
-            translation_map = {t["id"]: t for t in translations}
 
-            for article in articles:
-                article_id = article.get("id")
-                if article_id in translation_map:
-                    trans = translation_map[article_id]
-                    article["title_original"] = article["title"]
-                    article["summary_original"] = article["summary"]
-                    article["title"] = trans.get("title_ko", article["title"])
-                    article["summary"] = trans.get("summary_ko", article["summary"])
+warm_store = WarmStore()
 
-            return articles
 
-    except json.JSONDecodeError as e:
-        print(f"Translation JSON parse error: {e}")
-        return articles
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return articles
+class IngestScheduler:
+    """표준 카테고리 뉴스/헤드라인을 주기적으로 수집·번역
 
+    - 카테고리 × 언어(everything) + 카테고리 × 국가(top-headlines)
+    - 하루 NewsAPI 예산을 넘지 않도록 수집 주기를 늘림
+    - 주기에 지터를 주어 여러 인스턴스가 동시에 호출하지 않도록 함
+    - 공유 응답 캐시에 신선한 결과가 있으면 그대로 사용 (여러 워커가 같은 수집을 반복하지 않음)
+    """
 
-# 정적 파일 서빙
-app.mount("/css", StaticFiles(directory="css"), name="css")
-app.mount("/js", StaticFiles(directory="js"), name="js")
+    def __init__(self):
+        self._task = None
+        self.runs = 0
+        self.upstream_calls = 0
+        self.errors = 0
+        self.skipped = 0
+        self.reused = 0
+        self.last_run = None
+        self.paused_until = 0.0
+
+    def jobs(self) -> list:
+        jobs = []
+        for language in INGEST_LANGUAGES:
+            for category in CATEGORY_KEYWORDS:
+                jobs.append(("news", build_search_query("", category), language))
+        for country in INGEST_COUNTRIES:
+            for api_category in sorted(set(HEADLINE_CATEGORIES.values())):
+                jobs.append(("headlines", country, api_category))
+        return jobs
+
+    def interval(self) -> float:
+        """하루 예산 안에서 가능한 최소 주기"""
+        calls_per_run = len(self.jobs())
+        if INGEST_DAILY_BUDGET <= 0:
+            return float("inf")
+        return max(INGEST_INTERVAL, 86400 * calls_per_run / INGEST_DAILY_BUDGET)
+
+    def start(self):
+        if self._task is None:
+            warm_store.max_age = self.interval() * 2
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self):
+        # 시작 직후 몰리지 않도록 짧은 지터
+        await asyncio.sleep(random.uniform(0, 5))
+        while True:
+            if time.time() >= self.paused_until:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    # 한 번의 실패로 수집이 멈추지 않도록 다음 주기에 다시 시도
+                    self.errors += 1
+                    logger.exception("Ingest run error: %r", e)
+            interval = self.interval()
+            if interval == float("inf"):
+                return
+            await asyncio.sleep(interval * random.uniform(1 - INGEST_JITTER, 1 + INGEST_JITTER))
+
+    async def run_once(self):
+        from_date = news_from_date()
+        for job in self.jobs():
+            # 할당량이 넉넉할 때만 수집 (남은 호출은 사용자 요청에 양보)
+            await newsapi_quota.sync(DEFAULT_NEWS_API_KEY)
+            if newsapi_quota.state(DEFAULT_NEWS_API_KEY) != QUOTA_PLENTY:
+                self.skipped += 1
+                logger.info("Ingest skipped: NewsAPI quota %s", newsapi_quota.state(DEFAULT_NEWS_API_KEY))
+                break
+            # 공유 캐시에 신선한 결과가 있으면(다른 워커/인스턴스가 수집) 업스트림을 호출하지 않음
+            if job[0] == "news":
+                cache_key = ("news", job[1], job[2], INGEST_NEWS_PAGE_SIZE, from_date, True, 1)
+            else:
+                cache_key = ("headlines", job[1], job[2], INGEST_HEADLINES_PAGE_SIZE)
+            cached = await response_cache.lookup(cache_key, record=False)
+            if cached is not None and cached[2]:
+                warm_store.put(*job, articles=cached[0], fetched_at=time.time() - cached[1])
+                self.reused += 1
+                continue
+            try:
+                if job[0] == "news":
+                    _, search_query, language = job
+                    articles = await single_flight.do(
+                        cache_key + (DEFAULT_NEWS_API_KEY,),
+                        lambda: load_news_articles(
+                            cache_key, search_query, language, INGEST_NEWS_PAGE_SIZE,
+                            from_date, True, DEFAULT_NEWS_API_KEY
+                        )
+                    )
+                else:
+                    _, country, api_category = job
+                    articles = await single_flight.do(
+                        cache_key + (DEFAULT_NEWS_API_KEY,),
+                        lambda: load_headline_articles(
+                            cache_key, country, api_category,
+                            INGEST_HEADLINES_PAGE_SIZE, DEFAULT_NEWS_API_KEY
+                        )
+                    )
+                warm_store.put(*job, articles=articles)
+            except HTTPException as e:
+                self.errors += 1
+                logger.warning("Ingest error %s: %s", job, e.detail)
+                # 할당량 초과 시 나머지 작업을 건너뛰고 한 시간 쉼
+                if "rateLimited" in str(e.detail) or "too many requests" in str(e.detail).lower():
+                    self.paused_until = time.time() + 3600
+                    break
+            except Exception as e:
+                # 예상하지 못한 오류(HTML 오류 응답 파싱 실패 등)도 해당 작업만 건너뜀
+                self.errors += 1
+                logger.exception("Ingest error %s: %r", job, e)
+            finally:
+                self.upstream_calls += 1
+            # 작업 사이 간격 (업스트림 부하 분산)
+            await asyncio.sleep(random.uniform(0.2, 1.0))
+        await asyncio.to_thread(article_store.prune, ARTICLE_RETENTION_DAYS)
+        self.runs += 1
+        self.last_run = datetime.now().isoformat(timespec="seconds")
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "upstreamCalls": self.upstream_calls,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "reused": self.reused,
+            "lastRun": self.last_run,
+            "interval": self.interval(),
+        }
+
+
+ingest_scheduler = IngestScheduler()
+
+
+# 정적 파일 서빙 (미리 압축된 변형 + ETag)
+app.mount("/css", PrecompressedFiles("css"), name="css")
+app.mount("/js", PrecompressedFiles("js"), name="js")
 
 
 if __name__ == "__main__":
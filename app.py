@@ -10,6 +10,7 @@ import os
 from datetime import datetime, timedelta
 from newsapi import NewsApiClient
 from openai import OpenAI
+from sentiment import analyze_local
 
 
 # ============================================
@@ -156,13 +157,9 @@ def summarize_and_analyze(client: OpenAI, text: str) -> dict:
         return parse_analysis_result(result_text)
 
     except Exception as e:
-        st.error(f"OpenAI API 오류: {str(e)}")
-        return {
-            "summary": "분석 중 오류가 발생했습니다.",
-            "positive": 50,
-            "negative": 50,
-            "sentiment": "분석 실패"
-        }
+        # OpenAI 실패 시 로컬 사전 기반 분석으로 대체
+        st.warning(f"OpenAI API 오류로 로컬 분석 결과를 표시합니다: {str(e)}")
+        return analyze_local(text[:2000])
 
 
 def parse_analysis_result(text: str) -> dict:
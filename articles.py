@@ -0,0 +1,108 @@
+"""
+ROKEY NEWS 기사 레코드 / JSON 직렬화
+- Article: 수집 → 중복 묶기 → 키워드 → 번역 → 캐시 → 응답까지 공유하는 __slots__ 레코드
+- NewsAPI 응답(everything, top-headlines) → Article 변환을 한 곳에서 수행
+- dumps: orjson이 있으면 사용 (없으면 json), Article은 to_dict()로 직렬화
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+
+class Article:
+    """기사 하나 (필드 이름 = 응답 JSON 키)
+
+    - 기본 필드는 값이 없어도(None) 항상 직렬화
+    - 선택 필드(번역 원문, 중복 목록, 분석 결과 등)는 값이 있을 때만 직렬화
+    - 캐시/single-flight로 공유되는 객체이므로 요청별 변경은 copy() 후에 수행
+    """
+
+    FIELDS = ("id", "title", "summary", "content", "source", "url", "image", "publishedAt")
+    OPTIONAL_FIELDS = (
+        "keywords", "duplicates", "title_original", "summary_original",
+        "category", "analysis", "positive", "negative", "sentiment",
+    )
+    __slots__ = FIELDS + OPTIONAL_FIELDS
+
+    def __init__(self, id: int = 0, title: str = "", summary: str = "", content: str = "",
+                 source: str = "Unknown", url: str = "", image: str = "", publishedAt: str = "",
+                 **optional):
+        self.id = id
+        self.title = title
+        self.summary = summary
+        self.content = content
+        self.source = source
+        self.url = url
+        self.image = image
+        self.publishedAt = publishedAt
+        for name in self.OPTIONAL_FIELDS:
+            setattr(self, name, optional.pop(name, None))
+        if optional:
+            raise TypeError(f"unknown article fields: {', '.join(optional)}")
+
+    @classmethod
+    def from_newsapi(cls, raw: dict, id: int, summary_from_content: int = 0) -> "Article":
+        """NewsAPI 기사 → Article (summary_from_content > 0이면 설명이 없을 때 본문 앞부분을 요약으로)"""
+        summary = raw.get("description") or ""
+        if not summary and summary_from_content:
+            summary = (raw.get("content") or "")[:summary_from_content]
+        return cls(
+            id=id,
+            title=raw.get("title", ""),
+            summary=summary,
+            content=raw.get("content", ""),
+            source=(raw.get("source") or {}).get("name", "Unknown"),
+            url=raw.get("url", ""),
+            image=raw.get("urlToImage", ""),
+            publishedAt=raw.get("publishedAt", ""),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        """저장소에 보관한 JSON → Article (모르는 키는 무시)"""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        for name in self.OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+    def copy(self, **changes) -> "Article":
+        article = Article.__new__(Article)
+        for name in self.__slots__:
+            setattr(article, name, changes.pop(name) if name in changes else getattr(self, name))
+        if changes:
+            raise TypeError(f"unknown article fields: {', '.join(changes)}")
+        return article
+
+    @property
+    def translated(self) -> bool:
+        return self.title_original is not None
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, url={self.url!r})"
+
+
+def load_articles(data: list) -> list:
+    """JSON으로 복원한 기사 목록 → Article 목록"""
+    return [Article.from_dict(item) for item in data]
+
+
+def _default(value):
+    if isinstance(value, Article):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """UTF-8 JSON (공백 없음, Article 포함)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
@@ -0,0 +1,223 @@
+"""
+ROKEY NEWS 벤치마크용 가짜 업스트림 서버
+- NewsAPI: /v2/everything, /v2/top-headlines
+- OpenAI: /v1/chat/completions (번역 / 단건 분석 / 일괄 분석 형식 응답)
+- 지연 분포, 기사 본문 크기, 오류율을 환경 변수로 설정
+- /__stats: 업스트림별 호출 수 (캐시/풀링 효과 비교용)
+
+실행:
+    uvicorn mock_upstreams:app --app-dir bench --port 9100
+
+지연 분포 형식 (밀리초):
+    fixed:50            항상 50ms
+    uniform:20:80       20~80ms 균등 분포
+    lognormal:80:300    중앙값 80ms, p95 300ms 로그정규 분포
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+
+
+# ============================================
+# 설정
+# ============================================
+MOCK_SEED = int(os.getenv("MOCK_SEED", "42"))
+MOCK_NEWS_LATENCY = os.getenv("MOCK_NEWS_LATENCY", "lognormal:120:400")
+MOCK_OPENAI_LATENCY = os.getenv("MOCK_OPENAI_LATENCY", "lognormal:800:2500")
+MOCK_NEWS_ERROR_RATE = float(os.getenv("MOCK_NEWS_ERROR_RATE", "0"))
+MOCK_OPENAI_ERROR_RATE = float(os.getenv("MOCK_OPENAI_ERROR_RATE", "0"))
+MOCK_CONTENT_CHARS = int(os.getenv("MOCK_CONTENT_CHARS", "1200"))  # 기사 content 길이
+MOCK_TOTAL_RESULTS = int(os.getenv("MOCK_TOTAL_RESULTS", "500"))
+
+# 95 퍼센타일의 표준정규 분위수
+Z_95 = 1.6449
+
+WORDS = """
+market economy policy election summit startup chip battery climate energy rally trade
+tariff court senate budget vaccine hospital airline stadium league champion festival
+satellite rocket robot software cloud network privacy security bank currency inflation
+housing factory harbor railway bridge river forest drought storm harvest museum gallery
+theater novel concert album striker coach merger lawsuit regulator minister governor
+""".split()
+
+SOURCES = ["Reuters", "Associated Press", "BBC News", "CNN", "Bloomberg", "The Verge",
+           "TechCrunch", "Al Jazeera English", "The Guardian", "NPR"]
+
+
+def parse_latency(spec: str):
+    """지연 분포 문자열 → 초 단위 샘플 함수"""
+    kind, *args = spec.split(":")
+    values = [float(x) / 1000 for x in args]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, p95 = values
+        sigma = math.log(max(p95, median) / median) / Z_95 if median > 0 else 0.0
+        return lambda rng: rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+news_latency = parse_latency(MOCK_NEWS_LATENCY)
+openai_latency = parse_latency(MOCK_OPENAI_LATENCY)
+
+# 지연/오류 샘플링용 (시드 고정으로 실행 간 재현)
+rng = random.Random(MOCK_SEED)
+
+calls = {"newsapi": 0, "openai": 0, "errors": 0}
+
+app = FastAPI(title="ROKEY NEWS Mock Upstreams")
+
+
+# ============================================
+# NewsAPI
+# ============================================
+def fake_articles(key: str, page: int, page_size: int) -> list:
+    """요청 파라미터로 결정되는 기사 목록 (같은 요청이면 같은 기사)"""
+    seed = int.from_bytes(hashlib.sha256(f"{MOCK_SEED}|{key}|{page}".encode()).digest()[:8], "big")
+    local = random.Random(seed)
+    articles = []
+    for i in range(page_size):
+        title_words = local.sample(WORDS, 6)
+        body_words = [local.choice(WORDS) for _ in range(max(1, MOCK_CONTENT_CHARS // 7))]
+        body = " ".join(body_words)
+        articles.append({
+            "source": {"id": None, "name": local.choice(SOURCES)},
+            "author": "Mock Reporter",
+            "title": " ".join(title_words).capitalize() + " amid growing debate",
+            "description": " ".join(body_words[:30]).capitalize() + ".",
+            "url": f"https://mock.news/{hashlib.md5(f'{key}|{page}|{i}'.encode()).hexdigest()}",
+            "urlToImage": None,
+            "publishedAt": f"2026-01-{1 + (page + i) % 28:02d}T{i % 24:02d}:00:00Z",
+            "content": body[:MOCK_CONTENT_CHARS],
+        })
+    return articles
+
+
+async def news_response(request: Request, key: str):
+    calls["newsapi"] += 1
+    await asyncio.sleep(news_latency(rng))
+
+    params = request.query_params
+    if not params.get("apiKey"):
+        return JSONResponse(
+            status_code=401,
+            content={"status": "error", "code": "apiKeyMissing", "message": "Your API key is missing."}
+        )
+    if rng.random() < MOCK_NEWS_ERROR_RATE:
+        calls["errors"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"status": "error", "code": "rateLimited", "message": "You have made too many requests recently."}
+        )
+
+    page = int(params.get("page", "1"))
+    page_size = int(params.get("pageSize", "20"))
+    return {
+        "status": "ok",
+        "totalResults": MOCK_TOTAL_RESULTS,
+        "articles": fake_articles(key, page, page_size),
+    }
+
+
+@app.get("/v2/everything")
+async def everything(request: Request):
+    params = request.query_params
+    return await news_response(request, f"everything|{params.get('q', '')}|{params.get('language', '')}")
+
+
+@app.get("/v2/top-headlines")
+async def top_headlines(request: Request):
+    params = request.query_params
+    return await news_response(request, f"headlines|{params.get('country', '')}|{params.get('category', '')}")
+
+
+# ============================================
+# OpenAI chat completions
+# ============================================
+def translation_content(prompt: str) -> str:
+    """번역 프롬프트의 JSON 항목을 그대로 돌려주는 '번역' 결과"""
+    start = prompt.index("[번역할 내용]") + len("[번역할 내용]")
+    end = prompt.index("[응답 형식]")
+    items = json.loads(prompt[start:end])
+    result = []
+    for item in items:
+        out = {"id": item["id"]}
+        if "title" in item:
+            out["title_ko"] = f"[번역] {item['title']}"
+        if "summary" in item:
+            out["summary_ko"] = f"[번역] {item['summary']}"
+        result.append(out)
+    return json.dumps(result, ensure_ascii=False)
+
+
+def analysis_content(seed_text: str) -> str:
+    positive = int(hashlib.md5(seed_text.encode()).hexdigest()[:2], 16) * 100 // 255
+    return (
+        "요약:\n- 첫 번째 요점입니다.\n- 두 번째 요점입니다.\n- 세 번째 요점입니다.\n\n"
+        f"감성분석:\n긍정: {positive}%\n부정: {100 - positive}%"
+    )
+
+
+def completion_content(messages: list) -> str:
+    system = messages[0]["content"] if messages else ""
+    prompt = messages[-1]["content"] if messages else ""
+    if "번역" in system:
+        return translation_content(prompt)
+    # 일괄 분석: 기사별 '### 기사 N' 구역
+    ids = re.findall(r"^#+\s*기사\s*(\d+)", prompt, re.MULTILINE)
+    if ids:
+        return "\n\n".join(f"### 기사 {i}\n{analysis_content(prompt + i)}" for i in ids)
+    return analysis_content(prompt)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    calls["openai"] += 1
+    body = await request.json()
+    await asyncio.sleep(openai_latency(rng))
+
+    if not request.headers.get("authorization", "").startswith("Bearer "):
+        return JSONResponse(status_code=401, content={"error": {"message": "Missing API key", "type": "invalid_request_error"}})
+    if rng.random() < MOCK_OPENAI_ERROR_RATE:
+        calls["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": {"message": "The server had an error", "type": "server_error"}})
+
+    messages = body.get("messages", [])
+    content = completion_content(messages)
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-mock{calls['openai']}",
+        "object": "chat.completion",
+        "model": body.get("model", ""),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+# ============================================
+# 통계
+# ============================================
+@app.get("/__stats")
+async def stats():
+    return calls
+
+
+@app.post("/__reset")
+async def reset():
+    for key in calls:
+        calls[key] = 0
+    return calls
@@ -0,0 +1,315 @@
+"""
+ROKEY NEWS 벤치마크
+- 가짜 업스트림(mock_upstreams.py)과 api_server를 로컬에서 띄우고
+- /api/news, /api/headlines, /api/analyze, /api/status를 동시성 N으로 호출 (--endpoints에 dashboard 추가 가능)
+- 엔드포인트별 처리량, 지연 p50/p95/p99, 오류율, 업스트림 호출 수를 JSON으로 출력
+
+예시:
+    python bench/run_bench.py --requests 200 --concurrency 16 --output bench_result.json
+    python bench/run_bench.py --news-latency fixed:50 --openai-error-rate 0.05
+    python bench/run_bench.py --server-url http://localhost:8000 --mock-url http://localhost:9100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+ENDPOINTS = ("status", "news", "headlines", "analyze")
+
+QUERY_WORDS = ["ai", "chip", "climate", "election", "market", "rocket", "vaccine", "tariff",
+               "startup", "energy", "bank", "league", "housing", "privacy", "satellite", "drought"]
+HEADLINE_CATEGORIES = ["general", "technology", "business", "sports", "science", "health"]
+DASHBOARD_CATEGORIES = ["all", "tech", "economy", "politics", "world", "sports"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ROKEY NEWS API 벤치마크 (오프라인)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="쉼표로 구분한 대상 엔드포인트")
+    parser.add_argument("--requests", type=int, default=100, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전 엔드포인트별 워밍업 요청 수")
+    parser.add_argument("--distinct", type=int, default=8, help="서로 다른 검색어/카테고리/기사 수 (작을수록 캐시 적중 증가)")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--translate", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--analyze-engine", default="auto", choices=["auto", "llm", "local"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    # 가짜 업스트림
+    parser.add_argument("--news-latency", default="lognormal:120:400", help="NewsAPI 지연 분포 (ms)")
+    parser.add_argument("--openai-latency", default="lognormal:800:2500", help="OpenAI 지연 분포 (ms)")
+    parser.add_argument("--news-error-rate", type=float, default=0.0)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--content-chars", type=int, default=1200, help="기사 content 길이")
+    # 서버
+    parser.add_argument("--mock-port", type=int, default=9100)
+    parser.add_argument("--server-port", type=int, default=9000)
+    parser.add_argument("--server-url", default="", help="이미 실행 중인 api_server 주소 (지정 시 직접 띄우지 않음)")
+    parser.add_argument("--mock-url", default="", help="이미 실행 중인 가짜 업스트림 주소")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="api_server에 넘길 추가 환경 변수 (여러 번 지정 가능)")
+    parser.add_argument("--output", default="", help="결과 JSON 파일 (기본: stdout)")
+    return parser.parse_args()
+
+
+# ============================================
+# 프로세스 관리
+# ============================================
+def start_process(args: list, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", *args, "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env={**os.environ, **env},
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, proc: subprocess.Popen = None, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (code {proc.returncode}): {url}")
+        try:
+            await client.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버 응답 없음: {url}")
+
+
+def stop_process(proc: subprocess.Popen):
+    if proc is None or proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# ============================================
+# 요청 생성
+# ============================================
+def build_requests(endpoint: str, count: int, args, rng: random.Random) -> list:
+    """엔드포인트별 (method, path, params, json) 목록 (시드 고정으로 재현 가능)"""
+    requests = []
+    for _ in range(count):
+        pick = rng.randrange(args.distinct)
+        if endpoint == "status":
+            requests.append(("GET", "/api/status", {}, None))
+        elif endpoint == "news":
+            params = {
+                "q": QUERY_WORDS[pick % len(QUERY_WORDS)] + ("" if pick < len(QUERY_WORDS) else f" {pick}"),
+                "page_size": args.page_size,
+                "translate": str(args.translate).lower(),
+            }
+            requests.append(("GET", "/api/news", params, None))
+        elif endpoint == "headlines":
+            params = {
+                "category": HEADLINE_CATEGORIES[pick % len(HEADLINE_CATEGORIES)],
+                "country": "us" if pick < len(HEADLINE_CATEGORIES) else f"c{pick}",
+            }
+            requests.append(("GET", "/api/headlines", params, None))
+        elif endpoint == "analyze":
+            body = {
+                "title": f"Benchmark article {pick}",
+                "content": " ".join(random.Random(pick).choices(QUERY_WORDS, k=150)) + f" #{pick}",
+                "url": f"https://mock.news/bench/{pick}",
+                "engine": args.analyze_engine,
+            }
+            requests.append(("POST", "/api/analyze", {}, body))
+        elif endpoint == "dashboard":
+            params = {
+                "category": DASHBOARD_CATEGORIES[pick % len(DASHBOARD_CATEGORIES)],
+                "page_size": args.page_size,
+                "translate": str(args.translate).lower(),
+            }
+            requests.append(("GET", "/api/dashboard", params, None))
+        else:
+            raise ValueError(f"알 수 없는 엔드포인트: {endpoint}")
+    return requests
+
+
+# ============================================
+# 측정
+# ============================================
+def percentile(sorted_values: list, pct: float) -> float:
+    """선형 보간 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+async def run_phase(client: httpx.AsyncClient, requests: list, concurrency: int) -> dict:
+    """요청 목록을 동시성 제한 하에 실행하고 지연/상태 코드 집계"""
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    latencies = []
+    status_codes = {}
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        while True:
+            try:
+                method, path, params, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                await response.aread()
+                code = str(response.status_code)
+            except httpx.HTTPError as e:
+                code = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            status_codes[code] = status_codes.get(code, 0) + 1
+            if not code.startswith("2"):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "requests": total,
+        "errors": failures,
+        "error_rate": round(failures / total, 4) if total else 0.0,
+        "status_codes": status_codes,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / total, 2) if total else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def upstream_calls(client: httpx.AsyncClient, mock_url: str) -> dict:
+    response = await client.get(f"{mock_url}/__stats")
+    return response.json()
+
+
+async def main(args):
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    mock_url = args.mock_url or f"http://127.0.0.1:{args.mock_port}"
+    server_url = args.server_url or f"http://127.0.0.1:{args.server_port}"
+
+    mock_proc = None
+    server_proc = None
+    workdir = tempfile.TemporaryDirectory(prefix="rokey-bench-")
+
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout) as control:
+            if not args.mock_url:
+                mock_proc = start_process(
+                    ["mock_upstreams:app", "--app-dir", BENCH_DIR, "--port", str(args.mock_port)],
+                    {
+                        "MOCK_SEED": str(args.seed),
+                        "MOCK_NEWS_LATENCY": args.news_latency,
+                        "MOCK_OPENAI_LATENCY": args.openai_latency,
+                        "MOCK_NEWS_ERROR_RATE": str(args.news_error_rate),
+                        "MOCK_OPENAI_ERROR_RATE": str(args.openai_error_rate),
+                        "MOCK_CONTENT_CHARS": str(args.content_chars),
+                    },
+                )
+            await wait_ready(control, f"{mock_url}/__stats", mock_proc)
+
+            if not args.server_url:
+                # 실행마다 빈 저장소로 시작 (재현성), 실제 키 대신 가짜 키 사용
+                server_env = {
+                    "NEWS_API_BASE_URL": mock_url,
+                    "OPENAI_BASE_URL": mock_url,
+                    "NEWS_API_KEY": "bench-news-key",
+                    "OPENAI_API_KEY": "sk-bench-" + "0" * 32,
+                    "INGEST_ENABLED": "false",
+                    # 단일 클라이언트에서 부하를 주므로 요청 수 제한은 끔 (--server-env로 켤 수 있음)
+                    "RATE_LIMIT_ENABLED": "false",
+                    # NewsAPI 호출 수 한도도 끔 (가짜 업스트림이므로 429만 반영)
+                    "NEWSAPI_QUOTAS": "",
+                    "USAGE_DB_PATH": os.path.join(workdir.name, "usage.sqlite3"),
+                    "ARTICLE_DB_PATH": os.path.join(workdir.name, "articles.sqlite3"),
+                    "TRANSLATION_DB_PATH": os.path.join(workdir.name, "translations.sqlite3"),
+                    "ANALYSIS_DB_PATH": os.path.join(workdir.name, "analyses.sqlite3"),
+                }
+                for item in args.server_env:
+                    key, _, value = item.partition("=")
+                    server_env[key] = value
+                server_proc = start_process(
+                    ["api_server:app", "--port", str(args.server_port)],
+                    server_env,
+                )
+            await wait_ready(control, f"{server_url}/", server_proc)
+
+            rng = random.Random(args.seed)
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            results = {}
+            async with httpx.AsyncClient(base_url=server_url, timeout=args.timeout, limits=limits) as client:
+                for endpoint in endpoints:
+                    if args.warmup:
+                        await run_phase(client, build_requests(endpoint, args.warmup, args, rng), args.concurrency)
+                    before = await upstream_calls(control, mock_url)
+                    results[endpoint] = await run_phase(
+                        client, build_requests(endpoint, args.requests, args, rng), args.concurrency
+                    )
+                    after = await upstream_calls(control, mock_url)
+                    results[endpoint]["upstream_calls"] = {
+                        key: after[key] - before.get(key, 0) for key in after
+                    }
+                    print(
+                        f"{endpoint:>10}: {results[endpoint]['throughput_rps']:>8} req/s  "
+                        f"p50 {results[endpoint]['latency_ms']['p50']}ms  "
+                        f"p99 {results[endpoint]['latency_ms']['p99']}ms  "
+                        f"errors {results[endpoint]['errors']}",
+                        file=sys.stderr,
+                    )
+    finally:
+        stop_process(server_proc)
+        stop_process(mock_proc)
+        workdir.cleanup()
+
+    return {
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "server_env")
+        },
+        "server_env": args.server_env,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(main(arguments))
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
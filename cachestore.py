@@ -0,0 +1,430 @@
+"""
+ROKEY NEWS 캐시 저장소 (교체 가능한 백엔드)
+- MemoryStore: 프로세스 내 LRU (값 객체를 그대로 보관)
+- SQLiteStore: 같은 호스트의 여러 워커가 공유하는 SQLite 파일 (WAL)
+- RedisStore: Redis 프로토콜(RESP) 서버를 공유 (여러 인스턴스, redis-server / Valkey / KeyDB 등)
+
+세 저장소의 공통 규칙
+- put(ttl): 저장 후 ttl초까지 신선, 이후 retain초 동안은 만료된 값으로 조회 가능, 그 뒤에는 없는 것으로 취급
+- ttl이 없으면 만료 없음
+- 용량(항목 수 / 바이트)을 넘으면 가장 오래 쓰지 않은 항목부터 제거
+  (SQLite는 쓰기 PRUNE_EVERY번마다 정리, Redis는 서버의 maxmemory + allkeys-lru 설정을 따름)
+- 공유 저장소(shared=True)는 bytes만 보관 (직렬화는 호출하는 쪽에서)
+- 저장소 오류는 캐시 미스로 취급 (요청을 실패시키지 않음)
+"""
+
+from collections import OrderedDict
+from urllib.parse import unquote, urlsplit
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _expiry(now: float, ttl: float, retain: float):
+    """(신선 만료 시각, 삭제 시각), ttl이 없으면 (None, None)"""
+    if not ttl:
+        return None, None
+    return now + ttl, now + ttl + retain
+
+
+class MemoryStore:
+    """프로세스 내 LRU 저장소
+
+    - 값은 복사/직렬화 없이 그대로 보관 (조회하면 같은 객체)
+    - size를 주지 않으면 len(value) (bytes 값 기준)
+    """
+
+    shared = False
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._data = OrderedDict()  # key -> (value, stored_at, expires_at, drop_at, size)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list) -> dict:
+        """key -> (값, 저장 시각, 신선 만료 시각)"""
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                if entry[3] is not None and entry[3] <= now:
+                    self._remove(key)
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[:3]
+        return found
+
+    def put(self, key, value, ttl: float = None, retain: float = 0.0, size: int = None) -> float:
+        """저장하고 저장 시각 반환"""
+        now = time.time()
+        size = len(value) if size is None else size
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return now
+            self._data[key] = (value, now, *_expiry(now, ttl, retain), size)
+            self.total_bytes += size
+            while ((self.max_entries is not None and len(self._data) > self.max_entries)
+                   or (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+                self._remove(next(iter(self._data)))
+        return now
+
+    def put_many(self, items: dict, ttl: float = None, retain: float = 0.0):
+        for key, value in items.items():
+            self.put(key, value, ttl, retain)
+
+    def _remove(self, key):
+        self.total_bytes -= self._data.pop(key)[4]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._data),
+            "bytes": self.total_bytes,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+        }
+
+    def close(self):
+        pass
+
+
+class SQLiteStore:
+    """SQLite 파일 저장소 (같은 호스트의 워커/재시작 간 공유)
+
+    - WAL 모드: 읽기는 쓰기를 기다리지 않음
+    - 조회 시 accessed_at 갱신 (용량 상한이 있을 때만), 정리 시 삭제 시각이 지난 항목 + 용량 초과분 삭제
+    - 예전 스키마(key, value, expires_at) 테이블은 열을 추가해 그대로 사용
+    """
+
+    shared = True
+    PRUNE_EVERY = 100
+    COLUMNS = {
+        "stored_at": "REAL NOT NULL DEFAULT 0",
+        "drop_at": "REAL",
+        "accessed_at": "REAL NOT NULL DEFAULT 0",
+        "size": "INTEGER NOT NULL DEFAULT 0",
+    }
+
+    def __init__(self, path: str, table: str = "cache", max_entries: int = None, max_bytes: int = None):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL,"
+                + ",".join(f" {name} {decl}" for name, decl in self.COLUMNS.items()) + ")"
+            )
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+            missing = [name for name in self.COLUMNS if name not in existing]
+            for name in missing:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {name} {self.COLUMNS[name]}")
+            if missing:
+                conn.execute(f"UPDATE {self.table} SET drop_at = expires_at, size = length(value)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: list) -> dict:
+        if not keys:
+            return {}
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            try:
+                conn = self._db()
+                rows = conn.execute(
+                    f"SELECT key, value, stored_at, expires_at FROM {self.table} "
+                    f"WHERE key IN ({placeholders}) AND (drop_at IS NULL OR drop_at > ?)",
+                    [*keys, now]
+                ).fetchall()
+                if rows and (self.max_entries or self.max_bytes):
+                    conn.execute(
+                        f"UPDATE {self.table} SET accessed_at = ? "
+                        f"WHERE key IN ({','.join('?' * len(rows))})",
+                        [now, *(row[0] for row in rows)]
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Cache store read error (%s): %s", self.table, e)
+                return {}
+        # 예전 스키마에서 TEXT로 저장된 값도 bytes로
+        return {
+            key: (value.encode("utf-8") if isinstance(value, str) else value, stored_at, expires_at)
+            for key, value, stored_at, expires_at in rows
+        }
+
+    def put(self, key: str, value: bytes, ttl: float = None, retain: float = 0.0, size: int = None) -> float:
+        return self.put_many({key: value}, ttl, retain)
+
+    def put_many(self, items: dict, ttl: float = None, retain: float = 0.0) -> float:
+        now = time.time()
+        if not items:
+            return now
+        expires_at, drop_at = _expiry(now, ttl, retain)
+        with self._lock:
+            try:
+                conn = self._db()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.table} "
+                        "(key, value, expires_at, stored_at, drop_at, accessed_at, size) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(key, value, expires_at, now, drop_at, now, len(value))
+                         for key, value in items.items()]
+                    )
+                    self._writes += 1
+                    if self._writes % self.PRUNE_EVERY == 0:
+                        self._prune(conn, now)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning("Cache store write error (%s): %s", self.table, e)
+        return now
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """삭제 시각이 지난 항목 + 최근 사용 순으로 용량(항목 수 / 바이트)을 넘는 항목 삭제"""
+        conn.execute(f"DELETE FROM {self.table} WHERE drop_at <= ?", (now,))
+        if self.max_entries or self.max_bytes:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key,"
+                "   ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS rank,"
+                "   SUM(size) OVER (ORDER BY accessed_at DESC ROWS UNBOUNDED PRECEDING) AS running"
+                f"  FROM {self.table})"
+                " WHERE rank > ? OR running > ?)",
+                (self.max_entries or 2 ** 62, self.max_bytes or 2 ** 62)
+            )
+
+    def clear(self):
+        with self._lock:
+            try:
+                self._db().execute(f"DELETE FROM {self.table}")
+            except sqlite3.Error as e:
+                logger.warning("Cache store clear error (%s): %s", self.table, e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            try:
+                entries, total = self._db().execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+                ).fetchone()
+            except sqlite3.Error:
+                entries = total = None
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": total,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class RedisError(Exception):
+    """Redis 서버의 오류 응답"""
+
+
+class RedisStore:
+    """Redis 프로토콜 저장소 (RESP2, 의존성 없는 최소 클라이언트)
+
+    - 키: prefix + key, 값: 'stored_at expires_at\\n' 헤더 + 본문, 삭제 시각은 PX 만료로 지정
+    - 용량 제한/제거는 서버 설정(maxmemory, maxmemory-policy allkeys-lru)을 따름
+    - 연결 실패 시 retry_after초 동안 호출하지 않고 미스로 처리 (요청마다 타임아웃을 기다리지 않음)
+    - URL: redis://[:password@]host[:port][/db] (TLS 미지원)
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "", timeout: float = 0.5, retry_after: float = 5.0):
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"unsupported Redis URL scheme: {parts.scheme}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self.errors = 0
+
+    # ---------- RESP ----------
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    def _read(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("connection closed")
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise ConnectionError(f"invalid reply: {line!r}")
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock, self._file = sock, sock.makefile("rb")
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for reply in self._send(setup):
+            if isinstance(reply, RedisError):
+                raise reply
+
+    def _send(self, commands: list) -> list:
+        """명령 여러 개를 한 번에 보내고(파이프라인) 응답 목록 반환"""
+        if not commands:
+            return []
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read() for _ in commands]
+
+    def _pipeline(self, commands: list):
+        """응답 목록 또는 None (연결 오류 / 차단 중)"""
+        now = time.time()
+        with self._lock:
+            if now < self._down_until:
+                return None
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._send(commands)
+            except (OSError, ConnectionError, RedisError, ValueError) as e:
+                self.errors += 1
+                self._down_until = now + self.retry_after
+                self._disconnect()
+                logger.warning("Cache store error (redis %s:%s): %s", self.host, self.port, e)
+                return None
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._file = None
+
+    # ---------- 저장소 ----------
+    def get_many(self, keys: list) -> dict:
+        if not keys:
+            return {}
+        replies = self._pipeline([("MGET", *(self.prefix + key for key in keys))])
+        if replies is None or not isinstance(replies[0], list):
+            return {}
+        found = {}
+        for key, raw in zip(keys, replies[0]):
+            if not isinstance(raw, bytes):
+                continue
+            header, _, value = raw.partition(b"\n")
+            stored_at, _, expires_at = header.decode().partition(" ")
+            found[key] = (value, float(stored_at), float(expires_at) if expires_at != "-" else None)
+        return found
+
+    def put(self, key: str, value: bytes, ttl: float = None, retain: float = 0.0, size: int = None) -> float:
+        return self.put_many({key: value}, ttl, retain)
+
+    def put_many(self, items: dict, ttl: float = None, retain: float = 0.0) -> float:
+        now = time.time()
+        if not items:
+            return now
+        expires_at, _ = _expiry(now, ttl, retain)
+        header = f"{now!r} {'-' if expires_at is None else repr(expires_at)}\n".encode()
+        expiry = ("PX", max(1, int((ttl + retain) * 1000))) if ttl else ()
+        self._pipeline([
+            ("SET", self.prefix + key, header + value, *expiry)
+            for key, value in items.items()
+        ])
+        return now
+
+    def clear(self):
+        """prefix로 시작하는 키 삭제 (SCAN + DEL)"""
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in self.prefix) + "*"
+        cursor = "0"
+        while True:
+            replies = self._pipeline([("SCAN", cursor, "MATCH", pattern, "COUNT", 500)])
+            if replies is None or not isinstance(replies[0], list):
+                return
+            cursor, keys = replies[0][0].decode(), replies[0][1]
+            if keys:
+                self._pipeline([("DEL", *keys)])
+            if cursor == "0":
+                return
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "server": f"{self.host}:{self.port}/{self.db}",
+            "prefix": self.prefix,
+            "connected": self._sock is not None,
+            "errors": self.errors,
+        }
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
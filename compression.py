@@ -0,0 +1,181 @@
+"""
+ROKEY NEWS 응답 압축 / 조건부 요청
+- EncodedBody: 응답 본문 + gzip/brotli 변형 + strong ETag (압축 결과는 객체에 보관해 재사용)
+- Accept-Encoding 협상, If-None-Match 일치 시 304 Not Modified
+- PrecompressedFiles: 정적 파일을 시작 시 읽어 압축 변형과 함께 메모리에서 제공하는 ASGI 앱
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip만 사용
+    brotli = None
+
+
+# 선호 순서 (같은 q 값이면 앞쪽 우선)
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+MIN_COMPRESS_SIZE = 512  # 이보다 작은 본문은 압축하지 않음
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """정적 파일은 최고 압축률, API 응답은 속도 우선"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if static else 5)
+    return gzip.compress(body, compresslevel=9 if static else 6, mtime=0)
+
+
+def negotiate(accept_encoding: str) -> str:
+    """Accept-Encoding → 사용할 인코딩 ('identity' 포함)"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = "identity", 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교, '*' 포함)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class EncodedBody:
+    """응답 본문 하나와 인코딩별 변형
+
+    - ETag는 본문 해시 (인코딩별로 '-gzip', '-br' 접미사를 붙여 변형마다 다른 strong ETag)
+    - 변형은 처음 요청될 때 한 번만 압축 (precompress=True면 생성 시 모두 압축)
+    - 압축해도 작아지지 않으면 원본 제공
+    """
+
+    __slots__ = ("body", "digest", "static", "_variants")
+
+    def __init__(self, body: bytes, static: bool = False, precompress: bool = False):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.static = static
+        self._variants = {}
+        if precompress:
+            for encoding in ENCODINGS:
+                self.variant(encoding)
+
+    def variant(self, encoding: str):
+        """인코딩된 본문 (압축 이득이 없으면 None)"""
+        if encoding == "identity" or len(self.body) < MIN_COMPRESS_SIZE:
+            return None
+        if encoding not in self._variants:
+            compressed = compress(self.body, encoding, self.static)
+            self._variants[encoding] = compressed if len(compressed) < len(self.body) else None
+        return self._variants[encoding]
+
+    def response(self, headers: Headers, media_type: str, cache_control: str = "no-cache") -> Response:
+        """요청 헤더에 맞춘 응답 (ETag 일치 시 304)"""
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        body = self.variant(encoding)
+        if body is None:
+            encoding, body = "identity", self.body
+        etag = f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+        response_headers = {"etag": etag, "vary": "Accept-Encoding", "cache-control": cache_control}
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=response_headers)
+        if encoding != "identity":
+            response_headers["content-encoding"] = encoding
+        return Response(body, media_type=media_type, headers=response_headers)
+
+    def stats(self) -> dict:
+        return {
+            "identity": len(self.body),
+            **{encoding: len(body) for encoding, body in self._variants.items() if body is not None},
+        }
+
+
+class PrecompressedFiles:
+    """디렉터리의 정적 파일을 메모리에서 제공하는 ASGI 앱 (StaticFiles 대체)
+
+    - 시작 시 모든 파일을 읽고 압축 변형을 미리 생성
+    - 요청마다 mtime을 확인해 바뀐 파일은 다시 읽음 (개발 중 수정 반영)
+    - GET/HEAD만 허용, 디렉터리 밖 경로는 404
+    - names를 주면 그 파일들만 제공 (프로젝트 루트의 index.html 등)
+    """
+
+    def __init__(self, directory: str, cache_control: str = "no-cache", names: list = None):
+        self.directory = os.path.realpath(directory)
+        self.cache_control = cache_control
+        self.names = set(names) if names is not None else None
+        self._files = {}  # 상대 경로 -> (mtime, media_type, EncodedBody)
+        if self.names is None:
+            names = [
+                os.path.relpath(os.path.join(root, name), self.directory)
+                for root, _, files in os.walk(self.directory) for name in files
+            ]
+        for name in names:
+            self.get(name)
+
+    def get(self, relative_path: str):
+        """(media_type, EncodedBody) 또는 None"""
+        if self.names is not None and relative_path not in self.names:
+            return None
+        path = os.path.realpath(os.path.join(self.directory, relative_path))
+        if not path.startswith(self.directory + os.sep):
+            return None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._files.pop(relative_path, None)
+            return None
+        entry = self._files.get(relative_path)
+        if entry is None or entry[0] != mtime:
+            with open(path, "rb") as f:
+                body = f.read()
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type in ("application/javascript", "application/json"):
+                media_type += "; charset=utf-8"
+            entry = self._files[relative_path] = (mtime, media_type, EncodedBody(body, static=True, precompress=True))
+        return entry[1], entry[2]
+
+    def response(self, relative_path: str, headers: Headers) -> Response:
+        found = self.get(relative_path)
+        if found is None:
+            return Response("Not Found", status_code=404, media_type="text/plain")
+        media_type, encoded = found
+        return encoded.response(headers, media_type, self.cache_control)
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] not in ("GET", "HEAD"):
+            response = Response("Method Not Allowed", status_code=405, headers={"allow": "GET, HEAD"})
+        else:
+            # 마운트 경로를 뺀 나머지
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            response = self.response(path.lstrip("/"), Headers(scope=scope))
+        await response(scope, receive, send)
+
+    def stats(self) -> dict:
+        return {path: encoded.stats() for path, (_, _, encoded) in sorted(self._files.items())}
@@ -0,0 +1,75 @@
+"""
+ROKEY NEWS 유사 기사 묶기
+- 제목 + 요약의 64비트 SimHash 서명
+- 해밍 거리 기준 근접 중복 판정 (밴드 버킷으로 후보만 비교)
+"""
+
+import hashlib
+
+import numpy as np
+
+from keywords import tokenize
+
+
+SIGNATURE_BITS = 64
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: str) -> int:
+    """텍스트의 64비트 SimHash (단어 + 인접 단어쌍 특징)"""
+    terms = [term for term, _ in tokenize(text)]
+    features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    if not features:
+        return 0
+
+    hashes = np.array([_token_hash(f) for f in features], dtype=np.uint64)
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = (2 * bits.astype(np.int32) - 1).sum(axis=0)
+    packed = np.packbits(votes > 0, bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def group_near_duplicates(signatures: list, max_distance: int) -> list:
+    """해밍 거리 max_distance 이하인 서명끼리 묶은 인덱스 그룹 목록 (입력 순서 유지)
+
+    서명을 max_distance + 1개 밴드로 나누면 근접 중복 쌍은 최소 한 밴드가 같으므로
+    (비둘기집 원리) 같은 밴드 값을 가진 후보끼리만 비교한다.
+    """
+    n = len(signatures)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = max_distance + 1
+    width = SIGNATURE_BITS // bands
+    # 마지막 밴드가 남는 비트를 모두 포함하도록 구간 설정
+    ranges = [
+        (band * width, SIGNATURE_BITS if band == bands - 1 else (band + 1) * width)
+        for band in range(bands)
+    ]
+    buckets = {}
+    for i, sig in enumerate(signatures):
+        if not sig:
+            continue
+        for band, (start, end) in enumerate(ranges):
+            value = (sig >> start) & ((1 << (end - start)) - 1)
+            for j in buckets.setdefault((band, value), []):
+                if find(i) != find(j) and hamming(sig, signatures[j]) <= max_distance:
+                    parent[find(i)] = find(j)
+            buckets[(band, value)].append(i)
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
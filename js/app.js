@@ -56,15 +56,20 @@ let state = {
     userOpenAIKey: localStorage.getItem('openaiApiKey') || '',
     language: localStorage.getItem('newsLanguage') || 'en',
     isLoading: false,
-    hasDefaultKey: false
+    hasDefaultKey: false,
+    categoryPreviews: {},
+    topHeadline: null
 };
 
 // 초기화
 async function init() {
     setCurrentDate();
     loadSettings();
-    await checkApiStatus();
-    await loadNews();
+    // 첫 화면은 한 번의 요청으로 (실패하면 상태 확인 + 뉴스 로드로 대체)
+    if (!await loadDashboard()) {
+        await checkApiStatus();
+        await loadNews();
+    }
     bindEvents();
 }
 
@@ -81,34 +86,54 @@ function loadSettings() {
     }
 }
 
-// API 상태 확인
-async function checkApiStatus() {
-    const apiStatusEl = elements.apiStatus;
-    const settingsStatusEl = elements.settingsStatus;
+// 대시보드 로드 (키 상태 + 메인 뉴스 + 카테고리 미리보기를 한 번에)
+async function loadDashboard() {
+    if (state.isLoading) return false;
 
-    try {
-        const response = await fetch(`${API_BASE_URL}/api/status?api_key=${encodeURIComponent(state.userApiKey)}`);
-        const data = await response.json();
+    state.isLoading = true;
+    showLoading(true);
 
-        state.hasDefaultKey = data.hasDefaultKey;
+    try {
+        const params = new URLSearchParams({
+            category: state.currentCategory,
+            language: state.language,
+            page_size: '12'
+        });
 
-        if (apiStatusEl) {
-            const statusDot = apiStatusEl.querySelector('.status-dot');
-            const statusText = apiStatusEl.querySelector('.status-text');
-
-            if (data.valid || data.hasDefaultKey) {
-                apiStatusEl.className = 'api-status connected';
-                statusText.textContent = '연결됨';
-            } else {
-                apiStatusEl.className = 'api-status error';
-                statusText.textContent = 'API 키 필요';
-            }
+        if (state.userApiKey) {
+            params.set('api_key', state.userApiKey);
         }
 
-        if (settingsStatusEl) {
-            updateSettingsStatus(data);
-        }
+        const response = await fetch(`${API_BASE_URL}/api/dashboard?${params}`);
+        if (!response.ok) return false;
 
+        const data = await response.json();
+        applyApiStatus(data.status);
+        state.categoryPreviews = data.categories || {};
+        // 헤드라인 섹션의 첫 기사를 헤드라인 카드에 표시
+        state.topHeadline = data.headlines && data.headlines.data.length > 0
+            ? toDisplayArticle(data.headlines.data[0])
+            : null;
+
+        if (!data.news) return false;
+        handleNewsArticles(data.news.data);
+        return true;
+    } catch (error) {
+        console.error('대시보드 로드 실패:', error);
+        return false;
+    } finally {
+        state.isLoading = false;
+        showLoading(false);
+    }
+}
+
+// API 상태 확인
+async function checkApiStatus() {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/status?api_key=${encodeURIComponent(state.userApiKey)}`);
+        const data = await response.json();
+
+        applyApiStatus(data);
         return data;
     } catch (error) {
         console.error('API 상태 확인 실패:', error);
@@ -122,6 +147,29 @@ async function checkApiStatus() {
     }
 }
 
+// API 상태 표시
+function applyApiStatus(data) {
+    const apiStatusEl = elements.apiStatus;
+
+    state.hasDefaultKey = data.hasDefaultKey;
+
+    if (apiStatusEl) {
+        const statusText = apiStatusEl.querySelector('.status-text');
+
+        if (data.valid || data.hasDefaultKey) {
+            apiStatusEl.className = 'api-status connected';
+            statusText.textContent = '연결됨';
+        } else {
+            apiStatusEl.className = 'api-status error';
+            statusText.textContent = 'API 키 필요';
+        }
+    }
+
+    if (elements.settingsStatus) {
+        updateSettingsStatus(data);
+    }
+}
+
 // 설정 상태 업데이트
 function updateSettingsStatus(data) {
     const statusEl = elements.settingsStatus;
@@ -163,12 +211,12 @@ function setLastUpdate() {
     }
 }
 
-// 뉴스 로드
-async function loadNews() {
+// 뉴스 로드 (background: 표시 중인 미리보기를 가리지 않고 갱신)
+async function loadNews(background = false) {
     if (state.isLoading) return;
 
     state.isLoading = true;
-    showLoading(true);
+    showLoading(!background);
 
     try {
         const params = new URLSearchParams({
@@ -185,6 +233,10 @@ async function loadNews() {
             params.set('api_key', state.userApiKey);
         }
 
+        // 스트리밍 모드: 원문 기사를 먼저 표시하고 번역은 도착하는 대로 반영
+        // (캐시된 결과처럼 번역할 것이 없으면 서버가 일반 JSON으로 응답 → ETag 재검증)
+        params.set('stream', 'true');
+
         const response = await fetch(`${API_BASE_URL}/api/news?${params}`);
 
         if (!response.ok) {
@@ -192,23 +244,19 @@ async function loadNews() {
             throw new Error(errorData.detail || '뉴스를 불러오는데 실패했습니다.');
         }
 
-        const data = await response.json();
-
-        if (data.success && data.data.length > 0) {
-            state.newsData = data.data.map(article => ({
-                ...article,
-                category: CATEGORY_NAMES[article.category] || article.category,
-                categoryCode: article.category,
-                time: formatTime(article.publishedAt)
-            }));
-            state.filteredData = [...state.newsData];
-
-            setLastUpdate();
-            renderHeadline();
-            renderNewsGrid();
-        } else {
-            showError('검색 결과가 없습니다.', '다른 키워드나 카테고리를 시도해보세요.');
+        if (!(response.headers.get('content-type') || '').includes('ndjson')) {
+            const data = await response.json();
+            handleNewsArticles(data.data);
+            return;
         }
+
+        await readNdjson(response, (event) => {
+            if (event.type === 'articles') {
+                handleNewsArticles(event.data);
+            } else if (event.type === 'translation') {
+                applyTranslationPatch(event);
+            }
+        });
     } catch (error) {
         console.error('뉴스 로드 실패:', error);
         showError('뉴스를 불러올 수 없습니다.', error.message);
@@ -218,6 +266,73 @@ async function loadNews() {
     }
 }
 
+// 화면 표시용 기사
+function toDisplayArticle(article) {
+    return {
+        ...article,
+        category: CATEGORY_NAMES[article.category] || article.category,
+        categoryCode: article.category,
+        time: formatTime(article.publishedAt)
+    };
+}
+
+// 뉴스 목록 반영
+function handleNewsArticles(articles) {
+    if (articles.length > 0) {
+        state.newsData = articles.map(toDisplayArticle);
+        state.filteredData = [...state.newsData];
+
+        showLoading(false);
+        setLastUpdate();
+        renderHeadline();
+        renderNewsGrid();
+    } else {
+        showError('검색 결과가 없습니다.', '다른 키워드나 카테고리를 시도해보세요.');
+    }
+}
+
+// 번역 패치 반영 (여러 패치가 연달아 오면 한 번만 다시 렌더링)
+let renderScheduled = false;
+function applyTranslationPatch(patch) {
+    const news = state.newsData.find(n => n.id === patch.id);
+    if (!news) return;
+
+    news.title = patch.title;
+    news.summary = patch.summary;
+    news.title_original = patch.title_original;
+    news.summary_original = patch.summary_original;
+
+    if (!renderScheduled) {
+        renderScheduled = true;
+        requestAnimationFrame(() => {
+            renderScheduled = false;
+            renderHeadline();
+            renderNewsGrid();
+        });
+    }
+}
+
+// NDJSON 스트림 읽기
+async function readNdjson(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+
+    if (buffer.trim()) {
+        onEvent(JSON.parse(buffer));
+    }
+}
+
 // 시간 포맷
 function formatTime(isoString) {
     if (!isoString) return '';
@@ -266,7 +381,7 @@ function showLoading(show) {
 
 // 헤드라인 렌더링
 function renderHeadline() {
-    const headline = state.filteredData[0];
+    const headline = state.topHeadline || state.filteredData[0];
     if (!headline) return;
 
     const imageHtml = headline.image ?
@@ -290,7 +405,8 @@ function renderHeadline() {
 
 // 뉴스 그리드 렌더링
 function renderNewsGrid() {
-    const newsToRender = state.filteredData.slice(1);
+    // 헤드라인 카드에 첫 기사를 쓰지 않았으면 전부 표시
+    const newsToRender = state.filteredData.slice(state.topHeadline ? 0 : 1);
 
     if (newsToRender.length === 0) {
         elements.newsGrid.innerHTML = `
@@ -408,7 +524,8 @@ async function runAiAnalysis() {
             body: JSON.stringify({
                 title: currentModalNews.title || '',
                 content: currentModalNews.content || currentModalNews.summary || '',
-                openai_key: state.userOpenAIKey || ''
+                openai_key: state.userOpenAIKey || '',
+                url: currentModalNews.url || ''
             })
         });
 
@@ -513,6 +630,8 @@ async function saveSettingsHandler() {
 
     localStorage.setItem('newsLanguage', language);
     state.language = language;
+    state.categoryPreviews = {};  // 이전 키/언어로 받은 미리보기
+    state.topHeadline = null;
 
     // 상태 확인 및 새로고침
     await checkApiStatus();
@@ -532,13 +651,21 @@ function clearApiKeyHandler() {
 async function filterByCategory(category) {
     state.currentCategory = category;
     state.searchQuery = '';
+    state.topHeadline = null;  // 대시보드 헤드라인은 첫 화면 카테고리 기준
     elements.searchInput.value = '';
-    await loadNews();
+
+    // 대시보드에서 받은 미리보기를 먼저 표시
+    const preview = state.categoryPreviews[category];
+    if (preview && preview.data.length > 0) {
+        handleNewsArticles(preview.data);
+    }
+    await loadNews(Boolean(preview && preview.data.length > 0));
 }
 
 // 검색 처리
 async function handleSearch(query) {
     state.searchQuery = query;
+    state.topHeadline = null;
     await loadNews();
 }
 
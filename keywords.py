@@ -0,0 +1,151 @@
+"""
+ROKEY NEWS 키워드 추출
+- 한국어/영어 토큰화 (정규식 사전 컴파일, 조사 제거)
+- 수집된 기사로 유지하는 롤링 문서 빈도(DF) 기반 TF-IDF
+- 한 페이지의 기사를 NumPy로 한 번에 점수화
+"""
+
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ============================================
+# 토큰화
+# ============================================
+TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:[.'&-][A-Za-z0-9]+)*|[0-9]+[A-Za-z]+|[가-힣]+")
+
+# 한국어 토큰 끝의 조사 (긴 것부터 제거)
+KOREAN_PARTICLES = re.compile(
+    r"(에서는|에서도|으로는|으로도|에게서|까지는|부터는|이라고|라고|에서|으로|에게|까지|부터|"
+    r"처럼|보다|과의|와의|이며|이고|은|는|이|가|을|를|의|에|로|와|과|도|만|께)$"
+)
+
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against all almost also although am among an and another any are
+around as at back be became because become been before being below between both but by can
+could did do does doing done down during each either else even ever every few for from further
+get gets got had has have having he her here hers herself him himself his how however i if in
+into is it its itself just least less like made make makes many may me might more most much
+must my myself near need new news next no nor not now of off often on once one only onto or
+other others our ours ourselves out over own per perhaps put rather really report reports said
+same say says see seen she should since so some still such than that the their theirs them
+themselves then there these they this those though through thus to today too toward under
+until up upon us use used very via was we were what whatever when where whether which while
+who whom whose why will with within without would yet you your yours yourself yourselves
+year years week weeks day days time first last two three amid latest update updates
+""".split())
+
+KOREAN_STOPWORDS = frozenset("""
+그리고 그러나 하지만 그래서 또한 및 등 등의 것 것으로 것은 수 있는 있다 없다 했다 한다 하는 하고
+위해 통해 대한 대해 관련 이번 지난 오늘 어제 내일 올해 작년 현재 최근 당시 이후 이전 가운데
+때문 때문에 따라 따른 경우 정도 중 중인 가장 모든 각 더 또 이미 바로 다시 함께 모두 우리 그
+이 저 그것 이것 뉴스 기자 속보 단독 종합 사진 영상 발표 밝혀 밝혔다 전했다 말했다 보도 기사
+""".split())
+
+MIN_ENGLISH_LENGTH = 3
+MIN_KOREAN_LENGTH = 2
+
+
+def tokenize(text: str) -> list:
+    """텍스트 → (정규화 토큰, 표시 형태) 목록"""
+    tokens = []
+    for surface in TOKEN_PATTERN.findall(text or ""):
+        if surface[0] >= "가":
+            stem = KOREAN_PARTICLES.sub("", surface)
+            # 조사를 떼고 한 글자만 남으면 원형 유지 (예: 국가 → 국 방지)
+            if len(stem) < MIN_KOREAN_LENGTH:
+                stem = surface
+            if len(stem) >= MIN_KOREAN_LENGTH and stem not in KOREAN_STOPWORDS:
+                tokens.append((stem, stem))
+        else:
+            term = surface.lower()
+            # 대문자 약어(AI, EU 등)는 두 글자도 허용
+            min_length = 2 if surface.isupper() else MIN_ENGLISH_LENGTH
+            if len(term) >= min_length and term not in ENGLISH_STOPWORDS:
+                tokens.append((term, surface))
+    return tokens
+
+
+# ============================================
+# TF-IDF 추출기
+# ============================================
+class KeywordExtractor:
+    """롤링 문서 빈도를 유지하는 배치 TF-IDF 키워드 추출기
+
+    - observe(): 새 문서의 용어를 DF에 반영 (같은 문서 키는 한 번만)
+    - 관측 문서 수가 window를 넘으면 DF를 절반으로 줄여 오래된 문서의 영향을 낮춤
+    - extract(): 배치 전체를 (문서 × 용어) 행렬로 만들어 한 번에 점수화
+    """
+
+    def __init__(self, window: int = 5000, title_weight: float = 2.0, seen_limit: int = 20000):
+        self.window = window
+        self.title_weight = title_weight
+        self.seen_limit = seen_limit
+        self.df = {}
+        self.n_docs = 0.0
+        self._seen = OrderedDict()
+
+    def observe(self, docs: list):
+        """docs: (문서 키, 텍스트) 목록"""
+        for key, text in docs:
+            if key in self._seen:
+                continue
+            self._seen[key] = None
+            if len(self._seen) > self.seen_limit:
+                self._seen.popitem(last=False)
+            for term in {term for term, _ in tokenize(text)}:
+                self.df[term] = self.df.get(term, 0.0) + 1.0
+            self.n_docs += 1.0
+
+        if self.n_docs > self.window:
+            self.n_docs /= 2
+            self.df = {term: count / 2 for term, count in self.df.items() if count >= 1.0}
+
+    def extract(self, titles: list, bodies: list, top_k: int = 3) -> list:
+        """기사별 상위 top_k 키워드 (제목 용어에 가중치)"""
+        vocab = {}
+        surfaces = []
+        rows = []
+        cols = []
+        weights = []
+
+        for row, (title, body) in enumerate(zip(titles, bodies)):
+            for weight, text in ((self.title_weight, title), (1.0, body)):
+                for term, surface in tokenize(text):
+                    col = vocab.get(term)
+                    if col is None:
+                        col = vocab[term] = len(surfaces)
+                        surfaces.append(surface)
+                    rows.append(row)
+                    cols.append(col)
+                    weights.append(weight)
+
+        n_docs = len(titles)
+        if not vocab:
+            return [[] for _ in range(n_docs)]
+
+        # 용어 빈도 행렬 (문서 × 용어)
+        n_terms = len(vocab)
+        flat = np.array(rows) * n_terms + np.array(cols)
+        tf = np.bincount(flat, weights=weights, minlength=n_docs * n_terms).reshape(n_docs, n_terms)
+
+        # 롤링 DF + 현재 배치 DF로 IDF 계산 (처음 보는 용어도 배치 안에서 평가)
+        batch_df = np.count_nonzero(tf, axis=0)
+        corpus_df = np.fromiter((self.df.get(term, 0.0) for term in vocab), float, n_terms)
+        total_docs = self.n_docs + n_docs
+        idf = np.log((1.0 + total_docs) / (1.0 + corpus_df + batch_df)) + 1.0
+
+        scores = np.log1p(tf) * idf
+        k = min(top_k, n_terms)
+        top = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+        keywords = []
+        for row in range(n_docs):
+            keywords.append([surfaces[col] for col in top[row] if scores[row, col] > 0])
+        return keywords
+
+    def stats(self) -> dict:
+        return {"documents": round(self.n_docs), "terms": len(self.df)}
+
@@ -0,0 +1,211 @@
+"""
+ROKEY NEWS 요청 단위 프로파일링
+- 처리 단계별 소요 시간을 모아 Server-Timing 헤더로 전송 (브라우저 개발자 도구에서 확인)
+- ?profile=1 요청은 샘플링 프로파일러로 핸들러 호출 스택을 수집해 JSON으로 반환
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+import json
+import os
+import sys
+import threading
+import time
+
+from starlette.datastructures import Headers
+
+
+# 현재 요청의 단계별 누적 시간 (초), 요청 밖에서는 None
+_timings = ContextVar("server_timings", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """with 블록의 소요 시간을 현재 요청의 name 단계에 더함 (요청 밖에서는 무시)"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def record_phase(name: str, seconds: float):
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def format_server_timing(timings: dict, total: float) -> str:
+    """{단계: 초} → 'name;dur=ms, ...' (total 포함)"""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ============================================
+# 샘플링 프로파일러
+# ============================================
+class SamplingProfiler:
+    """별도 스레드에서 대상 스레드의 호출 스택을 주기적으로 샘플링
+
+    - 이벤트 루프 스레드를 샘플링하므로 같은 시간에 처리 중인 다른 요청도 포함될 수 있음
+    - 업스트림 대기 중인 샘플은 이벤트 루프의 select 대기로 나타남
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = tuple(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.samples += 1
+
+    def stop(self, top: int = 30) -> dict:
+        self._stop.set()
+        self._thread.join()
+        elapsed = time.perf_counter() - self._started
+
+        self_counts = {}
+        total_counts = {}
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] = self_counts.get(stack[-1], 0) + count
+            for function in set(stack):
+                total_counts[function] = total_counts.get(function, 0) + count
+
+        def ranked(counts):
+            return [
+                {"function": function, "samples": count, "percent": round(100 * count / self.samples, 1)}
+                for function, count in sorted(counts.items(), key=lambda x: -x[1])[:top]
+            ]
+
+        return {
+            "duration_ms": round(elapsed * 1000, 1),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "self": ranked(self_counts),
+            "total": ranked(total_counts),
+            # flamegraph.pl / speedscope 호환 collapsed 형식
+            "collapsed": [
+                f"{';'.join(stack)} {count}"
+                for stack, count in sorted(self.stacks.items(), key=lambda x: -x[1])[:top * 3]
+            ],
+        }
+
+
+# ============================================
+# ASGI 미들웨어
+# ============================================
+class ServerTimingMiddleware:
+    """prefix로 시작하는 경로의 응답에 Server-Timing 헤더 추가
+
+    - 핸들러 안에서 phase()로 기록한 단계 + total(응답 시작까지)
+    - 스트리밍 응답은 헤더 전송 시점까지의 단계만 포함
+    - profiling=True이면 ?profile=1 요청의 응답 본문을 호출 프로파일로 대체 (동시에 하나만)
+    - authorize: 요청 헤더 → 프로파일 허용 여부 (함수/파일 이름이 노출되므로 관리자만)
+    """
+
+    def __init__(self, app, prefix: str = "/api/", profiling: bool = True, interval: float = 0.005,
+                 authorize=None):
+        self.app = app
+        self.prefix = prefix
+        self.profiling = profiling
+        self.interval = interval
+        self.authorize = authorize
+        self._profile_lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", format_server_timing(timings, time.perf_counter() - start).encode()))
+                headers.append((b"timing-allow-origin", b"*"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            if self.profiling and self._wants_profile(scope) and self._authorized(scope) \
+                    and self._profile_lock.acquire(blocking=False):
+                try:
+                    await self._profile(scope, receive, send_wrapper, timings)
+                finally:
+                    self._profile_lock.release()
+            else:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _timings.reset(token)
+
+    def _authorized(self, scope) -> bool:
+        return self.authorize is None or self.authorize(Headers(scope=scope))
+
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return query.get("profile", [""])[-1] in ("1", "true")
+
+    async def _profile(self, scope, receive, send, timings: dict):
+        """핸들러 응답을 끝까지 받아 버리고 프로파일 JSON으로 응답"""
+        status = 500
+        body_bytes = 0
+
+        async def capture(message):
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            report = profiler.stop()
+
+        body = json.dumps({
+            "path": scope["path"],
+            "status": status,
+            "response_bytes": body_bytes,
+            "timings_ms": {name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+            "profile": report,
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,147 @@
+"""
+ROKEY NEWS 요청 수 제한 (토큰 버킷)
+- MemoryBuckets: 프로세스 내 버킷 (LRU로 키 수 상한)
+- SQLiteBuckets: 같은 호스트의 여러 uvicorn 워커가 공유하는 버킷 (WAL, 트랜잭션 단위 원자성)
+- 여러 버킷(IP, API 키 등)을 한 번에 검사해 모두 통과할 때만 차감
+"""
+
+from collections import OrderedDict
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryBuckets:
+    """프로세스 내 토큰 버킷 저장소 (요청당 O(버킷 수))
+
+    - max_keys를 넘으면 가장 오래 쓰지 않은 버킷부터 제거 (제거된 키는 가득 찬 상태로 재시작)
+    """
+
+    shared = False
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def acquire(self, keys: list, rate: float, burst: float, cost: float = 1.0) -> float:
+        """모든 버킷에 cost만큼 토큰이 있으면 차감하고 0, 아니면 필요한 대기 시간(초)"""
+        cost = min(cost, burst)
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key in keys:
+                tokens, updated = self._buckets.get(key, (burst, now))
+                tokens = _refill(tokens, updated, now, rate, burst)
+                levels.append(tokens)
+                if tokens < cost:
+                    wait = max(wait, (cost - tokens) / rate)
+            if wait > 0:
+                return wait
+            for key, tokens in zip(keys, levels):
+                self._buckets[key] = (tokens - cost, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0.0
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": len(self._buckets)}
+
+    def close(self):
+        pass
+
+
+class SQLiteBuckets:
+    """SQLite 파일에 보관하는 공유 토큰 버킷 저장소
+
+    - BEGIN IMMEDIATE로 검사와 차감을 한 트랜잭션에서 수행 (워커 간 경쟁 없음)
+    - 가득 찰 만큼 오래 쓰지 않은 버킷은 주기적으로 삭제
+    - 저장소 오류 시에는 요청을 막지 않음 (fail-open)
+    - 파일 I/O와 잠금 대기가 있으므로 이벤트 루프에서는 스레드로 호출 (shared=True)
+    """
+
+    shared = True
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def acquire(self, keys: list, rate: float, burst: float, cost: float = 1.0) -> float:
+        cost = min(cost, burst)
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._db()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    placeholders = ",".join("?" * len(keys))
+                    rows = dict(
+                        (key, (tokens, updated)) for key, tokens, updated in conn.execute(
+                            f"SELECT key, tokens, updated FROM buckets WHERE key IN ({placeholders})", keys
+                        )
+                    )
+                    levels = []
+                    wait = 0.0
+                    for key in keys:
+                        tokens, updated = rows.get(key, (burst, now))
+                        tokens = _refill(tokens, updated, now, rate, burst)
+                        levels.append(tokens)
+                        if tokens < cost:
+                            wait = max(wait, (cost - tokens) / rate)
+                    if wait == 0:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)",
+                            [(key, tokens - cost, now, now + (burst - tokens + cost) / rate)
+                             for key, tokens in zip(keys, levels)]
+                        )
+                    self._calls += 1
+                    if self._calls % self.PRUNE_EVERY == 0:
+                        conn.execute("DELETE FROM buckets WHERE full_at < ?", (now,))
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning("Rate limit store error: %s", e)
+                return 0.0
+        return wait
+
+    def stats(self) -> dict:
+        try:
+            keys = self._db().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+        except sqlite3.Error:
+            keys = None
+        return {"backend": "sqlite", "keys": keys}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
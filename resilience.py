@@ -0,0 +1,292 @@
+"""
+ROKEY NEWS 업스트림 장애 대응
+- CircuitBreaker: 연속 실패 시 일정 시간 호출 차단 → 이후 시험 호출 1건으로 복구 확인
+- 지터를 준 지수 백오프 재시도 (멱등 호출, 또는 요청이 전송되지 않은 연결 오류만)
+- 요청 단위 지연 예산: 마감 시각(ContextVar)에 맞춰 업스트림 타임아웃을 줄임
+- 헤징: 최근 p95만큼 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import random
+import time
+
+import httpx
+
+
+# 현재 요청의 마감 시각 (time.monotonic 기준), 마감이 없으면 None
+_deadline = ContextVar("latency_deadline", default=None)
+
+
+@contextmanager
+def latency_budget(seconds: float):
+    """with 블록 안의 업스트림 호출이 seconds 안에 끝나도록 마감 설정 (바깥 마감이 더 이르면 유지)"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget():
+    """남은 지연 예산 (초), 마감이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+async def unbounded(coro):
+    """요청의 지연 예산 없이 실행 (새 태스크의 최상위 코루틴으로 사용)"""
+    _deadline.set(None)
+    return await coro
+
+
+class LatencyBudgetMiddleware:
+    """경로별 지연 예산을 요청 컨텍스트에 설정하는 ASGI 미들웨어 (budgets: {경로: 초})"""
+
+    def __init__(self, app, budgets: dict):
+        self.app = app
+        self.budgets = {path: seconds for path, seconds in budgets.items() if seconds > 0}
+
+    async def __call__(self, scope, receive, send):
+        seconds = self.budgets.get(scope["path"]) if scope["type"] == "http" else None
+        if seconds is None:
+            await self.app(scope, receive, send)
+            return
+        with latency_budget(seconds):
+            await self.app(scope, receive, send)
+
+
+# ============================================
+# 서킷 브레이커
+# ============================================
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음"""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"{upstream} circuit open (retry in {retry_in:.0f}s)")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커
+
+    - closed: 정상 호출, failure_threshold번 연속 실패하면 open
+    - open: cooldown 동안 즉시 거절
+    - half_open: 시험 호출 1건만 허용 → 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, on_change=None):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def _set(self, state: str):
+        self.state = state
+        if self.on_change is not None:
+            self.on_change(state)
+
+    def retry_in(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """호출 가능 여부 (half_open이면 시험 호출 자리를 차지)"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if self.retry_in() > 0:
+                return False
+            self._set(self.HALF_OPEN)
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def is_open(self) -> bool:
+        """상태를 바꾸지 않고 거절 중인지 확인"""
+        return (self.state == self.OPEN and self.retry_in() > 0) or (self.state == self.HALF_OPEN and self._probing)
+
+    def record_success(self):
+        self.failures = 0
+        self._probing = False
+        if self.state != self.CLOSED:
+            self._set(self.CLOSED)
+
+    def record_failure(self):
+        self._probing = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set(self.OPEN)
+
+    def release(self):
+        """결과를 판정하지 않은 호출 (취소, 예산 초과) → 시험 호출 자리만 반환"""
+        self._probing = False
+
+
+# ============================================
+# 업스트림 호출 정책
+# ============================================
+class UpstreamPolicy:
+    """업스트림 하나의 호출 정책 (서킷 브레이커 + 재시도 + 지연 예산 + 헤징)
+
+    - 재시도: 5xx / 네트워크 오류는 멱등 호출만, 연결 실패(요청 미전송)는 항상
+    - 대기 시간은 full jitter 지수 백오프, 남은 예산보다 길면 재시도하지 않음
+    - 헤징: 작업(operation)별 최근 응답 시간의 hedge_quantile 지점을 지나면 같은 요청을 하나 더 보냄
+    - events: (upstream, event) 라벨 Counter (retry, hedge, hedge_won, short_circuit, budget_exhausted)
+    """
+
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+    # 요청이 서버에 전달되지 않은 오류 (비멱등 호출도 재시도 가능)
+    UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+    def __init__(self, name: str, breaker: CircuitBreaker, retries: int = 1,
+                 backoff_base: float = 0.2, backoff_cap: float = 2.0,
+                 hedge_quantile: float = 0.95, hedge_min_samples: int = 20,
+                 window: int = 200, events=None):
+        self.name = name
+        self.breaker = breaker
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.window = window
+        self.events = events
+        self._latencies = {}  # operation -> deque[초]
+
+    def _event(self, event: str):
+        if self.events is not None:
+            self.events.labels(self.name, event).inc()
+
+    def hedge_delay(self, operation: str):
+        """헤징 대기 시간 (표본이 부족하면 None)"""
+        samples = self._latencies.get(operation)
+        if not samples or len(samples) < self.hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_quantile))]
+
+    def _observe(self, operation: str, seconds: float):
+        samples = self._latencies.get(operation)
+        if samples is None:
+            samples = self._latencies[operation] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    async def call(self, operation: str, send, timeout: float, idempotent: bool = True, hedge: bool = False):
+        """send(timeout) → 응답 코루틴을 정책에 따라 호출
+
+        - 재시도 후에도 5xx면 마지막 응답을 그대로 반환, 예외는 그대로 전파
+        - 실패로 브레이커가 열리면(시험 호출 실패 포함) 재시도하지 않고 그 결과를 그대로 반환/전파
+        - 브레이커가 열려 있으면 CircuitOpenError, 예산이 없으면 httpx.TimeoutException
+        """
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                self._event("short_circuit")
+                raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+            remaining = remaining_budget()
+            if remaining is not None and remaining <= 0:
+                self.breaker.release()
+                self._event("budget_exhausted")
+                raise httpx.TimeoutException("latency budget exhausted")
+            attempt_timeout = timeout if remaining is None else min(timeout, remaining)
+
+            error = None
+            response = None
+            start = time.perf_counter()
+            try:
+                if hedge and idempotent:
+                    response = await self._hedged(operation, send, attempt_timeout)
+                else:
+                    response = await send(attempt_timeout)
+            except httpx.TimeoutException as e:
+                if attempt_timeout < timeout:
+                    # 예산 때문에 줄인 타임아웃은 업스트림 실패로 보지 않음
+                    self.breaker.release()
+                    self._event("budget_exhausted")
+                    raise
+                self.breaker.record_failure()
+                error = e
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                error = e
+            except BaseException:
+                # 취소나 예상하지 못한 오류(DecodingError, 닫힌 클라이언트 등): 판정 없이 시험 호출 자리만 반환
+                self.breaker.release()
+                raise
+
+            if error is None:
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.breaker.record_success()
+                    self._observe(operation, time.perf_counter() - start)
+                    return response
+                self.breaker.record_failure()
+
+            retryable = idempotent or isinstance(error, self.UNSENT_ERRORS)
+            tripped = self.breaker.state == CircuitBreaker.OPEN
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+            remaining = remaining_budget()
+            if attempt == self.retries or not retryable or tripped or (remaining is not None and delay >= remaining):
+                if error is not None:
+                    raise error
+                return response
+            self._event("retry")
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, operation: str, send, timeout: float):
+        """hedge_delay가 지나도 응답이 없으면 같은 요청을 하나 더 보내 먼저 성공한 응답 사용"""
+        delay = self.hedge_delay(operation)
+        if delay is None or delay >= timeout:
+            return await send(timeout)
+
+        primary = asyncio.ensure_future(send(timeout))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self._event("hedge")
+        secondary = asyncio.ensure_future(send(timeout - delay))
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result().status_code not in self.RETRY_STATUSES:
+                        if task is secondary:
+                            self._event("hedge_won")
+                        return task.result()
+                    last = task
+            # 둘 다 실패: 나중에 끝난 쪽의 결과(응답 또는 예외)
+            return last.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "retryIn": round(self.breaker.retry_in(), 1),
+            "hedgeDelay": {
+                operation: round(delay, 3)
+                for operation in self._latencies
+                if (delay := self.hedge_delay(operation)) is not None
+            },
+        }
@@ -0,0 +1,154 @@
+"""
+ROKEY NEWS 로컬 감성 분석 엔진
+- 한국어/영어 극성 사전 기반 (네트워크 호출 없음)
+- NumPy로 여러 기사를 한 번에 점수화
+- LLM 분석과 같은 positive/negative/sentiment 형식
+"""
+
+import re
+import numpy as np
+
+
+# ============================================
+# 극성 사전
+# ============================================
+# 영어: 소문자 단어 그대로 매칭
+ENGLISH_POSITIVE = {
+    "gain", "gains", "gained", "rise", "rises", "rose", "rising", "surge", "surges", "surged",
+    "soar", "soars", "soared", "rally", "rallies", "rallied", "jump", "jumps", "jumped",
+    "growth", "grow", "grows", "grew", "boost", "boosts", "boosted", "record", "profit",
+    "profits", "profitable", "beat", "beats", "win", "wins", "won", "winning", "victory",
+    "success", "successful", "succeed", "improve", "improves", "improved", "improvement",
+    "recover", "recovers", "recovered", "recovery", "strong", "stronger", "strength",
+    "positive", "optimism", "optimistic", "upbeat", "good", "great", "best", "better",
+    "benefit", "benefits", "breakthrough", "innovative", "innovation", "launch", "launches",
+    "approve", "approves", "approved", "approval", "agreement", "deal", "peace", "support",
+    "supports", "celebrate", "celebrates", "praise", "praised", "hope", "hopes", "upgrade",
+    "upgraded", "expand", "expands", "expansion", "bullish", "stable", "safe", "secure",
+    "help", "helps", "helped", "advance", "advances", "lead", "leads", "champion", "thrive",
+}
+ENGLISH_NEGATIVE = {
+    "fall", "falls", "fell", "falling", "drop", "drops", "dropped", "plunge", "plunges",
+    "plunged", "slump", "slumps", "slumped", "decline", "declines", "declined", "loss",
+    "losses", "lose", "loses", "lost", "crash", "crashes", "crashed", "crisis", "recession",
+    "inflation", "layoff", "layoffs", "cut", "cuts", "fail", "fails", "failed", "failure",
+    "weak", "weaker", "weakness", "negative", "fear", "fears", "worry", "worries", "worried",
+    "concern", "concerns", "risk", "risks", "threat", "threats", "warn", "warns", "warning",
+    "war", "attack", "attacks", "attacked", "kill", "kills", "killed", "dead", "death",
+    "deaths", "injured", "violence", "conflict", "protest", "protests", "scandal", "fraud",
+    "lawsuit", "sue", "sued", "ban", "bans", "banned", "fine", "fined", "probe", "investigation",
+    "bad", "worse", "worst", "disaster", "collapse", "collapsed", "bankrupt", "bankruptcy",
+    "default", "downgrade", "downgraded", "bearish", "volatile", "uncertainty", "delay",
+    "delays", "delayed", "shortage", "outage", "breach", "hack", "hacked", "strike", "tariff",
+    "tariffs", "sanction", "sanctions", "defeat", "defeated", "injury", "emergency",
+}
+ENGLISH_NEGATIONS = {"not", "no", "never", "without", "hardly", "isn't", "wasn't", "don't",
+                     "doesn't", "didn't", "won't", "can't", "cannot", "aren't", "weren't"}
+
+# 한국어: 어간(접두어) 매칭 (조사/어미가 붙은 형태도 인식)
+KOREAN_POSITIVE = {
+    "상승", "급등", "반등", "호황", "성장", "증가", "개선", "회복", "흑자", "최고", "신기록",
+    "호조", "강세", "돌파", "성공", "승리", "우승", "합의", "타결", "협력", "지원", "혜택",
+    "기대", "낙관", "호평", "수상", "출시", "혁신", "확대", "안정", "안전", "평화", "좋",
+    "긍정", "발전", "도약", "수혜", "흥행", "인기", "축하", "환영", "해결", "완화", "승인",
+}
+KOREAN_NEGATIVE = {
+    "하락", "급락", "폭락", "침체", "감소", "악화", "적자", "위기", "불황", "약세", "손실",
+    "부진", "실패", "패배", "충돌", "전쟁", "공격", "사망", "부상", "사고", "참사", "재난",
+    "피해", "우려", "불안", "위험", "경고", "논란", "비판", "의혹", "수사", "기소", "소송",
+    "파산", "부도", "해고", "감원", "파업", "시위", "규제", "제재", "관세", "지연", "중단",
+    "유출", "해킹", "범죄", "사기", "폭력", "나쁘", "부정적", "최악", "긴장", "갈등",
+}
+KOREAN_NEGATIONS = ("않", "못", "없", "아니")
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|[가-힣]+")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+# 사전 → (인덱스, 극성) 벡터
+LEXICON = sorted(ENGLISH_POSITIVE | ENGLISH_NEGATIVE | KOREAN_POSITIVE | KOREAN_NEGATIVE)
+LEXICON_INDEX = {word: idx for idx, word in enumerate(LEXICON)}
+LEXICON_POLARITY = np.array(
+    [1.0 if word in ENGLISH_POSITIVE or word in KOREAN_POSITIVE else -1.0 for word in LEXICON]
+)
+KOREAN_STEM_LENGTHS = sorted({len(word) for word in KOREAN_POSITIVE | KOREAN_NEGATIVE}, reverse=True)
+
+# 점수 → 비율 변환 시 가산 평활 (단서가 없으면 50:50)
+SMOOTHING = 1.0
+
+
+def _lookup(token: str):
+    """토큰 → 사전 인덱스 (없으면 None)"""
+    if token in LEXICON_INDEX:
+        return LEXICON_INDEX[token]
+    if token[0] >= "가":
+        for length in KOREAN_STEM_LENGTHS:
+            if length < len(token) and token[:length] in LEXICON_INDEX:
+                return LEXICON_INDEX[token[:length]]
+    return None
+
+
+def _is_negation(token: str) -> bool:
+    return token in ENGLISH_NEGATIONS or token.startswith(KOREAN_NEGATIONS)
+
+
+def score_texts(texts: list) -> list:
+    """여러 텍스트의 감성을 한 번에 계산
+
+    Returns:
+        텍스트별 {"positive", "negative", "sentiment"} 리스트
+    """
+    doc_ids = []
+    lexeme_ids = []
+    signs = []
+
+    for doc_id, text in enumerate(texts):
+        tokens = TOKEN_PATTERN.findall((text or "").lower())
+        for pos, token in enumerate(tokens):
+            idx = _lookup(token)
+            if idx is None:
+                continue
+            # 영어는 앞 두 단어, 한국어는 바로 뒤 단어의 부정어로 극성 반전
+            negated = any(t in ENGLISH_NEGATIONS for t in tokens[max(0, pos - 2):pos])
+            if pos + 1 < len(tokens) and tokens[pos + 1][0] >= "가":
+                negated = negated or _is_negation(tokens[pos + 1])
+            doc_ids.append(doc_id)
+            lexeme_ids.append(idx)
+            signs.append(-1.0 if negated else 1.0)
+
+    n = len(texts)
+    if doc_ids:
+        polarity = LEXICON_POLARITY[np.array(lexeme_ids)] * np.array(signs)
+        docs = np.array(doc_ids)
+        positive = np.bincount(docs, weights=(polarity > 0).astype(float), minlength=n)
+        negative = np.bincount(docs, weights=(polarity < 0).astype(float), minlength=n)
+    else:
+        positive = np.zeros(n)
+        negative = np.zeros(n)
+
+    positive_pct = np.rint(
+        100 * (positive + SMOOTHING) / (positive + negative + 2 * SMOOTHING)
+    ).astype(int)
+
+    results = []
+    for pos_pct in positive_pct.tolist():
+        neg_pct = 100 - pos_pct
+        if pos_pct > neg_pct:
+            sentiment = "긍정적"
+        elif neg_pct > pos_pct:
+            sentiment = "부정적"
+        else:
+            sentiment = "중립"
+        results.append({"positive": pos_pct, "negative": neg_pct, "sentiment": sentiment})
+    return results
+
+
+def extractive_summary(text: str, max_sentences: int = 3) -> str:
+    """앞 문장 몇 개를 '- ' 목록으로 (LLM 요약 대체용)"""
+    sentences = [s.strip() for s in SENTENCE_PATTERN.split(text or "") if len(s.strip()) > 10]
+    return "\n".join(f"- {s}" for s in sentences[:max_sentences])
+
+
+def analyze_local(text: str) -> dict:
+    """parse_analysis_result와 같은 형식의 로컬 분석 결과"""
+    result = score_texts([text])[0]
+    return {"summary": extractive_summary(text), **result}
@@ -0,0 +1,25 @@
+"""
+ROKEY NEWS 테스트 공통 설정
+- api_server는 import 시점에 환경 변수를 읽으므로 먼저 임시 경로와 테스트 값을 지정
+- 백그라운드 수집/미리 가져오기는 끄고, 저장소 파일은 테스트 실행마다 새 임시 디렉터리에 둠
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_data_dir = tempfile.mkdtemp(prefix="rokey-tests-")
+for name, value in {
+    "NEWS_API_KEY": "test-news-key",
+    "OPENAI_API_KEY": "",
+    "INGEST_ENABLED": "false",
+    "NEWS_PREFETCH_ENABLED": "false",
+    "ARTICLE_DB_PATH": os.path.join(_data_dir, "articles.sqlite3"),
+    "TRANSLATION_DB_PATH": os.path.join(_data_dir, "translations.sqlite3"),
+    "ANALYSIS_DB_PATH": os.path.join(_data_dir, "analyses.sqlite3"),
+    "USAGE_DB_PATH": os.path.join(_data_dir, "usage.sqlite3"),
+}.items():
+    os.environ.setdefault(name, value)
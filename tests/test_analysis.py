@@ -0,0 +1,22 @@
+"""분석 캐시 키 — 절약 모드로 잘라 분석한 결과는 전체 본문 결과와 섞이지 않음"""
+
+from api_server import analysis_cache_key
+
+LONG_TEXT = "market rally strong " * 100
+
+
+def test_whitespace_is_normalized():
+    assert analysis_cache_key("a  b\nc") == analysis_cache_key("a b c")
+
+
+def test_truncated_analysis_uses_separate_key():
+    assert analysis_cache_key(LONG_TEXT, 800) != analysis_cache_key(LONG_TEXT)
+
+
+def test_truncated_key_depends_only_on_analysed_prefix():
+    other = LONG_TEXT[:800] + "completely different tail"
+    assert analysis_cache_key(LONG_TEXT, 800) == analysis_cache_key(other, 800)
+
+
+def test_short_text_keeps_full_key_in_low_budget():
+    assert analysis_cache_key("short text", 800) == analysis_cache_key("short text")
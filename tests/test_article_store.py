@@ -0,0 +1,54 @@
+"""로컬 기사 저장소 검색"""
+
+import pytest
+
+from api_server import ArticleStore
+from articles import Article
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    store.upsert_many([
+        Article(title="Chipmakers rally on AI demand", summary="Semiconductor stocks rose",
+                url="https://example.com/ai", publishedAt="2026-01-02T00:00:00Z"),
+        Article(title="Central bank holds rates", summary="Inflation cools",
+                url="https://example.com/rates", publishedAt="2026-01-03T00:00:00Z"),
+    ], "en")
+    store.upsert_many([
+        Article(title="Une banque centrale", summary="Taux", url="https://example.fr/taux",
+                publishedAt="2026-01-04T00:00:00Z"),
+    ], "fr")
+    yield store
+    store.close()
+
+
+def test_search_matches_terms(store):
+    articles = store.search("AI OR semiconductor", "en", 5, min_results=1)
+    assert [a.url for a in articles] == ["https://example.com/ai"]
+
+
+def test_empty_query_returns_newest_for_language(store):
+    articles = store.search("", "en", 5, min_results=1)
+    assert [a.url for a in articles] == ["https://example.com/rates", "https://example.com/ai"]
+
+
+@pytest.mark.parametrize("search_query", ["+++", "?!", "-"])
+def test_query_without_terms_is_not_a_match_all(store, search_query):
+    assert store.search(search_query, "en", 5, min_results=1) is None
+
+
+def test_search_is_filtered_by_language(store):
+    assert [a.url for a in store.search("", "fr", 5, min_results=1)] == ["https://example.fr/taux"]
+    assert store.search("", "ko", 5, min_results=1) is None
+
+
+def test_untagged_articles_are_excluded(store):
+    store.upsert_many([Article(title="Untagged AI story", url="https://example.com/untagged")])
+    assert [a.url for a in store.search("AI", "en", 5, min_results=1)] == ["https://example.com/ai"]
+
+
+def test_search_applies_from_date(store):
+    articles = store.search("", "en", 5, min_results=1, from_date="2026-01-03")
+    assert [a.url for a in articles] == ["https://example.com/rates"]
+    assert store.search("AI", "en", 5, min_results=1, from_date="2026-01-03") is None
@@ -0,0 +1,180 @@
+"""캐시 저장소 왕복 (메모리 / SQLite / Redis 프로토콜)"""
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pytest
+
+from cachestore import MemoryStore, RedisStore, SQLiteStore
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """RedisStore가 쓰는 명령(MGET/SET PX/DEL/SCAN/AUTH/SELECT)만 처리하는 최소 RESP 서버"""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self.server.execute(args))
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.data = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    @staticmethod
+    def encode(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        return b"*%d\r\n" % len(value) + b"".join(FakeRedis.encode(item) for item in value)
+
+    def execute(self, args: list) -> bytes:
+        command = args[0].upper()
+        with self.lock:
+            self.commands.append(command)
+            if command == b"MGET":
+                reply = [self._get(key) for key in args[1:]]
+            elif command == b"SET":
+                expires_at = None
+                if len(args) > 3 and args[3].upper() == b"PX":
+                    expires_at = time.time() + int(args[4]) / 1000
+                self.data[args[1]] = (args[2], expires_at)
+                reply = "OK"
+            elif command == b"DEL":
+                reply = sum(self.data.pop(key, None) is not None for key in args[1:])
+            elif command == b"SCAN":
+                pattern = args[3].decode().replace("\\", "")
+                reply = [b"0", [key for key in list(self.data) if fnmatch.fnmatchcase(key.decode(), pattern)]]
+            elif command in (b"AUTH", b"SELECT"):
+                reply = "OK"
+            else:
+                return b"-ERR unknown command\r\n"
+        return self.encode(reply)
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedis()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryStore()
+    elif request.param == "sqlite":
+        store = SQLiteStore(str(tmp_path / "cache.sqlite3"))
+    else:
+        server = request.getfixturevalue("redis_server")
+        store = RedisStore(f"redis://127.0.0.1:{server.server_address[1]}/0", prefix="test:")
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    before = time.time()
+    store.put_many({"a": b"\x00alpha\n", "b": "베타".encode("utf-8")}, ttl=60)
+    found = store.get_many(["a", "b", "missing"])
+    assert set(found) == {"a", "b"}
+    value, at, expires_at = found["a"]
+    assert value == b"\x00alpha\n"
+    assert before <= at <= time.time()
+    assert expires_at == pytest.approx(at + 60)
+    assert found["b"][0].decode("utf-8") == "베타"
+
+
+def test_without_ttl_never_expires(store):
+    store.put("k", b"v")
+    assert store.get_many(["k"])["k"][2] is None
+
+
+def test_expired_values_are_kept_for_retain(store):
+    store.put("k", b"v", ttl=0.05, retain=60)
+    time.sleep(0.1)
+    value, _, expires_at = store.get_many(["k"])["k"]
+    assert value == b"v" and expires_at < time.time()
+
+
+def test_dropped_after_retain(store):
+    store.put("k", b"v", ttl=0.02, retain=0.02)
+    time.sleep(0.1)
+    assert store.get_many(["k"]) == {}
+
+
+def test_overwrite_and_clear(store):
+    store.put("k", b"old", ttl=60)
+    store.put("k", b"new", ttl=60)
+    assert store.get_many(["k"])["k"][0] == b"new"
+    store.clear()
+    assert store.get_many(["k"]) == {}
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryStore(max_entries=2)
+    store.put("a", b"1")
+    store.put("b", b"2")
+    store.get_many(["a"])
+    store.put("c", b"3")
+    assert set(store.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    first, second = SQLiteStore(path), SQLiteStore(path)
+    try:
+        first.put("k", b"v", ttl=60)
+        assert second.get_many(["k"])["k"][0] == b"v"
+    finally:
+        first.close()
+        second.close()
+
+
+def test_redis_store_pipelines_and_prefixes(redis_server):
+    store = RedisStore(f"redis://127.0.0.1:{redis_server.server_address[1]}/0", prefix="p:")
+    try:
+        store.put_many({"a": b"1", "b": b"2"}, ttl=60)
+        assert set(redis_server.data) == {b"p:a", b"p:b"}
+        assert set(store.get_many(["a", "b"])) == {"a", "b"}
+        assert redis_server.commands.count(b"MGET") == 1
+    finally:
+        store.close()
+
+
+def test_redis_store_treats_unreachable_server_as_miss(redis_server):
+    port = redis_server.server_address[1]
+    redis_server.shutdown()
+    redis_server.server_close()
+    store = RedisStore(f"redis://127.0.0.1:{port}/0", timeout=0.2, retry_after=60)
+    assert store.get_many(["k"]) == {}
+    assert store.errors == 1
+    # 재시도 대기 중에는 연결을 시도하지 않음
+    store.put("k", b"v")
+    assert store.errors == 1
@@ -0,0 +1,45 @@
+"""SimHash 서명 / 근접 중복 묶기"""
+
+from dedup import SIGNATURE_BITS, group_near_duplicates, hamming, simhash
+
+
+def test_simhash_is_stable_and_64_bit():
+    text = "Federal Reserve holds interest rates steady amid inflation worries"
+    assert simhash(text) == simhash(text)
+    assert 0 < simhash(text) < 1 << SIGNATURE_BITS
+
+
+def test_simhash_empty_text():
+    assert simhash("") == 0
+
+
+def test_near_duplicates_are_closer_than_unrelated_texts():
+    base = simhash("Federal Reserve holds interest rates steady amid inflation worries, officials say")
+    near = simhash("Federal Reserve holds interest rates steady amid inflation worries, officials said")
+    other = simhash("Local football club wins championship after dramatic penalty shootout")
+    assert hamming(base, near) < hamming(base, other)
+
+
+def test_hamming():
+    assert hamming(0, 0) == 0
+    assert hamming(0b1011, 0b0001) == 2
+    assert hamming(0, (1 << 64) - 1) == 64
+
+
+def test_group_near_duplicates():
+    a = 0x0F0F_0F0F_0F0F_0F0F
+    near_a = a ^ 0b101            # 2비트 차이
+    b = ~a & ((1 << 64) - 1)      # 64비트 차이
+    groups = group_near_duplicates([a, b, near_a, b ^ 1], max_distance=3)
+    assert groups == [[0, 2], [1, 3]]
+
+
+def test_group_near_duplicates_respects_distance():
+    a = 0x0123_4567_89AB_CDEF
+    far = a ^ 0b1111_1111         # 8비트 차이
+    assert group_near_duplicates([a, far], max_distance=3) == [[0], [1]]
+    assert group_near_duplicates([a, far], max_distance=8) == [[0, 1]]
+
+
+def test_group_near_duplicates_keeps_empty_signatures_apart():
+    assert group_near_duplicates([0, 0, 5], max_distance=3) == [[0], [1], [2]]
@@ -0,0 +1,111 @@
+"""NewsAPI 할당량 추적 — 같은 SQLite 파일을 쓰는 두 워커가 한도를 나눠 씀"""
+
+import asyncio
+
+import pytest
+
+import api_server
+from api_server import QUOTA_EXHAUSTED, QUOTA_LOW, QUOTA_PLENTY, QuotaTracker
+
+
+def worker(path: str, limit: int = 10, sync_interval: float = 0.0) -> QuotaTracker:
+    return QuotaTracker(path, [(86400.0, limit)], low_ratio=0.2, cooldown=60.0, max_keys=100,
+                        sync_interval=sync_interval)
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "usage.sqlite3")
+    first, second = worker(path), worker(path)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_two_workers_share_the_window(workers):
+    first, second = workers
+    key = api_server.DEFAULT_NEWS_API_KEY
+
+    async def scenario():
+        states = []
+        # 두 워커가 번갈아 호출 (한도 10, low는 남은 비율 0.2 이하)
+        for i in range(10):
+            await (first if i % 2 == 0 else second).record(key, "200")
+            await first.sync(key)
+            await second.sync(key)
+            states.append((first.state(key), second.state(key)))
+        return states
+
+    states = run(scenario())
+    assert states[6] == (QUOTA_PLENTY, QUOTA_PLENTY)    # 7회 사용, 3회 남음
+    assert states[7] == (QUOTA_LOW, QUOTA_LOW)          # 8회 사용, 2회 남음
+    assert states[9] == (QUOTA_EXHAUSTED, QUOTA_EXHAUSTED)
+    assert first.describe(key)["remaining"] == 0
+    assert second.reset_in(key) > 86000
+
+
+def test_record_recounts_other_workers_calls(workers):
+    first, second = workers
+    key = "user-key"
+
+    async def scenario():
+        for _ in range(7):
+            await first.record(key, "200")
+        # second는 sync 없이 자기 호출을 기록하는 것만으로 저장소 기준 사용량을 봄
+        await second.record(key, "200")
+        return second.remaining(key)[0][2]
+
+    assert run(scenario()) == 2
+
+
+def test_sync_interval_limits_store_reads(tmp_path):
+    path = str(tmp_path / "usage.sqlite3")
+    first, second = worker(path), worker(path, sync_interval=3600)
+    key = "user-key"
+    try:
+        async def scenario():
+            await second.sync(key)
+            for _ in range(10):
+                await first.record(key, "200")
+            await second.sync(key)  # 간격 안: 다시 읽지 않음
+            return second.state(key)
+
+        assert run(scenario()) == QUOTA_PLENTY
+        second.sync_interval = 0
+        run(second.sync(key))
+        assert second.state(key) == QUOTA_EXHAUSTED
+    finally:
+        first.close()
+        second.close()
+
+
+def test_rate_limited_response_blocks_every_worker(workers):
+    first, second = workers
+    key = "user-key"
+
+    async def scenario():
+        await first.record(key, "429")
+        await second.sync(key)
+
+    run(scenario())
+    assert first.state(key) == QUOTA_EXHAUSTED
+    assert second.state(key) == QUOTA_EXHAUSTED
+    assert 50 < second.blocked_for(key) <= 60
+
+
+def test_usage_survives_restart(tmp_path):
+    path = str(tmp_path / "usage.sqlite3")
+    tracker = worker(path, limit=2)
+    run(tracker.record("user-key", "200"))
+    run(tracker.record("user-key", "200"))
+    tracker.close()
+
+    restarted = worker(path, limit=2)
+    try:
+        assert restarted.state("user-key") == QUOTA_EXHAUSTED
+    finally:
+        restarted.close()
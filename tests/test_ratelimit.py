@@ -0,0 +1,82 @@
+"""토큰 버킷 계산 (메모리 / SQLite 공유 버킷)"""
+
+import pytest
+
+import ratelimit
+from ratelimit import MemoryBuckets, SQLiteBuckets
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    monkeypatch.setattr(ratelimit.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def buckets(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryBuckets()
+    else:
+        store = SQLiteBuckets(str(tmp_path / "ratelimit.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_burst_then_wait(buckets, clock):
+    # 초당 0.5개, 버스트 3
+    for _ in range(3):
+        assert buckets.acquire(["ip:a"], 0.5, 3) == 0
+    assert buckets.acquire(["ip:a"], 0.5, 3) == pytest.approx(2.0)
+    clock.now += 2
+    assert buckets.acquire(["ip:a"], 0.5, 3) == 0
+
+
+def test_refill_is_capped_at_burst(buckets, clock):
+    assert buckets.acquire(["ip:a"], 1, 2) == 0
+    clock.now += 3600
+    assert buckets.acquire(["ip:a"], 1, 2, cost=2) == 0
+    assert buckets.acquire(["ip:a"], 1, 2) == pytest.approx(1.0)
+
+
+def test_all_keys_must_pass(buckets, clock):
+    assert buckets.acquire(["ip:a", "key:x"], 1, 1) == 0
+    # key:x가 비어 있으면 ip:b도 차감하지 않음
+    assert buckets.acquire(["ip:b", "key:x"], 1, 1) == pytest.approx(1.0)
+    assert buckets.acquire(["ip:b"], 1, 1) == 0
+
+
+def test_cost_is_capped_at_burst(buckets, clock):
+    assert buckets.acquire(["ip:a"], 1, 2, cost=5) == 0
+    assert buckets.acquire(["ip:a"], 1, 2) == pytest.approx(1.0)
+
+
+def test_memory_buckets_evict_least_recently_used(clock):
+    buckets = MemoryBuckets(max_keys=2)
+    for key in ("a", "b", "c"):
+        assert buckets.acquire([key], 1, 1) == 0
+    assert buckets.stats()["keys"] == 2
+    # 제거된 a는 가득 찬 상태로 다시 시작
+    assert buckets.acquire(["a"], 1, 1) == 0
+    assert buckets.acquire(["c"], 1, 1) == pytest.approx(1.0)
+
+
+def test_sqlite_buckets_are_shared_between_connections(tmp_path, clock):
+    path = str(tmp_path / "shared.sqlite3")
+    first, second = SQLiteBuckets(path), SQLiteBuckets(path)
+    try:
+        assert first.acquire(["ip:a"], 1, 2) == 0
+        assert second.acquire(["ip:a"], 1, 2) == 0
+        assert first.acquire(["ip:a"], 1, 2) == pytest.approx(1.0)
+    finally:
+        first.close()
+        second.close()
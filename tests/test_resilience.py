@@ -0,0 +1,58 @@
+"""업스트림 호출 정책 — 서킷 브레이커와 재시도"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, UpstreamPolicy
+
+
+def responder(*statuses):
+    """statuses 순서대로 응답하는 send(timeout), 호출 횟수는 send.calls"""
+    async def send(timeout):
+        send.calls += 1
+        return httpx.Response(statuses[min(send.calls, len(statuses)) - 1])
+    send.calls = 0
+    return send
+
+
+def policy(failure_threshold=5, cooldown=30.0, retries=2):
+    breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown=cooldown)
+    return UpstreamPolicy("test", breaker, retries=retries, backoff_base=0, backoff_cap=0)
+
+
+def test_retries_5xx_then_succeeds():
+    upstream = policy()
+    send = responder(503, 200)
+    response = asyncio.run(upstream.call("op", send, timeout=1))
+    assert response.status_code == 200
+    assert send.calls == 2
+    assert upstream.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_returns_original_5xx():
+    upstream = policy(failure_threshold=1, cooldown=0)
+    upstream.breaker.record_failure()  # open, 쿨다운 없음 → 다음 호출이 시험 호출
+    send = responder(502, 200)
+    response = asyncio.run(upstream.call("op", send, timeout=1))
+    assert response.status_code == 502
+    assert send.calls == 1
+    assert upstream.breaker.state == CircuitBreaker.OPEN
+
+
+def test_failure_that_opens_breaker_is_not_retried():
+    upstream = policy(failure_threshold=1)
+    send = responder(500, 200)
+    response = asyncio.run(upstream.call("op", send, timeout=1))
+    assert response.status_code == 500
+    assert send.calls == 1
+
+
+def test_open_breaker_short_circuits():
+    upstream = policy(failure_threshold=1)
+    upstream.breaker.record_failure()
+    send = responder(200)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(upstream.call("op", send, timeout=1))
+    assert send.calls == 0
@@ -0,0 +1,69 @@
+"""로컬 검색 식 변환 / 페이지 커서"""
+
+import pytest
+from fastapi import HTTPException
+
+import api_server
+from api_server import decode_cursor, encode_cursor, next_page_cursor, to_fts_query
+from articles import Article
+
+
+@pytest.mark.parametrize("search_query, expected", [
+    ("AI", '"AI"*'),
+    ("technology OR AI", '"technology"* OR "AI"*'),
+    ('"machine learning" AND robots', '"machine learning" AND "robots"*'),
+    ("(a OR b) NOT c", '( "a"* OR "b"* ) NOT "c"*'),
+    ("+bitcoin", '"bitcoin"*'),
+    ("C++ 한국", '"C"* "한국"*'),
+    ('say "it\'s"', '"say"* "it\'s"'),
+])
+def test_to_fts_query(search_query, expected):
+    assert to_fts_query(search_query) == expected
+
+
+@pytest.mark.parametrize("search_query", ["", "+++", "?!", "-", '""'])
+def test_to_fts_query_without_terms(search_query):
+    assert to_fts_query(search_query) == ""
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("인공지능 OR AI", "ko", 12, "2026-01-02", 3)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("인공지능 OR AI", "ko", 12, "2026-01-02", 3)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    encode_cursor("", "en", 10, "2026-01-02", 2),           # 빈 검색어
+    encode_cursor("ai", "en", 0, "2026-01-02", 2),          # 결과 수 범위 밖
+    encode_cursor("ai", "en", 10, "2026-13-40", 2),         # 잘못된 날짜
+    encode_cursor("ai", "en", 10, "2026-01-02", 0),         # 페이지 0
+    encode_cursor("ai", "en", 20, "2026-01-02", 6),         # NewsAPI 결과 한도 초과
+])
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def articles(n: int, duplicates: int = 0) -> list:
+    return [
+        Article(id=i, url=f"https://example.com/{i}", duplicates=[{}] * duplicates if i == 0 else None)
+        for i in range(n)
+    ]
+
+
+def test_next_page_cursor():
+    cursor = next_page_cursor(articles(10), "ai", "en", 10, "2026-01-02", 1)
+    assert decode_cursor(cursor) == ("ai", "en", 10, "2026-01-02", 2)
+
+
+def test_next_page_cursor_counts_collapsed_duplicates():
+    # 8건 + 첫 기사에 묶인 중복 2건 = 업스트림 10건 → 다음 페이지 있음
+    assert next_page_cursor(articles(8, duplicates=2), "ai", "en", 10, "2026-01-02", 1) is not None
+    assert next_page_cursor(articles(8), "ai", "en", 10, "2026-01-02", 1) is None
+
+
+def test_next_page_cursor_stops_at_result_limit():
+    last_page = api_server.NEWS_MAX_RESULTS // 10
+    assert next_page_cursor(articles(10), "ai", "en", 10, "2026-01-02", last_page) is None
@@ -0,0 +1,73 @@
+"""OpenAI 토큰 장부 — 같은 SQLite 파일을 쓰는 두 워커가 기본 키의 하루 예산을 나눠 씀"""
+
+import asyncio
+
+import pytest
+
+import api_server
+from api_server import BUDGET_EXHAUSTED, BUDGET_LOW, BUDGET_OK, TokenLedger
+
+DEFAULT_KEY = "sk-default"
+
+
+@pytest.fixture(autouse=True)
+def default_key(monkeypatch):
+    monkeypatch.setattr(api_server, "DEFAULT_OPENAI_API_KEY", DEFAULT_KEY)
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "usage.sqlite3")
+    first = TokenLedger(path, daily_budget=1000, soft_ratio=0.8, sync_interval=0)
+    second = TokenLedger(path, daily_budget=1000, soft_ratio=0.8, sync_interval=0)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_budget_is_shared_between_workers(workers):
+    first, second = workers
+
+    async def scenario():
+        levels = []
+        for worker in (first, second, first, second):
+            await worker.record("translation", DEFAULT_KEY, 150, 100)
+            await first.sync()
+            await second.sync()
+            levels.append((first.level(DEFAULT_KEY), second.level(DEFAULT_KEY)))
+        return levels
+
+    levels = run(scenario())
+    assert levels[2] == (BUDGET_OK, BUDGET_OK)              # 750
+    assert levels[3] == (BUDGET_EXHAUSTED, BUDGET_EXHAUSTED)  # 1000
+    assert run(second.summary())["budget"]["used_today"] == 1000
+
+
+def test_low_budget_trips_on_other_workers_usage(workers):
+    first, second = workers
+
+    async def scenario():
+        await first.record("analysis", DEFAULT_KEY, 500, 300)
+        await second.sync()
+
+    run(scenario())
+    assert second.level(DEFAULT_KEY) == BUDGET_LOW
+
+
+def test_user_keys_do_not_count_against_default_budget(workers):
+    first, second = workers
+
+    async def scenario():
+        await first.record("analysis", "sk-user", 5000, 5000)
+        await second.sync()
+
+    run(scenario())
+    assert second.level(DEFAULT_KEY) == BUDGET_OK
+    assert second.level("sk-user") == BUDGET_OK
+    usage = run(second.summary())["usage"]
+    assert [(row["caller"], row["requests"]) for row in usage] == [(TokenLedger.caller("sk-user"), 1)]
+    assert usage[0]["caller"].startswith("user:")